@@ -5,7 +5,7 @@ trap cleanup SIGINT SIGTERM ERR EXIT
 # =============================
 # Configurable Parameters
 # =============================
-APPROACHES=("CP" "MIP" "SAT" "SMT")
+APPROACHES=("CP" "MIP" "SAT" "SMT" "CONSTRUCT" "LS" "BT")
 DEFAULT_INSTANCE=6
 
 # =============================
@@ -31,7 +31,7 @@ usage() {
 Usage: $(basename "${BASH_SOURCE[0]}") [OPTIONS]
 
 Options:
-  -a, --approach    Approach to run (CP | MIP | SMT). Default: Interactive Mode
+  -a, --approach    Approach to run (CP | MIP | SAT | SMT | CONSTRUCT | LS | BT). Default: Interactive Mode
   -n, --instance    Instance size (e.g., 6, 8, 10, 12). Default: Interactive Mode
   -h, --help        Show this help and exit
 EOF
@@ -48,14 +48,14 @@ get_user_input() {
   
   # 1. Select Approach
   echo "Which approach would you like to run?"
-  PS3="Select an option (1-5): "
+  PS3="Select an option (1-8): "
   
   # We add "Run All" and "Quit" to the existing list
   local options=("${APPROACHES[@]}" "Run All" "Quit")
   
   select opt in "${options[@]}"; do
     case "$opt" in
-      "CP"|"MIP"|"SAT"|"SMT")
+      "CP"|"MIP"|"SAT"|"SMT"|"CONSTRUCT"|"LS"|"BT")
         SELECTED_APPROACH="$opt"
         break
         ;;
@@ -0,0 +1,199 @@
+"""
+Vectorised drop-in for solution_checker.check_solution, plus a batch mode
+that validates many result files in a process pool.
+
+check_solution() returns exactly what the reference checker returns
+(same messages, same order). A well-formed schedule (P lists of W
+[int, int] matches) is turned into a P x W x 2 array and every rule is an
+O(n^2 log n) sort/compare instead of list.count() scans (the reference
+pair check alone is O(n^4)). Anything irregular (empty, ragged, non-int
+teams, ...) is handed to the reference checker so its behaviour,
+exceptions included, is unchanged.
+
+    python fast_checker.py res/CP            # one directory, like solution_checker.py
+    python fast_checker.py res --workers 8   # every res/*/*.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import solution_checker
+
+
+def as_array(solution):
+    """
+    P x W x 2 int64 array, or None if the schedule is not a regular list
+    of lists of [int, int] (bool is not accepted as int). Arrays and
+    common.schedule.Schedule objects are taken as they are.
+    """
+    if type(solution) != list and hasattr(solution, "__array__"):
+        arr = np.asarray(solution)
+        if arr.ndim != 3 or arr.shape[2] != 2 or arr.size == 0 or arr.dtype.kind not in "iu":
+            return None
+        return arr.astype(np.int64)
+    if type(solution) != list or len(solution) == 0:
+        return None
+    width = None
+    for row in solution:
+        if type(row) != list:
+            return None
+        if width is None:
+            width = len(row)
+        if len(row) != width or width == 0:
+            return None
+        for match in row:
+            if type(match) != list or len(match) != 2 or type(match[0]) != int or type(match[1]) != int:
+                return None
+    return np.array(solution, dtype=np.int64)
+
+
+def fatal_errors(arr, time):
+    P, W, _ = arr.shape
+    errors = []
+    n = int(arr.max())
+
+    present = np.unique(arr)
+    if n >= 1 and len(np.intersect1d(present, np.arange(1, n + 1))) != n:
+        errors.append(f'Missing team in the solution or team out of range!!!')
+
+    if n % 2 != 0:
+        errors.append(f'"n" should be even!!!')
+
+    if P != n // 2:
+        errors.append(f'the number of periods is not compliant!!!')
+
+    if W != n - 1:
+        errors.append(f'the number of weeks is not compliant!!!')
+
+    if time > 300:
+        errors.append(f'The running time exceeds the timeout!!!')
+
+    return errors
+
+
+def has_repeats(rows, times):
+    """
+    True if some value occurs at least `times` times in some row.
+    """
+    s = np.sort(rows, axis=1)
+    return bool((s[:, times - 1:] == s[:, :s.shape[1] - times + 1]).any())
+
+
+def check_solution(solution: list, obj, time, optimal):
+    arr = as_array(solution)
+    if arr is None:
+        if type(solution) != list and hasattr(solution, "tolist"):
+            solution = solution.tolist()
+        return solution_checker.check_solution(solution, obj, time, optimal)
+
+    errors = fatal_errors(arr, time)
+    if errors:
+        return errors
+
+    home = arr[:, :, 0].ravel()
+    away = arr[:, :, 1].ravel()
+
+    # every team plays with every other team only once
+    distinct = home != away
+    lo = np.minimum(home, away)[distinct]
+    hi = np.maximum(home, away)[distinct]
+    low = int(arr.min())
+    span = int(arr.max()) - low + 1
+    keys = (lo - low) * span + (hi - low)
+    if len(keys) != len(np.unique(keys)):
+        errors.append('There are duplicated matches')
+
+    # each team cannot play against itself
+    if not distinct.all():
+        errors.append('There are self-playing teams')
+
+    # every team plays once a week
+    P, W, _ = arr.shape
+    per_week = arr.transpose(1, 0, 2).reshape(W, 2 * P)
+    if has_repeats(per_week, 2):
+        errors.append('Some teams play multiple times in a week')
+
+    # every team plays at most twice during the period
+    per_period = arr.reshape(P, 2 * W)
+    if per_period.shape[1] >= 3 and has_repeats(per_period, 3):
+        errors.append('Some teams play more than twice in the period')
+
+    return 'Valid solution' if len(errors) == 0 else errors
+
+
+def check_file(path):
+    """
+    [(approach, status, message)] for one result file, as printed by
+    solution_checker.py. Unreadable files give a single ERROR row.
+    """
+    try:
+        with open(path, 'r') as f:
+            json_data = json.load(f)
+    except Exception as e:
+        return [(None, "ERROR", f"Error reading {path}: {e}")]
+
+    rows = []
+    for approach, result in json_data.items():
+        sol = result.get("sol")
+        time = result.get("time")
+        opt = result.get("optimal")
+        obj = result.get("obj")
+        try:
+            message = check_solution(sol, obj, time, opt)
+        except Exception as e:
+            rows.append((approach, "INVALID", [f"checker raised {type(e).__name__}: {e}"]))
+            continue
+        status = "VALID" if type(message) == str else "INVALID"
+        rows.append((approach, status, message))
+    return rows
+
+
+def result_files(paths):
+    """
+    A directory with .json files is checked as is (like solution_checker.py),
+    otherwise its <APP>/*.json children are (e.g. res/).
+    """
+    files = []
+    for path in paths:
+        direct = sorted(glob.glob(os.path.join(path, "*.json")))
+        files += direct if direct else sorted(glob.glob(os.path.join(path, "*", "*.json")))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the validity of STS solution JSON files in parallel.")
+    parser.add_argument("paths", nargs="*", default=["res"],
+                        help="directories with .json files, or parents of such directories (default: res)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--quiet", action="store_true", help="only print invalid entries and the summary")
+    args = parser.parse_args()
+
+    files = result_files(args.paths)
+    counts = {"VALID": 0, "INVALID": 0, "ERROR": 0}
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for path, rows in zip(files, pool.map(check_file, files, chunksize=8)):
+            shown = [r for r in rows if r[1] != "VALID"] if args.quiet else rows
+            if shown:
+                print(f'File: {path}\n')
+            for approach, status, message in rows:
+                counts[status] += 1
+            for approach, status, message in shown:
+                if status == "ERROR":
+                    print(f"  {message}\n")
+                    continue
+                message_str = '\n\t  '.join(message) if status == "INVALID" else message
+                print(f"  Approach: {approach}\n    Status: {status}\n    Reason: {message_str}\n")
+
+    print(f"{len(files)} files: {counts['VALID']} valid, {counts['INVALID']} invalid, {counts['ERROR']} unreadable")
+    return 1 if counts["INVALID"] or counts["ERROR"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
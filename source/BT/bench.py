@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bitset backtracking against glucose (SAT/sat_dimacs.py CNF)
+and z3 (SMT/smt_period_core_bool.py) on the same circle-method pairings.
+
+Encoding and solving are timed separately, since avoiding the encoding
+is the point of the specialised search. Glucose runs in-process through
+pysat (Glucose 4), so no DIMACS file is written or parsed.
+
+    python source/BT/bench.py -n 6 8 10 12 --sym --time_limit 60
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+from bt_search import solve
+
+BASE_DIR = Path(__file__).parent
+ROOT_DIR = BASE_DIR.parent.parent
+OUTPUT_DIR = ROOT_DIR / "res" / "BT"
+
+sys.path.insert(0, str(BASE_DIR.parent))
+sys.path.insert(0, str(BASE_DIR.parent / "SAT"))
+sys.path.insert(0, str(BASE_DIR.parent / "SMT"))
+sys.path.insert(0, str(BASE_DIR.parent / "CONSTRUCT"))
+
+from construct import circle_method_pairs
+
+
+def bench_bitset(n, use_sym, time_limit):
+    start = time.perf_counter()
+    weeks = circle_method_pairs(n)
+    encode = time.perf_counter() - start
+    status, _, nodes = solve(n, weeks, use_sym=use_sym, time_limit=time_limit)
+    return status, encode, time.perf_counter() - start - encode, f"{nodes} nodes"
+
+
+def bench_glucose(n, use_sym, time_limit):
+    import sat_dimacs
+    from pysat.solvers import Glucose4
+
+    start = time.perf_counter()
+    sat_dimacs.build_dimacs(n, use_sym=use_sym)
+    clauses = sat_dimacs.clauses
+    encode = time.perf_counter() - start
+
+    with Glucose4(bootstrap_with=clauses) as solver:
+        timer = threading.Timer(time_limit, solver.interrupt)
+        timer.start()
+        try:
+            res = solver.solve_limited(expect_interrupt=True)
+        finally:
+            timer.cancel()
+    solve_time = time.perf_counter() - start - encode
+    status = {True: "sat", False: "unsat"}.get(res, "timeout")
+    return status, encode, solve_time, f"{sat_dimacs.next_var - 1} vars, {len(clauses)} clauses"
+
+
+def bench_z3(n, use_sym, time_limit):
+    from z3 import sat, unsat
+    from smt_period_core_bool import build_model
+
+    start = time.perf_counter()
+    s, _, _, _, _, _ = build_model(n, use_sym=use_sym, timeout_ms=int(time_limit * 1000))
+    encode = time.perf_counter() - start
+    res = s.check()
+    solve_time = time.perf_counter() - start - encode
+    status = "sat" if res == sat else "unsat" if res == unsat else "timeout"
+    return status, encode, solve_time, f"{len(s.assertions())} assertions"
+
+
+ENGINES = {
+    "bitset": bench_bitset,
+    "glucose": bench_glucose,
+    "z3": bench_z3,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, nargs="+", default=[6, 8, 10, 12, 14, 16])
+    parser.add_argument("--sym", action="store_true", help="freeze week 0 in every engine")
+    parser.add_argument("--time_limit", type=float, default=60)
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--save", action="store_true", help="also write res/BT/benchmark.md")
+    args = parser.parse_args()
+
+    lines = [
+        f"Bitset backtracking vs generic solvers (sym={args.sym}, limit {args.time_limit:g}s)",
+        "",
+        "| n | engine | status | encode (s) | solve (s) | size |",
+        "|---|--------|--------|------------|-----------|------|",
+    ]
+    print("\n".join(lines))
+    for n in args.n:
+        for name in args.engines:
+            status, encode, solve_time, size = ENGINES[name](n, args.sym, args.time_limit)
+            line = f"| {n} | {name} | {status} | {encode:.3f} | {solve_time:.3f} | {size} |"
+            print(line, flush=True)
+            lines.append(line)
+
+    if args.save:
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        (OUTPUT_DIR / "benchmark.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Specialised backtracking for the period assignment of a fixed pairing.
+
+Each week is a perfect matching between its matches and the periods, and
+the only constraint linking weeks is "a team plays at most twice in a
+period". The search assigns the weeks one at a time; inside a week it
+always branches on the match with the fewest allowed periods.
+
+Everything is an integer bitmask over the P periods:
+  once[t]  periods in which team t already plays (at least once)
+  full[t]  periods in which team t already plays twice (now forbidden)
+  free[w]  periods of week w that are still empty
+so the domain of match (a, b) in week w is free[w] & ~(full[a] | full[b]).
+
+Forward checking: when a team fills up a period, every later match of
+that team (current week and all future weeks) must keep a non-empty
+domain, and the period must still be reachable by some open match of
+every later week; in the current week the union of the open domains must
+also cover as many periods as there are open matches.
+
+Symmetry: periods are interchangeable, so with use_sym the anchor week is
+frozen (match m in period m) exactly like use_sym in SAT/sat_dimacs.py,
+and that week is assigned first.
+"""
+
+import sys
+import time
+
+
+class Timeout(Exception):
+    pass
+
+
+def team_matches(n: int, weeks):
+    """
+    match_of[w][t] = index of the match of team t in week w.
+    """
+    match_of = []
+    for week in weeks:
+        row = [0] * (n + 1)
+        for m, (a, b) in enumerate(week):
+            row[a] = m
+            row[b] = m
+        match_of.append(row)
+    return match_of
+
+
+def solve(n: int, weeks, use_sym: bool = False, anchor_week: int = 0, time_limit: float = 300):
+    """
+    Returns (status, per, nodes): status in {"sat", "unsat", "timeout"},
+    per[w][m] = period of match m of week w (None unless sat).
+    """
+    W = len(weeks)
+    P = n // 2
+    FULL = (1 << P) - 1
+    match_of = team_matches(n, weeks)
+
+    once = [0] * (n + 1)
+    full = [0] * (n + 1)
+    free = [FULL] * W
+    per = [[None] * P for _ in range(W)]
+
+    order = list(range(W))
+    if use_sym:
+        aw = anchor_week % W
+        order = [aw] + [w for w in order if w != aw]
+    position = {w: i for i, w in enumerate(order)}
+
+    deadline = time.perf_counter() + time_limit
+    nodes = 0
+
+    def place(w, m, bit):
+        a, b = weeks[w][m]
+        filled = []
+        for t in (a, b):
+            if once[t] & bit:
+                full[t] |= bit
+                filled.append(t)
+            else:
+                once[t] |= bit
+        free[w] &= ~bit
+        per[w][m] = bit
+        return filled
+
+    def unplace(w, m, bit):
+        a, b = weeks[w][m]
+        for t in (a, b):
+            if full[t] & bit:
+                full[t] &= ~bit
+            else:
+                once[t] &= ~bit
+        free[w] |= bit
+        per[w][m] = None
+
+    def consistent(w, filled, bit):
+        # later matches of the teams that just filled a period
+        for t in filled:
+            for w2 in order[position[w]:]:
+                m2 = match_of[w2][t]
+                if per[w2][m2] is not None:
+                    continue
+                a, b = weeks[w2][m2]
+                if not free[w2] & ~(full[a] | full[b]):
+                    return False
+
+        # the period that just filled up must stay reachable in later weeks
+        if filled:
+            for w2 in order[position[w] + 1:]:
+                if not free[w2] & bit:
+                    continue
+                for m2, (a, b) in enumerate(weeks[w2]):
+                    if per[w2][m2] is None and not (full[a] | full[b]) & bit:
+                        break
+                else:
+                    return False
+
+        # Hall condition on the open matches of the current week
+        open_count = 0
+        union = 0
+        for m2, (a, b) in enumerate(weeks[w]):
+            if per[w][m2] is None:
+                open_count += 1
+                union |= free[w] & ~(full[a] | full[b])
+        return bin(union).count("1") >= open_count
+
+    def search(i):
+        nonlocal nodes
+        if i == W:
+            return True
+        w = order[i]
+        if not free[w]:
+            return search(i + 1)
+
+        nodes += 1
+        if nodes % 1024 == 0 and time.perf_counter() > deadline:
+            raise Timeout()
+
+        # most constrained open match of week w
+        best_m, best_dom, best_size = None, 0, P + 1
+        for m, (a, b) in enumerate(weeks[w]):
+            if per[w][m] is not None:
+                continue
+            dom = free[w] & ~(full[a] | full[b])
+            size = bin(dom).count("1")
+            if size < best_size:
+                best_m, best_dom, best_size = m, dom, size
+                if size <= 1:
+                    break
+        if best_size == 0:
+            return False
+
+        # periods both teams already play in first: every team ends with
+        # counts 2, ..., 2, 1, so almost every period has to fill up anyway
+        a, b = weeks[w][best_m]
+        both = best_dom & once[a] & once[b]
+        one = best_dom & (once[a] | once[b]) & ~both
+        for dom in (both, one, best_dom & ~(once[a] | once[b])):
+            while dom:
+                bit = dom & -dom
+                dom ^= bit
+                filled = place(w, best_m, bit)
+                if consistent(w, filled, bit) and search(i):
+                    return True
+                unplace(w, best_m, bit)
+        return False
+
+    if use_sym:
+        aw = order[0]
+        for m in range(P):
+            place(aw, m, 1 << m)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * W * P + 100))
+    try:
+        found = search(0)
+    except Timeout:
+        return "timeout", None, nodes
+
+    if not found:
+        return "unsat", None, nodes
+    periods = [[bit.bit_length() - 1 for bit in row] for row in per]
+    return "sat", periods, nodes
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Run the bitset backtracking approach for STS (complete, no solver).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bt_search import solve
+
+BASE_DIR = Path(__file__).parent
+ROOT_DIR = BASE_DIR.parent.parent
+OUTPUT_DIR = ROOT_DIR / "res" / "BT"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+sys.path.insert(0, str(BASE_DIR.parent))
+sys.path.insert(0, str(BASE_DIR.parent / "CONSTRUCT"))
+
+from construct import to_solution
+from common.store import update_result_file
+from common.pairings import load_pairing, pairing_suffix
+
+TIMEOUT = 300
+
+
+def timeout_result():
+    return {"time": 300, "optimal": False, "obj": None, "sol": []}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=0)
+    parser.add_argument("--sym", action="store_true", help="enable symmetry breaking (freeze the anchor week)")
+    parser.add_argument("--anchor_week", type=int, default=0)
+    parser.add_argument("--pairing", type=str, default="circle",
+                        help="week pairings: circle, berger, greedy, an integer seed or file.json (common/pairings.py); "
+                             "keys get a _pair<spec> suffix")
+    args = parser.parse_args()
+
+    if args.n == 0:
+        N_VALUES = [6, 8, 10, 12, 14, 16, 18, 20, 22, 24]
+    else:
+        N_VALUES = [args.n]
+
+    for n in N_VALUES:
+        print(f"\n====== Running n = {n} ======")
+        json_path = OUTPUT_DIR / f"{n}.json"
+        approach = ("bitset_sb" if args.sym else "bitset") + pairing_suffix(args.pairing)
+
+        weeks = load_pairing(n, args.pairing).weeks(sorted_pairs=True)
+        start = time.time()
+        status, per, nodes = solve(n, weeks, use_sym=args.sym, anchor_week=args.anchor_week,
+                                   time_limit=TIMEOUT)
+        elapsed = time.time() - start
+
+        if status == "sat":
+            print(f"[{approach}] n={n} SAT time={elapsed:.3f}s nodes={nodes}")
+            update_result_file(json_path, {
+                approach: {
+                    "time": int(min(elapsed, TIMEOUT)),
+                    "optimal": True,
+                    "obj": None,
+                    "sol": to_solution(n, weeks, per)
+                }
+            })
+
+        elif status == "unsat":
+            print(f"[{approach}] n={n} UNSAT time={elapsed:.3f}s nodes={nodes}")
+            update_result_file(json_path, {
+                approach: {
+                    "time": int(min(elapsed, TIMEOUT)),
+                    "optimal": True,
+                    "obj": None,
+                    "sol": []
+                }
+            })
+
+        else:
+            print(f"[{approach}] n={n} TIMEOUT nodes={nodes} -> marking time=300")
+            update_result_file(json_path, {approach: timeout_result()})
+
+    print("\nDone.\n")
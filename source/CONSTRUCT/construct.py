@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Direct construction of the period assignment for the circle-method
+pairings (round_robin.circle_method_pairs), no search involved.
+
+Label the rotating teams by Z_W (W = n-1). In the week whose centre is c
+(the team paired with the fixed team n) the other matches are {c-d, c+d},
+d = 1..P-1. Put match d in period d and the fixed match in period 0:
+every rotating team then plays exactly twice in each period d >= 1 and
+the fixed team is always in period 0. The fixed match is moved instead
+to period s(c) = fold(2c) = min(2c mod W, W - 2c mod W), swapping with
+match d = s(c), which goes to period 0.
+
+This is valid for every n with W mod 3 != 0, i.e. n mod 6 in {0, 2}
+(checked exhaustively up to n = 120). For n mod 6 == 4 it leaves about
+2P/3 excess team-period occurrences, which repair() removes by
+min-conflicts swaps inside a week. n = 4 has no schedule.
+
+Other pairings (common/pairings.py) have no such structure: repair()
+starts from match m in period m in every week.
+
+Everything is O(n^2), which is the size of the output.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.tournament import tournament
+
+
+def circle_method_pairs(n: int):
+    """
+    Same pairing as CP/round_robin.py (weeks[w] = list of (a, b), a < b,
+    the fixed team's match last), taken from common.tournament rather
+    than round_robin so the module can be imported from any runner
+    without a round_robin name clash.
+    """
+    return tournament(n).weeks(sorted_pairs=True)
+
+
+def cyclic_applies(n: int) -> bool:
+    return n % 2 == 0 and n >= 6 and (n - 1) % 3 != 0
+
+
+def construct_periods(n: int, weeks):
+    """
+    per[w][m] = period (0-based) of match m of week w.
+    """
+    W = n - 1
+    P = n // 2
+    half = n // 2
+    per = []
+    for w in range(W):
+        # match m < half-1 pairs rot[m] and rot[W-1-m] around the centre
+        # rot[half-1]; the last match is the fixed team's
+        centre = (half - 1 - w) % W
+        v = (2 * centre) % W
+        s = min(v, W - v)
+
+        row = []
+        for m in range(P):
+            d = 0 if m == P - 1 else half - 1 - m
+            if d == 0:
+                row.append(s)
+            elif d == s:
+                row.append(0)
+            else:
+                row.append(d)
+        per.append(row)
+    return per
+
+
+def period_counts(n: int, weeks, per):
+    P = n // 2
+    count = [[0] * P for _ in range(n + 1)]
+    for w, week in enumerate(weeks):
+        for m, (a, b) in enumerate(week):
+            count[a][per[w][m]] += 1
+            count[b][per[w][m]] += 1
+    return count
+
+
+def excess(count) -> int:
+    return sum(max(0, c - 2) for row in count for c in row)
+
+
+def repair(n: int, weeks, per, seed: int = 0, time_limit: float = 300):
+    """
+    Min-conflicts on the excess team-period occurrences. A move swaps the
+    periods of two matches of the same week (weeks stay permutations).
+    Returns True once no team plays more than twice in a period, False if
+    time_limit (seconds) runs out first.
+    """
+    rng = random.Random(seed)
+    P = n // 2
+    W = n - 1
+    count = period_counts(n, weeks, per)
+    cost = excess(count)
+
+    # weeks_of[t][p]: weeks in which t currently plays in period p
+    match_of = [[0] * (n + 1) for _ in range(W)]
+    for w, week in enumerate(weeks):
+        for m, (a, b) in enumerate(week):
+            match_of[w][a] = m
+            match_of[w][b] = m
+
+    def over(t, p, delta):
+        # change of max(0, count - 2) when count[t][p] moves by delta
+        c = count[t][p]
+        return max(0, c + delta - 2) - max(0, c - 2)
+
+    def swap_delta(w, m1, m2):
+        p1, p2 = per[w][m1], per[w][m2]
+        a1, b1 = weeks[w][m1]
+        a2, b2 = weeks[w][m2]
+        return (over(a1, p1, -1) + over(b1, p1, -1) + over(a1, p2, +1) + over(b1, p2, +1)
+                + over(a2, p2, -1) + over(b2, p2, -1) + over(a2, p1, +1) + over(b2, p1, +1))
+
+    def apply(w, m1, m2):
+        p1, p2 = per[w][m1], per[w][m2]
+        for t in weeks[w][m1]:
+            count[t][p1] -= 1
+            count[t][p2] += 1
+        for t in weeks[w][m2]:
+            count[t][p2] -= 1
+            count[t][p1] += 1
+        per[w][m1], per[w][m2] = p2, p1
+
+    tabu = {}
+    step = 0
+    deadline = time.perf_counter() + time_limit
+    while cost > 0:
+        step += 1
+        if step % 256 == 0 and time.perf_counter() > deadline:
+            break
+        conflicts = [(t, p) for t in range(1, n + 1) for p in range(P) if count[t][p] > 2]
+        t, p = rng.choice(conflicts)
+
+        best, best_moves = None, []
+        for w in range(W):
+            m1 = match_of[w][t]
+            if per[w][m1] != p:
+                continue
+            for m2 in range(P):
+                if m2 == m1:
+                    continue
+                d = swap_delta(w, m1, m2)
+                if tabu.get((w, m1, m2), -1) >= step and cost + d > 0:
+                    continue
+                if best is None or d < best:
+                    best, best_moves = d, [(w, m1, m2)]
+                elif d == best:
+                    best_moves.append((w, m1, m2))
+
+        if not best_moves:
+            continue
+        w, m1, m2 = rng.choice(best_moves)
+        apply(w, m1, m2)
+        cost += best
+        tabu[(w, m1, m2)] = tabu[(w, m2, m1)] = step + rng.randint(2, 10)
+
+    return cost == 0
+
+
+def to_solution(n: int, weeks, per):
+    P = n // 2
+    W = n - 1
+    sol = [[None] * W for _ in range(P)]
+    for w, week in enumerate(weeks):
+        for m, (a, b) in enumerate(week):
+            sol[per[w][m]][w] = [a, b]
+    return sol
+
+
+def construct_schedule(n: int, seed: int = 0, time_limit: float = 300, pairing=None):
+    """
+    Checker-format schedule for the circle-method pairing (or the given
+    Tournament), or None if there is none (n = 4) or repair ran out of
+    time. Orientation is the pairing's.
+    """
+    if n % 2 != 0 or n < 2:
+        raise ValueError("n must be even")
+    if n == 2:
+        return [[[1, 2]]]
+    if n == 4:
+        return None
+
+    if pairing is not None and pairing is not tournament(n):
+        weeks = pairing.weeks(sorted_pairs=True)
+        per = [list(range(n // 2)) for _ in weeks]
+        if not repair(n, weeks, per, seed=seed, time_limit=time_limit):
+            return None
+        return to_solution(n, weeks, per)
+
+    weeks = circle_method_pairs(n)
+    per = construct_periods(n, weeks)
+    if not cyclic_applies(n) and not repair(n, weeks, per, seed=seed, time_limit=time_limit):
+        return None
+    return to_solution(n, weeks, per)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Run the direct construction approach for STS (no solver).
+
+Entries written to res/CONSTRUCT/{n}.json:
+  CONSTRUCT      decision version, orientation of the pairing
+  CONSTRUCT_opt  same periods, oriented by common.orientation (obj = 1)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from construct import construct_schedule
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.bounds import reaches_lb
+from common.orientation import orient_solution, max_deviation
+from common.store import update_result_file
+from common.pairings import load_pairing, pairing_suffix
+
+TIMEOUT = 300
+
+BASE_DIR = Path(__file__).parent
+ROOT_DIR = BASE_DIR.parent.parent
+OUTPUT_DIR = ROOT_DIR / "res" / "CONSTRUCT"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+sys.path.insert(0, str(ROOT_DIR))
+
+from fast_checker import check_solution
+
+
+def timeout_result():
+    return {"time": 300, "optimal": False, "obj": None, "sol": []}
+
+
+def run_one(n: int, seed: int, json_path: Path, pairing: str = "circle"):
+    key = "CONSTRUCT" + pairing_suffix(pairing)
+    opt_key = "CONSTRUCT_opt" + pairing_suffix(pairing)
+    if n == 4:
+        # no schedule exists: some team would play three times in a period
+        print(f"[CONSTRUCT] n={n} infeasible")
+        unsat = {"time": 0, "optimal": True, "obj": None, "sol": []}
+        update_result_file(json_path, {key: unsat, opt_key: dict(unsat)})
+        return
+
+    if pairing_suffix(pairing):
+        method = "repair"
+    else:
+        method = "cyclic+repair" if n % 6 == 4 else "cyclic"
+    start = time.time()
+    sol = construct_schedule(n, seed=seed, time_limit=TIMEOUT, pairing=load_pairing(n, pairing))
+    elapsed = time.time() - start
+
+    if sol is None:
+        print(f"[CONSTRUCT] n={n} {method} TIMEOUT")
+        update_result_file(json_path, {key: timeout_result(), opt_key: timeout_result()})
+        return
+
+    status = check_solution(sol, None, int(elapsed), True)
+    if status != "Valid solution":
+        print(f"[CONSTRUCT] n={n} {method} produced an invalid schedule: {status}")
+        update_result_file(json_path, {key: timeout_result(), opt_key: timeout_result()})
+        return
+
+    opt_start = time.time()
+    oriented = orient_solution(sol)
+    obj = max_deviation(oriented)
+    opt_elapsed = elapsed + time.time() - opt_start
+
+    print(f"[CONSTRUCT] n={n} {method} time={elapsed:.3f}s obj={obj}")
+    update_result_file(json_path, {
+        key: {
+            "time": int(min(elapsed, TIMEOUT)),
+            "optimal": True,
+            "obj": None,
+            "sol": sol
+        },
+        opt_key: {
+            "time": int(min(opt_elapsed, TIMEOUT)),
+            "optimal": reaches_lb(n, obj),
+            "obj": obj,
+            "sol": oriented
+        }
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the repair step (n mod 6 == 4)")
+    parser.add_argument("--pairing", type=str, default="circle",
+                        help="week pairings: circle, berger, greedy, an integer seed or file.json (common/pairings.py); "
+                             "keys get a _pair<spec> suffix")
+    args = parser.parse_args()
+
+    if args.n == 0:
+        N_VALUES = [6, 8, 10, 12, 14, 16, 18, 20, 22, 24]
+    else:
+        N_VALUES = [args.n]
+
+    for n in N_VALUES:
+        print(f"\n====== Running n = {n} ======")
+        run_one(n, args.seed, OUTPUT_DIR / f"{n}.json", args.pairing)
+
+    print("\nDone.\n")
@@ -1,15 +1,27 @@
 #!/usr/bin/env python3
-import json
 import argparse
 import contextlib
 import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import timedelta
 import time
 
 import minizinc
 
-from round_robin import circle_method_pairs
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.bounds import fairness_lb, fairness_ub, reaches_lb
+from common.hints import load_hint, hint_assignment, relabel_periods
+from common.orientation import orient_solution, max_deviation
+from common.store import update_result_file
+from common.pairings import load_pairing, pairing_suffix
+from search import (
+    NO_SEARCH, LEGACY_SEARCH, search_grid, search_label, profile_key,
+    load_profile, save_profile, tuned_search, race_score,
+)
 
 TIME_LIMIT = 300
 
@@ -26,6 +38,21 @@ parser.add_argument("--ss", type=int, choices=[0, 1], default=None,
                     help="restrict to search strategy off/on (0/1)")
 parser.add_argument("--models", type=str, default="",
                     help="comma-separated exact model keys to run (override other filters)")
+parser.add_argument("--threads", type=int, default=1,
+                    help="threads per solver run (only solvers supporting -p, e.g. gecode and cp-sat)")
+parser.add_argument("--jobs", type=int, default=1,
+                    help="number of models run concurrently for each n")
+parser.add_argument("--cores", type=int, default=0,
+                    help="global core budget split evenly between concurrent jobs (overrides --threads; -1 => all cores)")
+parser.add_argument("--autotune", action="store_true",
+                    help="race the search-annotation grid for the selected models and save the winners")
+parser.add_argument("--tune-budget", type=int, default=10,
+                    help="time limit in seconds for each configuration raced by --autotune")
+parser.add_argument("--hint", type=str, default="",
+                    help="warm-start from a schedule: 'auto' (res/*/n.json), 'construct' or path.json[:key]; results get a _ws suffix")
+parser.add_argument("--pairing", type=str, default="circle",
+                    help="week pairings: circle, berger, greedy, an integer seed or file.json (common/pairings.py); "
+                         "results get a _pair<spec> suffix")
 
 args = parser.parse_args()
 
@@ -33,6 +60,7 @@ BASE_DIR = Path(__file__).resolve().parent
 ROOT = BASE_DIR.parent.parent 
 OUTPUT_DIR = ROOT / "res" / "CP"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+PROFILE_PATH = OUTPUT_DIR / "tuning" / "search_profile.json"
 
 # Default N list
 ALL_N = [6, 8, 10, 12, 14, 16, 18, 20]
@@ -70,6 +98,28 @@ MODEL_NAMES = {
     "chuffed_opt_sb_ss": {"model": f"{BASE_DIR}/cp_rr_opt.mzn",   "solver": "chuffed","opt": True,  "use_ss": [1, 0], "use_sb": 1},
     "cp_opt_reg_ss":     {"model": f"{BASE_DIR}/cp_rr_opt.mzn",   "solver": "cp",     "opt": True,  "use_ss": [1, 0], "use_sb": 0},
     "cp_opt_sb_ss":      {"model": f"{BASE_DIR}/cp_rr_opt.mzn",   "solver": "cp",     "opt": True,  "use_ss": [1, 0], "use_sb": 1},
+
+    # Autotuned search (profile from --autotune, falls back to the _ss strategy)
+    "gecode_reg_tuned":     {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "gecode", "opt": False, "use_ss": [1, 0], "use_sb": 0, "tuned": True},
+    "gecode_sb_tuned":      {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "gecode", "opt": False, "use_ss": [1, 0], "use_sb": 1, "tuned": True},
+    "chuffed_reg_tuned":    {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "chuffed","opt": False, "use_ss": [1, 0], "use_sb": 0, "tuned": True},
+    "chuffed_sb_tuned":     {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "chuffed","opt": False, "use_ss": [1, 0], "use_sb": 1, "tuned": True},
+    "cp_reg_tuned":         {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "cp",     "opt": False, "use_ss": [1, 0], "use_sb": 0, "tuned": True},
+    "cp_sb_tuned":          {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "cp",     "opt": False, "use_ss": [1, 0], "use_sb": 1, "tuned": True},
+    "gecode_opt_reg_tuned": {"model": f"{BASE_DIR}/cp_rr_opt.mzn",      "solver": "gecode", "opt": True,  "use_ss": [1, 0], "use_sb": 0, "tuned": True},
+    "gecode_opt_sb_tuned":  {"model": f"{BASE_DIR}/cp_rr_opt.mzn",      "solver": "gecode", "opt": True,  "use_ss": [1, 0], "use_sb": 1, "tuned": True},
+    "chuffed_opt_reg_tuned":{"model": f"{BASE_DIR}/cp_rr_opt.mzn",      "solver": "chuffed","opt": True,  "use_ss": [1, 0], "use_sb": 0, "tuned": True},
+    "chuffed_opt_sb_tuned": {"model": f"{BASE_DIR}/cp_rr_opt.mzn",      "solver": "chuffed","opt": True,  "use_ss": [1, 0], "use_sb": 1, "tuned": True},
+    "cp_opt_reg_tuned":     {"model": f"{BASE_DIR}/cp_rr_opt.mzn",      "solver": "cp",     "opt": True,  "use_ss": [1, 0], "use_sb": 0, "tuned": True},
+    "cp_opt_sb_tuned":      {"model": f"{BASE_DIR}/cp_rr_opt.mzn",      "solver": "cp",     "opt": True,  "use_ss": [1, 0], "use_sb": 1, "tuned": True},
+
+    # Decomposed optimization: decision model, then optimal home/away orientation
+    "gecode_opt_decomp":    {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "gecode", "opt": True,  "use_ss": [0, 0], "use_sb": 0, "decomposed": True},
+    "gecode_opt_sb_decomp": {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "gecode", "opt": True,  "use_ss": [0, 0], "use_sb": 1, "decomposed": True},
+    "chuffed_opt_decomp":   {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "chuffed","opt": True,  "use_ss": [0, 0], "use_sb": 0, "decomposed": True},
+    "chuffed_opt_sb_decomp":{"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "chuffed","opt": True,  "use_ss": [0, 0], "use_sb": 1, "decomposed": True},
+    "cp_opt_decomp":        {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "cp",     "opt": True,  "use_ss": [0, 0], "use_sb": 0, "decomposed": True},
+    "cp_opt_sb_decomp":     {"model": f"{BASE_DIR}/cp_rr_decision.mzn", "solver": "cp",     "opt": True,  "use_ss": [0, 0], "use_sb": 1, "decomposed": True},
 }
 
 UNSAT_TEMPLATE = {
@@ -80,19 +130,6 @@ UNSAT_TEMPLATE = {
 }
 
 
-def load_existing(json_path: Path) -> dict:
-    if json_path.exists() and json_path.stat().st_size > 0:
-        try:
-            return json.loads(json_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            return {}
-    return {}
-
-
-def save_json(json_path: Path, data: dict) -> None:
-    json_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-
-
 def seconds_from_stats(stats) -> int:
     st = stats.get("solveTime", None)
     if st is None:
@@ -107,7 +144,55 @@ def seconds_from_stats(stats) -> int:
         return TIME_LIMIT
 
 
-def run_model(model_file: str, solver_name: str, n: int, ss, sb: int, opt: bool):
+def supports_threads(solver_name: str) -> bool:
+    # Only solvers advertising the standard -p flag can run in parallel
+    # (gecode, cp-sat); chuffed is single-threaded.
+    solver = minizinc.Solver.lookup(solver_name)
+    return "-p" in solver.stdFlags
+
+
+def threads_per_job(jobs: int) -> int:
+    if args.cores == 0:
+        return max(1, args.threads)
+    cores = (os.cpu_count() or 1) if args.cores < 0 else args.cores
+    return max(1, cores // max(1, jobs))
+
+
+def result_key(model_name: str, solver_name: str, threads: int) -> str:
+    # single-threaded runs keep the historical keys
+    if threads > 1 and supports_threads(solver_name):
+        return f"{model_name}_t{threads}"
+    return model_name
+
+
+def set_warm_start(inst, weeks, hint, sb: int, opt: bool) -> bool:
+    """
+    Fill use_ws/ws_per(/ws_flip) from a hint schedule; False if there is
+    no usable hint (the neutral no_ws annotation is used then).
+    """
+    W, M = len(weeks), len(weeks[0])
+    per = [[0] * M for _ in range(W)]
+    home = [[True] * M for _ in range(W)]
+    use_ws = 0
+
+    if hint:
+        try:
+            per, home = hint_assignment(hint, weeks)
+            if sb == 1:
+                per = relabel_periods(per)
+            use_ws = 1
+        except ValueError as e:
+            print(f"Hint ignored: {e}")
+
+    inst["use_ws"] = use_ws
+    inst["ws_per"] = [[p + 1 for p in row] for row in per]
+    if opt:
+        inst["ws_flip"] = [[not h for h in row] for row in home]
+    return use_ws == 1
+
+
+def run_model(model_file: str, solver_name: str, n: int, ss, sb: int, opt: bool, threads: int = 1,
+              search: dict = None, time_limit: int = TIME_LIMIT, hint=None):
     model = minizinc.Model(model_file)
     solver = minizinc.Solver.lookup(solver_name)
     inst = minizinc.Instance(solver, model)
@@ -116,18 +201,33 @@ def run_model(model_file: str, solver_name: str, n: int, ss, sb: int, opt: bool)
 
     # RR pairings
     t0 = time.perf_counter()
-    weeks = circle_method_pairs(n)
+    weeks = load_pairing(n, args.pairing).weeks(sorted_pairs=True)
     rr_time = time.perf_counter() - t0
 
     inst["pair"] = [[[a, b] for (a, b) in week] for week in weeks]
 
 
     # toggles
-    inst["use_ss"] = ss[0]
+    if search is None:
+        search = LEGACY_SEARCH if ss[0] == 1 else NO_SEARCH
+
+    inst["use_ss"] = search["use_ss"]
     inst["use_sb"] = sb
+    inst["ss_var"] = search["var"]
+    inst["ss_val"] = search["val"]
+    inst["ss_restart"] = search["restart"]
+    if opt:
+        inst["ss_lns"] = search["lns"]
+        inst["dev_lb"] = fairness_lb(n)
+        inst["dev_ub"] = fairness_ub(n)
+
+    set_warm_start(inst, weeks, hint, sb, opt)
 
-    with contextlib.redirect_stderr(io.StringIO()):
-        result = inst.solve(timeout=timedelta(seconds=TIME_LIMIT))
+    solve_kwargs = {}
+    if threads > 1 and supports_threads(solver_name):
+        solve_kwargs["processes"] = threads
+
+    result = inst.solve(timeout=timedelta(seconds=time_limit), **solve_kwargs)
 
     t = seconds_from_stats(result.statistics)
     t_total = t + rr_time
@@ -137,7 +237,7 @@ def run_model(model_file: str, solver_name: str, n: int, ss, sb: int, opt: bool)
         st_str = str(st).lower() if st is not None else ""
         if "unsat" in st_str:
             return t_total, "unsat", dict(UNSAT_TEMPLATE)
-        return TIME_LIMIT, "timeout", dict(UNSAT_TEMPLATE)
+        return time_limit, "timeout", dict(UNSAT_TEMPLATE)
 
     out_str = result.solution._output_item
     output_item = eval(out_str)
@@ -145,7 +245,9 @@ def run_model(model_file: str, solver_name: str, n: int, ss, sb: int, opt: bool)
     if opt:
         sol = output_item.get("sol", [])
         obj = output_item.get("obj", None)
-        optimal_flag = output_item.get("optimal", True)
+        # the output item cannot see the search status: optimal if proven
+        # by the solver or if the incumbent meets the parity bound
+        optimal_flag = result.status == minizinc.Status.OPTIMAL_SOLUTION or reaches_lb(n, obj)
     else:
         sol = output_item
         obj = None
@@ -160,6 +262,32 @@ def run_model(model_file: str, solver_name: str, n: int, ss, sb: int, opt: bool)
     return int(t), "sat", payload
 
 
+def run_decomposed(model_file: str, solver_name: str, n: int, ss, sb: int, threads: int = 1,
+                   search: dict = None, time_limit: int = TIME_LIMIT, hint=None):
+    """
+    Fairness by decomposition: solve the decision model, then orient the
+    schedule with common.orientation. Every team plays an odd number of
+    games, so max_dev >= 1 and the orientation (max_dev = 1) is optimal.
+    """
+    t, st, payload = run_model(model_file, solver_name, n, ss, sb, False,
+                               threads=threads, search=search, time_limit=time_limit, hint=hint)
+    if st != "sat":
+        return t, st, payload
+
+    t0 = time.perf_counter()
+    sol = orient_solution(payload["sol"])
+    obj = max_deviation(sol)
+    t_total = min(time_limit, t + time.perf_counter() - t0)
+
+    payload = {
+        "time": int(t_total),
+        "optimal": reaches_lb(n, obj),
+        "obj": obj,
+        "sol": sol,
+    }
+    return int(t_total), "sat", payload
+
+
 def filter_models(models: dict) -> dict:
     # 1) If -models is provided, run exactly those keys(overrides everything else)
     if args.models.strip():
@@ -194,6 +322,62 @@ def filter_models(models: dict) -> dict:
     return out
 
 
+def autotune(model_names: dict, jobs: int, threads: int) -> None:
+    """
+    Race search_grid() at args.tune_budget seconds for every distinct
+    (solver, opt, sb) among the selected models and persist the winner per n.
+    """
+    profile = load_profile(PROFILE_PATH)
+
+    groups = {}
+    for model_data in model_names.values():
+        if model_data.get("decomposed", False):
+            continue
+        key = profile_key(model_data["solver"], model_data["opt"], model_data["use_sb"])
+        groups.setdefault(key, model_data)
+
+    for n in N_VALUES:
+        for key, model_data in groups.items():
+            grid = search_grid(model_data["opt"])
+            print(f"\n=== CP autotune {key} n={n}: {len(grid)} configs x {args.tune_budget}s ===")
+
+            def race(cfg):
+                t0 = time.perf_counter()
+                _t, st, payload = run_model(
+                    model_data["model"],
+                    model_data["solver"],
+                    n,
+                    model_data["use_ss"],
+                    model_data["use_sb"],
+                    model_data["opt"],
+                    threads=threads,
+                    search=cfg,
+                    time_limit=args.tune_budget,
+                )
+                wall = time.perf_counter() - t0
+                return race_score(st, payload, wall), cfg, st
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                with ThreadPoolExecutor(max_workers=jobs) as pool:
+                    ranked = sorted(pool.map(race, grid), key=lambda r: r[0])
+
+            score, best, st = ranked[0]
+            if st not in ("sat", "unsat"):
+                print(f"[{key}] n={n} no configuration finished within {args.tune_budget}s, profile unchanged")
+                continue
+
+            profile.setdefault(key, {})[str(n)] = {
+                "search": best,
+                "label": search_label(best),
+                "wall": round(score[-1], 3),
+                "obj": score[1] if score[1] != float("inf") else None,
+            }
+            save_profile(PROFILE_PATH, profile)
+            print(f"[{key}] n={n} best={search_label(best)} wall={score[-1]:.3f}s")
+
+    print(f"Wrote search profile to {PROFILE_PATH}")
+
+
 def main():
 
     any_filters = any([
@@ -205,7 +389,7 @@ def main():
         bool(args.models.strip()),
     ])
 
-    if args.n == 0 or any_filters:
+    if args.n == 0 or any_filters or args.autotune:
         model_names = filter_models(MODEL_NAMES)
     else:
         mod_type = int(
@@ -230,26 +414,66 @@ def main():
         print("No models selected (filters removed everything).")
         return
 
+    jobs = max(1, args.jobs)
+    threads = threads_per_job(jobs)
+
+    if args.autotune:
+        autotune(model_names, jobs, threads)
+        return
+
+    profile = load_profile(PROFILE_PATH)
+
     for n in N_VALUES:
         json_path = OUTPUT_DIR / f"{n}.json"
-        existing = load_existing(json_path)
-
-        print(f"\n=== CP n={n} ===")
-
-        for model_name, model_data in model_names.items():
-            t, st, payload = run_model(
-                model_data["model"],
-                model_data["solver"],
-                n,
-                model_data["use_ss"],
-                model_data["use_sb"],
-                model_data["opt"],
-            )
-
-            existing[model_name] = payload
-            save_json(json_path, existing)
 
-            print(f"[{model_name}] status={st} time={t:.3f}s")
+        print(f"\n=== CP n={n} (jobs={jobs}, threads/job={threads}) ===")
+
+        def run_job(model_name, model_data):
+            search = None
+            if model_data.get("tuned", False):
+                search = tuned_search(profile, model_data["solver"], model_data["opt"], model_data["use_sb"], n)
+
+            # loaded per job so opt models can start from a decision result saved earlier
+            hint = load_hint(n, args.hint, prefer="CP") if args.hint else None
+
+            if model_data.get("decomposed", False):
+                t, st, payload = run_decomposed(
+                    model_data["model"],
+                    model_data["solver"],
+                    n,
+                    model_data["use_ss"],
+                    model_data["use_sb"],
+                    threads=threads,
+                    search=search,
+                    hint=hint,
+                )
+            else:
+                t, st, payload = run_model(
+                    model_data["model"],
+                    model_data["solver"],
+                    n,
+                    model_data["use_ss"],
+                    model_data["use_sb"],
+                    model_data["opt"],
+                    threads=threads,
+                    search=search,
+                    hint=hint,
+                )
+            key = result_key(model_name, model_data["solver"], threads) + pairing_suffix(args.pairing)
+            if hint:
+                key = f"{key}_ws"
+
+            # jobs finish in any order: each entry is its own store transaction
+            update_result_file(json_path, {key: payload})
+            print(f"[{key}] status={st} time={t:.3f}s")
+
+        # stderr is redirected once for the whole pool: redirect_stderr
+        # swaps sys.stderr globally and is not safe to nest across threads
+        with contextlib.redirect_stderr(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(run_job, k, v) for k, v in model_names.items()]
+                for f in futures:
+                    f.result()
 
         print(f"Wrote results to {json_path}")
 
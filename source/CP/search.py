@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Search configurations for the CP models and the autotuner profile.
+
+A search configuration is a dict of the integer knobs read by the .mzn files:
+  use_ss   0 => no annotation, 1 => int_search(var, val) on per[]
+  var      index in VAR_SEL
+  val      index in VAL_SEL
+  restart  index in RESTARTS
+  lns      0 => off, else % of per[] kept by relax_and_reconstruct (opt only)
+
+The autotuner races search_grid() at a short budget for each
+(solver, opt, sb, n) and stores the winner in res/CP/tuning/search_profile.json;
+the *_tuned models read it back with tuned_search().
+"""
+
+import json
+from pathlib import Path
+
+VAR_SEL = ["input_order", "first_fail", "dom_w_deg", "max_regret", "most_constrained"]
+VAL_SEL = ["indomain_min", "indomain_random", "indomain_split"]
+RESTARTS = ["none", "luby", "geometric"]
+LNS_KEEP = [0, 70, 85]
+
+NO_SEARCH = {"use_ss": 0, "var": 0, "val": 0, "restart": 0, "lns": 0}
+
+# what use_ss=1 meant before the search knobs existed
+LEGACY_SEARCH = {"use_ss": 1, "var": 1, "val": 0, "restart": 0, "lns": 0}
+
+
+def search_label(cfg: dict) -> str:
+    if not cfg.get("use_ss", 0):
+        return "default"
+    label = f"{VAR_SEL[cfg['var']]}/{VAL_SEL[cfg['val']]}/{RESTARTS[cfg['restart']]}"
+    if cfg.get("lns", 0):
+        label += f"/lns{cfg['lns']}"
+    return label
+
+
+def search_grid(opt: bool) -> list:
+    """
+    All configurations raced by the autotuner. LNS needs restarts,
+    so it is only combined with luby/geometric and only for the opt model.
+    """
+    grid = [dict(NO_SEARCH)]
+    for var in range(len(VAR_SEL)):
+        for val in range(len(VAL_SEL)):
+            for restart in range(len(RESTARTS)):
+                for lns in (LNS_KEEP if opt and restart > 0 else [0]):
+                    grid.append({"use_ss": 1, "var": var, "val": val, "restart": restart, "lns": lns})
+    return grid
+
+
+def profile_key(solver: str, opt: bool, sb: int) -> str:
+    return f"{solver}_{'opt' if opt else 'dec'}_sb{int(sb)}"
+
+
+def load_profile(path: Path) -> dict:
+    if path.exists() and path.stat().st_size > 0:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return {}
+    return {}
+
+
+def save_profile(path: Path, profile: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(profile, indent=2), encoding="utf-8")
+
+
+def tuned_search(profile: dict, solver: str, opt: bool, sb: int, n: int):
+    """
+    Winning configuration for this (solver, opt, sb, n), or None if the
+    autotuner has not been run for it.
+    """
+    entry = profile.get(profile_key(solver, opt, sb), {}).get(str(n))
+    if entry is None:
+        return None
+    return entry["search"]
+
+
+def race_score(status: str, payload: dict, wall: float) -> tuple:
+    """
+    Lower is better: solved first, then best objective, then proven
+    optimality, then wall-clock time.
+    """
+    solved = status in ("sat", "unsat")
+    obj = payload.get("obj")
+    return (
+        0 if solved else 1,
+        obj if obj is not None else float("inf"),
+        0 if payload.get("optimal") else 1,
+        wall,
+    )
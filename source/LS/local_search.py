@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Tabu / min-conflicts local search for the period assignment of a fixed
+round-robin pairing.
+
+State: per[w, m] = period of match m of week w, every row a permutation
+of 0..P-1, so "one match per slot" always holds and the only violated
+constraint is "at most twice per period". The cost is the number of
+excess team-period occurrences, sum over (t, p) of max(0, C[t, p] - 2),
+with C the NumPy team x period occurrence counts.
+
+Move: swap the periods of two matches of the same week. It touches four
+(team, period) cells on each side, each once (the four teams of a week's
+two matches are distinct), so its delta is O(1):
+
+    - [C[a1,p1] > 2] - [C[b1,p1] > 2] - [C[a2,p2] > 2] - [C[b2,p2] > 2]
+    + [C[a1,p2] >= 2] + [C[b1,p2] >= 2] + [C[a2,p1] >= 2] + [C[b2,p1] >= 2]
+
+Each step picks a random conflicting (team, period), evaluates (vectorised
+over m2) every swap that moves that team out of the period in one of its
+weeks, and applies the best non-tabu one (tabu moves are allowed if they
+beat the best cost seen). A match may not return to the period it left
+for a random tenure proportional to the cost. Without progress for
+`restart_after` steps the search restarts from a fresh random state.
+"""
+
+import time
+
+import numpy as np
+
+
+def random_periods(rng, W: int, P: int):
+    return np.array([rng.permutation(P) for _ in range(W)], dtype=np.int64)
+
+
+def team_arrays(n: int, weeks):
+    """
+    A[w, m], B[w, m]: the two teams of match m of week w.
+    match_of[t, w]: index of the match of team t in week w.
+    """
+    A = np.array([[a for a, _ in week] for week in weeks], dtype=np.int64)
+    B = np.array([[b for _, b in week] for week in weeks], dtype=np.int64)
+    W, P = A.shape
+    match_of = np.zeros((n + 1, W), dtype=np.int64)
+    cols = np.broadcast_to(np.arange(W)[:, None], (W, P))
+    match_of[A, cols] = np.arange(P)
+    match_of[B, cols] = np.arange(P)
+    return A, B, match_of
+
+
+def occurrence_counts(n: int, A, B, per):
+    P = A.shape[1]
+    C = np.zeros((n + 1, P), dtype=np.int64)
+    np.add.at(C, (A, per), 1)
+    np.add.at(C, (B, per), 1)
+    return C
+
+
+def cost_of(C) -> int:
+    return int(np.maximum(C - 2, 0).sum())
+
+
+def search(n: int, weeks, seed: int = 0, time_limit: float = 300, init=None,
+           restart_after: int = None, stop=None):
+    """
+    Run until a feasible assignment is found, time_limit (seconds) runs
+    out or the multiprocessing Event `stop` is set.
+
+    init: optional starting per[w][m] (used for the first start only).
+    restart_after: steps without a new best cost before restarting,
+    default 100 * W * P.
+    Returns (per or None, stats) with per as a list of lists.
+    """
+    rng = np.random.default_rng(seed)
+    A, B, match_of = team_arrays(n, weeks)
+    W, P = A.shape
+    if restart_after is None:
+        restart_after = 100 * W * P
+    deadline = time.perf_counter() + time_limit
+
+    stats = {"seed": seed, "steps": 0, "restarts": 0, "best_cost": None}
+    per = np.array(init, dtype=np.int64) if init is not None else random_periods(rng, W, P)
+
+    while True:
+        C = occurrence_counts(n, A, B, per)
+        # period of team t in week w
+        team_per = np.zeros((n + 1, W), dtype=np.int64)
+        rows = np.arange(W)[:, None]
+        team_per[A, np.broadcast_to(rows, (W, P))] = per
+        team_per[B, np.broadcast_to(rows, (W, P))] = per
+
+        cost = cost_of(C)
+        best = cost
+        last_gain = stats["steps"]
+        tabu = np.zeros((W, P, P), dtype=np.int64)   # [w, m, q]: step until m may enter q
+
+        while cost > 0:
+            step = stats["steps"] = stats["steps"] + 1
+            if step % 256 == 0:
+                if time.perf_counter() > deadline or (stop is not None and stop.is_set()):
+                    stats["best_cost"] = min(best, stats["best_cost"] or best)
+                    return None, stats
+            if step - last_gain > restart_after:
+                break
+
+            conflicts = np.argwhere(C[1:] > 2)
+            t, p = conflicts[rng.integers(len(conflicts))]
+            t += 1
+
+            choice = None
+            candidate_weeks = np.nonzero(team_per[t] == p)[0]
+            for w in candidate_weeks:
+                m1 = match_of[t, w]
+                a1, b1 = A[w, m1], B[w, m1]
+                a2, b2, p2 = A[w], B[w], per[w]
+
+                leave = int(C[a1, p] > 2) + int(C[b1, p] > 2)
+                delta = ((C[a1, p2] >= 2).astype(np.int64) + (C[b1, p2] >= 2)
+                         + (C[a2, p] >= 2) + (C[b2, p] >= 2)
+                         - (C[a2, p2] > 2) - (C[b2, p2] > 2) - leave)
+                delta[m1] = P * 8
+
+                is_tabu = (tabu[w, m1, p2] > step) | (tabu[w, np.arange(P), p] > step)
+                delta[is_tabu & (cost + delta >= best)] = P * 8
+
+                d = delta.min()
+                if d >= P * 8:
+                    continue
+                if choice is None or d < choice[0]:
+                    ties = np.nonzero(delta == d)[0]
+                    choice = (d, w, m1, ties[rng.integers(len(ties))])
+                elif d == choice[0] and rng.random() < 0.5:
+                    ties = np.nonzero(delta == d)[0]
+                    choice = (d, w, m1, ties[rng.integers(len(ties))])
+
+            if choice is None:
+                # every move is tabu: random walk step
+                w = candidate_weeks[rng.integers(len(candidate_weeks))]
+                m1 = match_of[t, w]
+                m2 = (m1 + 1 + rng.integers(P - 1)) % P
+                a1, b1, a2, b2 = A[w, m1], B[w, m1], A[w, m2], B[w, m2]
+                q = per[w, m2]
+                d = (int(C[a1, q] >= 2) + int(C[b1, q] >= 2) + int(C[a2, p] >= 2) + int(C[b2, p] >= 2)
+                     - int(C[a1, p] > 2) - int(C[b1, p] > 2) - int(C[a2, q] > 2) - int(C[b2, q] > 2))
+                choice = (d, w, m1, m2)
+
+            d, w, m1, m2 = choice
+            p1, p2 = per[w, m1], per[w, m2]
+            for team in (A[w, m1], B[w, m1]):
+                C[team, p1] -= 1
+                C[team, p2] += 1
+                team_per[team, w] = p2
+            for team in (A[w, m2], B[w, m2]):
+                C[team, p2] -= 1
+                C[team, p1] += 1
+                team_per[team, w] = p1
+            per[w, m1], per[w, m2] = p2, p1
+
+            tenure = int(rng.integers(0, P)) + cost
+            tabu[w, m1, p1] = step + tenure
+            tabu[w, m2, p2] = step + tenure
+
+            cost += int(d)
+            if cost < best:
+                best = cost
+                last_gain = step
+
+        stats["best_cost"] = min(best, stats["best_cost"] if stats["best_cost"] is not None else best)
+        if cost == 0:
+            stats["best_cost"] = 0
+            return per.tolist(), stats
+
+        stats["restarts"] += 1
+        per = random_periods(rng, W, P)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Run the local search approach for STS (incomplete: it never proves
+infeasibility, n = 4 just times out).
+
+Independent restarts run in parallel, one process per seed; the first
+feasible assignment stops the others. With --balance the schedule is then
+oriented by common.orientation (|home - away| = 1 for every team, which
+meets the parity lower bound) and stored as LS_opt.
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+from pathlib import Path
+
+from local_search import search
+
+BASE_DIR = Path(__file__).parent
+ROOT_DIR = BASE_DIR.parent.parent
+OUTPUT_DIR = ROOT_DIR / "res" / "LS"
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+sys.path.insert(0, str(BASE_DIR.parent))
+sys.path.insert(0, str(BASE_DIR.parent / "CONSTRUCT"))
+sys.path.insert(0, str(ROOT_DIR))
+
+from construct import construct_periods, to_solution
+from common.bounds import reaches_lb
+from common.orientation import orient_solution, max_deviation
+from common.store import update_result_file
+from common.pairings import load_pairing, pairing_suffix
+from fast_checker import check_solution
+
+TIMEOUT = 300
+KILL_GRACE = 5
+
+
+def timeout_result():
+    return {"time": 300, "optimal": False, "obj": None, "sol": []}
+
+
+def worker(n, seed, time_limit, use_construct, pairing, stop, results):
+    weeks = load_pairing(n, pairing).weeks(sorted_pairs=True)
+    init = construct_periods(n, weeks) if use_construct else None
+    per, stats = search(n, weeks, seed=seed, time_limit=time_limit, init=init, stop=stop)
+    results.put((per, stats))
+
+
+def run_parallel(n, workers, seed, time_limit, use_construct, pairing="circle"):
+    """
+    Start `workers` searches with seeds seed, seed+1, ... (only the first
+    one starts from the CONSTRUCT assignment when use_construct is set).
+    Returns (per or None, stats of the winner or of all workers).
+    """
+    stop = mp.Event()
+    results = mp.Queue()
+    procs = [
+        mp.Process(target=worker, args=(n, seed + i, time_limit, use_construct and i == 0, pairing, stop, results))
+        for i in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+
+    deadline = time.time() + time_limit + KILL_GRACE
+    found, all_stats = None, []
+    while len(all_stats) < workers and time.time() < deadline:
+        try:
+            per, stats = results.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        all_stats.append(stats)
+        if per is not None:
+            found = (per, stats)
+            stop.set()
+            break
+
+    stop.set()
+    for proc in procs:
+        proc.join(KILL_GRACE)
+        if proc.is_alive():
+            proc.kill()
+            proc.join()
+
+    if found:
+        return found
+    return None, all_stats
+
+
+def run_one(n, workers, seed, time_limit, use_construct, balance, json_path, pairing="circle"):
+    key = ("LS_opt" if balance else "LS") + pairing_suffix(pairing)
+    weeks = load_pairing(n, pairing).weeks(sorted_pairs=True)
+
+    start = time.time()
+    per, stats = run_parallel(n, workers, seed, time_limit, use_construct, pairing)
+    elapsed = time.time() - start
+
+    if per is None:
+        best = min((s["best_cost"] for s in stats if s["best_cost"] is not None), default=None)
+        print(f"[{key}] n={n} TIMEOUT (best cost {best})")
+        update_result_file(json_path, {key: timeout_result()})
+        return
+
+    sol = to_solution(n, weeks, per)
+    obj = None
+    if balance:
+        sol = orient_solution(sol)
+        obj = max_deviation(sol)
+        elapsed = time.time() - start
+
+    status = check_solution(sol, obj, int(elapsed), True)
+    if status != "Valid solution":
+        print(f"[{key}] n={n} invalid schedule: {status}")
+        update_result_file(json_path, {key: timeout_result()})
+        return
+
+    print(f"[{key}] n={n} seed={stats['seed']} steps={stats['steps']} "
+          f"restarts={stats['restarts']} time={elapsed:.3f}s obj={obj}")
+    update_result_file(json_path, {
+        key: {
+            "time": int(min(elapsed, TIMEOUT)),
+            "optimal": reaches_lb(n, obj) if balance else True,
+            "obj": obj,
+            "sol": sol
+        }
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="parallel restarts, one process per seed")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first worker")
+    parser.add_argument("--time_limit", type=float, default=TIMEOUT)
+    parser.add_argument("--construct", action="store_true",
+                        help="start the first worker from the CONSTRUCT assignment (circle pairing only)")
+    parser.add_argument("--balance", action="store_true",
+                        help="orient home/away afterwards and store the result as LS_opt")
+    parser.add_argument("--pairing", type=str, default="circle",
+                        help="week pairings: circle, berger, greedy, an integer seed or file.json (common/pairings.py); "
+                             "keys get a _pair<spec> suffix")
+    args = parser.parse_args()
+    if args.construct and pairing_suffix(args.pairing):
+        parser.error("--construct only applies to the circle pairing")
+
+    if args.n == 0:
+        N_VALUES = [6, 8, 10, 12, 14, 16, 18, 20, 22, 24]
+    else:
+        N_VALUES = [args.n]
+
+    for n in N_VALUES:
+        print(f"\n====== Running n = {n} ======")
+        run_one(n, args.workers, args.seed, args.time_limit, args.construct, args.balance,
+                OUTPUT_DIR / f"{n}.json", args.pairing)
+
+    print("\nDone.\n")
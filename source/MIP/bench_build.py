@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Model build time: sparse NumPy/SciPy generation vs AMPL instantiation.
+
+For every n and formulation, prints rows/cols/nnz of the sparse model and
+the time to build it, next to the time AMPL needs to read the .mod,
+load the data and generate the instance (skipped if amplpy is missing).
+
+usage: python source/MIP/bench_build.py [--n 6,10,20,30,40]
+"""
+
+import argparse
+import time
+
+from sparse_model import build_model, FORMULATIONS
+
+AMPL_FILES = {
+    "MIP_plain":    "source/MIP/sts_plain.mod",
+    "MIP_symmetry": "source/MIP/sts_symmetry.mod",
+    "MIP_implied":  "source/MIP/sts_implied.mod",
+    "MIP_opt":      "source/MIP/sts_opt.mod",
+}
+
+
+def time_sparse(model_name, n):
+    t0 = time.perf_counter()
+    model = build_model(model_name, n)
+    return time.perf_counter() - t0, model.stats()
+
+
+def time_ampl(model_name, n):
+    try:
+        from run import load_ampl
+    except ImportError:
+        return None
+
+    t0 = time.perf_counter()
+    ampl = load_ampl(model_name, AMPL_FILES[model_name], n)
+    # referencing _ncons forces AMPL to generate the instance
+    ampl.getValue("_ncons")
+    elapsed = time.perf_counter() - t0
+    ampl.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=str, default="6,10,16,20,24,30,36,40")
+    args = parser.parse_args()
+    n_values = [int(v) for v in args.n.split(",") if v.strip()]
+
+    print(f"{'model':<14}{'n':>4}{'rows':>10}{'cols':>10}{'nnz':>12}{'sparse[s]':>12}{'ampl[s]':>10}")
+    for n in n_values:
+        for model_name in FORMULATIONS:
+            t_sparse, st = time_sparse(model_name, n)
+            t_ampl = time_ampl(model_name, n)
+            ampl_str = f"{t_ampl:>10.3f}" if t_ampl is not None else f"{'-':>10}"
+            print(f"{model_name:<14}{n:>4}{st['rows']:>10}{st['cols']:>10}{st['nnz']:>12}"
+                  f"{t_sparse:>12.3f}{ampl_str}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Size and solve time of the reduced formulations against the four
+existing ones, all built by sparse_model.py and solved by the open
+backend (HiGHS by default).
+
+usage: python source/MIP/compare_formulations.py [--n 6,8,10,12] [--solver highs|cbc]
+"""
+
+import argparse
+import time
+
+from sparse_model import build_model, extract_schedule, FORMULATIONS, REDUCED
+from run_open import solve_highs, solve_cbc
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=str, default="6,8,10,12")
+    parser.add_argument("--solver", type=str, default="highs", choices=["highs", "cbc"])
+    parser.add_argument("--timelimit", type=int, default=60)
+    args = parser.parse_args()
+    n_values = [int(v) for v in args.n.split(",") if v.strip()]
+    solve = solve_highs if args.solver == "highs" else solve_cbc
+
+    print(f"{'model':<17}{'n':>4}{'rows':>9}{'cols':>9}{'nnz':>10}{'build[s]':>10}{'solve[s]':>10}  status")
+    for n in n_values:
+        for model_name in FORMULATIONS + REDUCED:
+            t0 = time.perf_counter()
+            model = build_model(model_name, n)
+            t_build = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            status, values = solve(model, args.timelimit)
+            t_solve = time.perf_counter() - t0
+            if status == "optimal" and not extract_schedule(model, values):
+                status = "bad-solution"
+
+            st = model.stats()
+            print(f"{model_name:<17}{n:>4}{st['rows']:>9}{st['cols']:>9}{st['nnz']:>10}"
+                  f"{t_build:>10.3f}{t_solve:>10.3f}  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Round-robin matches (circle method) for the MIP models.
+Returns a flat list of (i, j, w) with weeks 1..n-1.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.tournament import tournament
+
+
+def generate_round_robin(n, unordered=False, pairing=None):
+    # same pairing as the other approaches (common/tournament.py), or the
+    # given Tournament (common/pairings.py); i is the left team of the
+    # circle, or min(i, j) when unordered
+    return (pairing or tournament(n)).match_list(unordered=unordered)
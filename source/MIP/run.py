@@ -1,8 +1,22 @@
 import argparse
+import multiprocessing as mp
+import os
+import queue
+import signal
+import sys
 import time
 from pathlib import Path
 from amplpy import AMPL
-from utils_json import write_result_json
+from utils_json import merge_result_json
+from round_robin import generate_round_robin
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.bounds import fairness_lb, reaches_lb
+from common.hints import load_hint, hint_assignment
+from common.orientation import orient_solution, max_deviation
+from common.schedule import Schedule
+from common.pairings import load_pairing, pairing_suffix
 
 
 MODEL_FILES = {
@@ -10,66 +24,111 @@ MODEL_FILES = {
     "MIP_symmetry": "source/MIP/sts_symmetry.mod",
     "MIP_implied":  "source/MIP/sts_implied.mod",
     "MIP_opt":      "source/MIP/sts_opt.mod",
+    # decision model + optimal home/away orientation (common/orientation.py)
+    "MIP_opt_decomposed": "source/MIP/sts_implied.mod",
 }
 
-SOLVERS = ["gurobi", "cplex"]
-
-
-def generate_round_robin(n, unordered=False):
-    teams = list(range(1, n + 1))
-    fixed = teams[-1]
-    rotating = teams[:-1]
-
-    matches = []
-
-    for w in range(1, n):
-        left = [fixed] + rotating[: (n // 2) - 1]
-        right = rotating[(n // 2) - 1:][::-1]
+DECOMPOSED_MODELS = {"MIP_opt_decomposed"}
 
-        for i, j in zip(left, right):
-            if unordered:
-                matches.append((min(i, j), max(i, j), w))
-            else:
-                matches.append((i, j, w))
+SOLVERS = ["gurobi", "cplex"]
 
-        rotating = [rotating[-1]] + rotating[:-1]
+TIME_LIMIT = 300
 
-    return matches
+# extra wall-clock allowed on top of the solver time limit before a
+# parallel job is killed (model generation, AMPL start-up, extraction)
+KILL_GRACE = 30
 
 
-def solve_ampl(model_name, model_file, solver_name, n):
+def load_ampl(model_name, model_file, n, pairing="circle"):
+    """
+    One AMPL process per model: parse the .mod once and pass the match set
+    in memory. The instance is then reused for every solver.
+    """
     ampl = AMPL()
 
-
     ampl.setOption("solver_msg", 0)
     ampl.setOption("show_stats", 0)
     ampl.setOption("display_precision", 0)
 
-    
-    ampl.setOption("gurobi_options",
-                    "timelimit=300 mipgap=0 outlev=0")
+    # every solver starts from scratch, not from the previous solver's point
+    ampl.setOption("reset_initial_guesses", 1)
+    ampl.setOption("send_statuses", 0)
 
-    t_pre_start = time.perf_counter()
-
-    
     ampl.read(model_file)
-    ampl.eval(f"let n := {n};")
+    ampl.getParameter("n").set(n)
+
+    # nonzero support of x, recomputed by AMPL after every solve
+    ampl.eval("set X_SUPPORT = {(i,j,w) in MATCHES, p in PERIODS: x[i,j,w,p] > 0.5};")
 
     is_opt = model_name.startswith("MIP_opt")
-    matches = generate_round_robin(n, unordered=is_opt)
+    matches = generate_round_robin(n, unordered=is_opt, pairing=load_pairing(n, pairing))
+    ampl.getSet("MATCHES").setValues(matches)
 
-    dat_path = "/tmp/matches.dat"
-    with open(dat_path, "w") as f:
-        f.write("set MATCHES :=\n")
-        for i, j, w in matches:
-            f.write(f"  ({i},{j},{w})\n")
-        f.write(";\n")
+    if is_opt and model_name not in DECOMPOSED_MODELS:
+        ampl.getParameter("F_LB").set(fairness_lb(n))
 
-    ampl.readData(dat_path)
-    ampl.eval(f"option solver {solver_name};")
+    return ampl
 
-    
-    start = time.time()
+
+def mip_start(model_name, n, hint, pairing="circle"):
+    """
+    Initial values of x (and y for the opt model) from a hint schedule, or
+    None if the hint does not fit the pairing. Periods are renamed so the
+    week-1 match of team 1 is in period 1 (FixFirstMatchToFirstPeriod).
+    """
+    is_opt = model_name.startswith("MIP_opt")
+    matches = generate_round_robin(n, unordered=is_opt, pairing=load_pairing(n, pairing))
+    weeks = [[(i, j) for (i, j, w) in matches if w == week] for week in range(1, n)]
+
+    try:
+        per, home = hint_assignment(hint, weeks)
+    except ValueError as e:
+        print(f"     hint ignored: {e}")
+        return None
+
+    first = next(per[0][m] for m, (i, j) in enumerate(weeks[0]) if 1 in (i, j))
+    rename = {first: 0, 0: first}
+    per = [[rename.get(p, p) for p in row] for row in per]
+
+    x, y = {}, {}
+    for w, week in enumerate(weeks):
+        for m, (i, j) in enumerate(week):
+            for p in range(n // 2):
+                on = 1 if per[w][m] == p else 0
+                x[(i, j, w + 1, p + 1)] = on
+                if is_opt:
+                    y[(i, j, w + 1, p + 1)] = on if home[w][m] else 0
+
+    return {"x": x, "y": y} if is_opt else {"x": x}
+
+
+def solver_options(solver_name, threads=0, seed=None, time_limit=TIME_LIMIT):
+    """
+    threads=0 lets the solver use every core it sees.
+    """
+    opts = f"timelimit={time_limit} mipgap=0"
+    if solver_name == "gurobi":
+        opts += " outlev=0"
+    if threads > 0:
+        opts += f" threads={threads}"
+    if seed is not None:
+        opts += f" seed={seed}"
+    return opts
+
+
+def solve_ampl(ampl, solver_name, n, preprocessing_time, threads=0, seed=None, time_limit=TIME_LIMIT,
+               start=None):
+    ampl.setOption("solver", solver_name)
+    ampl.setOption(f"{solver_name}_options", solver_options(solver_name, threads, seed, time_limit))
+
+    if start:
+        # send the current values as MIP start; re-applied before every
+        # solver since the previous solve overwrote them
+        ampl.setOption("reset_initial_guesses", 0)
+        for var_name, values in start.items():
+            ampl.getVariable(var_name).setValues(values)
+
+    t_solve_start = time.perf_counter()
     ampl.solve()
     t_solve_end = time.perf_counter()
 
@@ -84,15 +143,18 @@ def solve_ampl(model_name, model_file, solver_name, n):
     if "error" in result or result_num >= 500:
         return total_time, False, None, []
 
-    if "limit" in result or result_num == 400:
-        return 300, False, None, []
-
-    
     try:
         obj = ampl.getObjective("FairnessObjective").value()
     except:
         obj = None
 
+    if "limit" in result or result_num == 400:
+        # an incumbent at the parity bound is optimal even without the proof
+        sol = extract_schedule(ampl, n) if obj is not None and reaches_lb(n, round(obj)) else []
+        if sol == []:
+            return 300, False, None, []
+        return total_time, True, obj, sol
+
     
     sol = extract_schedule(ampl, n)
     if sol == []:
@@ -102,82 +164,215 @@ def solve_ampl(model_name, model_file, solver_name, n):
 
 
 def extract_schedule(ampl, n):
+    # only the (i,j,w,p) with x = 1 cross the API: n(n-1)/2 tuples
+    # instead of the full O(n^3) variable table
     try:
-        vals = ampl.getVariable("x").getValues()
+        support = ampl.getSet("X_SUPPORT").getValues().to_list()
     except:
         return []
 
-    sched = [[None for _ in range(n - 1)] for _ in range(n // 2)]
+    sched = Schedule.empty(n)
 
-    for (i, j, w, p), val in vals.to_dict().items():
-        if val > 0.5:
-            sched[int(p) - 1][int(w) - 1] = [int(i), int(j)]
+    for i, j, w, p in support:
+        sched[int(p) - 1, int(w) - 1] = (int(i), int(j))
 
-  
-    has_match = any(any(slot is not None for slot in row) for row in sched)
-    if not has_match:
+    if sched.holes() == sched.periods * sched.weeks:
         return []
 
-    return sched
+    return sched.tolist()
 
 
-def run_all(n):
+def make_entry(model_name, elapsed, optimal, obj, sol):
+    if model_name in DECOMPOSED_MODELS and optimal:
+        # W = n-1 is odd so F >= 1; the orientation reaches F = 1
+        t0 = time.perf_counter()
+        sol = orient_solution(sol)
+        obj = max_deviation(sol)
+        elapsed += time.perf_counter() - t0
+
+    if not model_name.startswith("MIP_opt"):
+        obj = None
+
+    if not optimal:
+        return {
+            "time": int(min(elapsed, 300)),
+            "optimal": False,
+            "obj": None,
+            "sol": []
+        }
+    return {
+        "time": int(min(elapsed, 300)),
+        "optimal": True,
+        "obj": obj,
+        "sol": sol
+    }
+
+
+def print_entry(entry):
+    if entry["sol"]:
+        print("     ✓ Solution found")
+    else:
+        print("     ✗ No valid solution")
+
+
+def save_results(n, results):
+    out = Path("res/MIP")
+    out.mkdir(parents=True, exist_ok=True)
+    outfile = out / f"{n}.json"
+
+    # merge: other models/solvers already in the file are kept
+    merge_result_json(str(outfile), results)
+    print(f"\nSaved: {outfile}\n")
+
+
+def run_all(n, threads=0, seed=None, time_limit=TIME_LIMIT, hint=None, pairing="circle"):
     results = {}
 
     print(f"\nRunning AMPL models for n = {n}...\n")
 
     for model_name, file_name in MODEL_FILES.items():
+        t_pre_start = time.perf_counter()
+        ampl = load_ampl(model_name, file_name, n, pairing)
+        start = mip_start(model_name, n, hint, pairing) if hint else None
+        preprocessing_time = time.perf_counter() - t_pre_start
+
         for solver_name in SOLVERS:
 
-            tag = f"{model_name}_{solver_name}"
+            tag = f"{model_name}_{solver_name}{pairing_suffix(pairing)}" + ("_ws" if start else "")
             print(f"  → {tag}")
 
             elapsed, optimal, obj, sol = solve_ampl(
-                model_name, file_name, solver_name, n
+                ampl, solver_name, n, preprocessing_time, threads=threads, seed=seed, time_limit=time_limit,
+                start=start,
             )
 
-            if not model_name.startswith("MIP_opt"):
-                obj = None
-
-            if not optimal:
-                print("     ✗ No valid solution")
-                results[tag] = {
-                    "time": int(min(elapsed, 300)),
-                    "optimal": False,
-                    "obj": None,
-                    "sol": []
-                }
+            results[tag] = make_entry(model_name, elapsed, optimal, obj, sol)
+            print_entry(results[tag])
+
+        ampl.close()
+
+    save_results(n, results)
+
+
+def job_worker(model_name, file_name, solver_name, n, threads, seed, time_limit, hint, pairing, results):
+    """
+    One model x solver in its own process and its own AMPL instance.
+    """
+    # new session: the parent kills the whole group (AMPL + solver) on deadline
+    os.setsid()
+
+    t_pre_start = time.perf_counter()
+    ampl = load_ampl(model_name, file_name, n, pairing)
+    start = mip_start(model_name, n, hint, pairing) if hint else None
+    preprocessing_time = time.perf_counter() - t_pre_start
+
+    elapsed, optimal, obj, sol = solve_ampl(
+        ampl, solver_name, n, preprocessing_time, threads=threads, seed=seed, time_limit=time_limit,
+        start=start,
+    )
+    ampl.close()
+
+    # the parent tracks the job under the plain tag
+    results.put((f"{model_name}_{solver_name}", make_entry(model_name, elapsed, optimal, obj, sol)))
+
+
+def run_parallel(n, jobs, threads, seed=None, time_limit=TIME_LIMIT, hint=None, pairing="circle"):
+    """
+    Run every model x solver combination concurrently, at most `jobs` at a
+    time, each with `threads` solver threads and a hard wall-clock deadline.
+    """
+    print(f"\nRunning AMPL models for n = {n} ({jobs} jobs x {threads} threads)...\n")
+
+    results_q = mp.Queue()
+    pending = [(m, f, s) for m, f in MODEL_FILES.items() for s in SOLVERS]
+    running = {}
+    results = {}
+
+    def drain():
+        while True:
+            try:
+                tag, entry = results_q.get_nowait()
+            except queue.Empty:
+                return
+            results[tag] = entry
+            print(f"  → {tag}")
+            print_entry(entry)
+
+    while pending or running:
+        while pending and len(running) < jobs:
+            model_name, file_name, solver_name = pending.pop(0)
+            proc = mp.Process(
+                target=job_worker,
+                args=(model_name, file_name, solver_name, n, threads, seed, time_limit, hint, pairing, results_q),
+            )
+            proc.start()
+            running[f"{model_name}_{solver_name}"] = (proc, time.time() + time_limit + KILL_GRACE)
+
+        time.sleep(0.2)
+        drain()
+
+        for tag, (proc, deadline) in list(running.items()):
+            if tag in results:
+                proc.join()
+            elif not proc.is_alive():
+                drain()
+                if tag not in results:
+                    print(f"  → {tag}\n     ✗ Job exited without a result")
+                    results[tag] = make_entry(tag, TIME_LIMIT, False, None, [])
+            elif time.time() > deadline:
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                proc.join()
+                print(f"  → {tag}\n     ✗ Killed at deadline")
+                results[tag] = make_entry(tag, TIME_LIMIT, False, None, [])
             else:
-                print("     ✓ Solution found")
-                results[tag] = {
-                    "time": int(min(elapsed, 300)),
-                    "optimal": True,
-                    "obj": obj,
-                    "sol": sol
-                }
+                continue
+            del running[tag]
 
-    out = Path("res/MIP")
-    out.mkdir(parents=True, exist_ok=True)
-    outfile = out / f"{n}.json"
+    suffix = pairing_suffix(pairing) + ("_ws" if hint else "")
+    if suffix:
+        results = {f"{tag}{suffix}": entry for tag, entry in results.items()}
+    save_results(n, results)
 
-    write_result_json(str(outfile), full_data=results)
-    print(f"\nSaved: {outfile}\n")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run MIP optimization models.")
     parser.add_argument("-n", type=int, help="Instance size to run. Pass 0 to run all default instances.")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="model x solver combinations run concurrently (1 = sequential, shared AMPL per model)")
+    parser.add_argument("--cores", type=int, default=0,
+                        help="global core budget split between concurrent jobs (0 = solver default threads)")
+    parser.add_argument("--seed", type=int, default=None, help="solver random seed")
+    parser.add_argument("--timelimit", type=int, default=TIME_LIMIT, help="per-job solver time limit in seconds")
+    parser.add_argument("--hint", type=str, default="",
+                        help="MIP start from a schedule: 'auto' (res/*/n.json), 'construct' or path.json[:key]; keys get a _ws suffix")
+    parser.add_argument("--pairing", type=str, default="circle",
+                        help="week pairings: circle, berger, greedy, an integer seed or file.json (common/pairings.py); "
+                             "keys get a _pair<spec> suffix")
     
     args = parser.parse_args()
     inst = int(args.n) 
 
+    jobs = max(1, args.jobs)
+    threads = max(1, args.cores // jobs) if args.cores > 0 else 0
+
+    def run(n):
+        hint = load_hint(n, args.hint, prefer="MIP") if args.hint else None
+        if jobs > 1:
+            run_parallel(n, jobs, threads, seed=args.seed, time_limit=args.timelimit, hint=hint, pairing=args.pairing)
+        else:
+            run_all(n, threads=threads, seed=args.seed, time_limit=args.timelimit, hint=hint, pairing=args.pairing)
+
     
     if inst == 0:
         default_instances = [6, 8, 10, 12, 14, 16]
         print(f"Argument is 0. Running all default instances: {default_instances}")
         for n in default_instances:
-            run_all(n)
+            run(n)
     else:
         print(f"Running specific instance: n = {inst}")
 
-        run_all(inst)
+        run(inst)
 
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Open-source MIP backend: the STS formulations built as SciPy sparse
+matrices (sparse_model.py) and solved with HiGHS or CBC, no AMPL or
+solver licenses needed. Results use the same JSON format as run.py,
+keyed <model>_<solver>, e.g. MIP_plain_highs.
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy.optimize import milp, LinearConstraint, Bounds
+
+from sparse_model import build_model, extract_schedule
+from utils_json import merge_result_json
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.bounds import reaches_lb
+from common.orientation import orient_solution, max_deviation
+from common.pairings import load_pairing, pairing_suffix
+from common.procs import run_command
+
+TIME_LIMIT = 300
+
+# result key -> sparse formulation
+OPEN_MODELS = {
+    "MIP_plain":    "MIP_plain",
+    "MIP_symmetry": "MIP_symmetry",
+    "MIP_implied":  "MIP_implied",
+    "MIP_opt":      "MIP_opt",
+    # decision model + optimal home/away orientation (common/orientation.py)
+    "MIP_opt_decomposed": "MIP_implied",
+    # smallest equivalent formulations for the fixed pairing
+    "MIP_reduced":     "MIP_reduced",
+    "MIP_opt_reduced": "MIP_reduced_opt",
+}
+
+DECOMPOSED_MODELS = {"MIP_opt_decomposed"}
+
+SOLVERS = ["highs", "cbc"]
+
+
+def solve_highs(model, time_limit):
+    """
+    Returns (status, values) with status in {"optimal", "limit", "infeasible", "error"};
+    on "limit" values is the incumbent, if any.
+    """
+    res = milp(
+        model.c,
+        constraints=LinearConstraint(model.A, model.row_lo, model.row_hi),
+        integrality=model.col_int,
+        bounds=Bounds(model.col_lo, model.col_hi),
+        options={"time_limit": time_limit, "mip_rel_gap": 0, "disp": False},
+    )
+    if res.status == 0:
+        return "optimal", res.x
+    if res.status == 1:
+        return "limit", res.x
+    if res.status == 2:
+        return "infeasible", None
+    return "error", None
+
+
+def cbc_path():
+    path = shutil.which("cbc")
+    if path:
+        return path
+    import pulp
+    return pulp.PULP_CBC_CMD().path
+
+
+def _mps_line(kind, name1, name2, value=None):
+    line = f" {kind:<2} {name1:<8}  {name2:<8}"
+    if value is not None:
+        line += f"  {value:>12g}"
+    return line
+
+
+def write_mps(model, path):
+    """
+    MPS straight from the CSC matrix (columns c<j>, rows r<i>). Fields are
+    padded to the fixed-format columns, which every MPS reader accepts.
+    """
+    A = model.A.tocsc()
+    lo, hi = model.row_lo, model.row_hi
+
+    lines = ["NAME sts", "ROWS", " N obj"]
+    for i in range(A.shape[0]):
+        if lo[i] == hi[i]:
+            kind = "E"
+        elif np.isinf(lo[i]):
+            kind = "L"
+        else:
+            kind = "G"
+        lines.append(f" {kind} r{i}")
+
+    lines.append("COLUMNS")
+    in_int = False
+    for j in range(A.shape[1]):
+        if model.col_int[j] and not in_int:
+            lines.append(_mps_line("", "MARKER", "'MARKER'") + "  'INTORG'")
+            in_int = True
+        elif not model.col_int[j] and in_int:
+            lines.append(_mps_line("", "MARKER", "'MARKER'") + "  'INTEND'")
+            in_int = False
+        if model.c[j] != 0:
+            lines.append(_mps_line("", f"c{j}", "obj", model.c[j]))
+        for k in range(A.indptr[j], A.indptr[j + 1]):
+            lines.append(_mps_line("", f"c{j}", f"r{A.indices[k]}", A.data[k]))
+    if in_int:
+        lines.append(_mps_line("", "MARKER", "'MARKER'") + "  'INTEND'")
+
+    lines.append("RHS")
+    for i in range(A.shape[0]):
+        # E and G rows take lo (a RANGE then adds hi - lo on top), L rows hi
+        rhs = hi[i] if np.isinf(lo[i]) else lo[i]
+        if rhs != 0:
+            lines.append(_mps_line("", "rhs", f"r{i}", rhs))
+
+    ranged = np.flatnonzero(np.isfinite(lo) & np.isfinite(hi) & (lo != hi))
+    if len(ranged):
+        lines.append("RANGES")
+        for i in ranged:
+            lines.append(_mps_line("", "rng", f"r{i}", hi[i] - lo[i]))
+
+    lines.append("BOUNDS")
+    for j in range(A.shape[1]):
+        clo, chi = model.col_lo[j], model.col_hi[j]
+        if clo != 0:
+            lines.append(_mps_line("LO", "bnd", f"c{j}", clo))
+        if np.isinf(chi):
+            lines.append(_mps_line("PL", "bnd", f"c{j}"))
+        else:
+            lines.append(_mps_line("UP", "bnd", f"c{j}", chi))
+    lines.append("ENDATA")
+
+    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def solve_cbc(model, time_limit):
+    with tempfile.TemporaryDirectory(prefix="sts_cbc_") as tmp:
+        mps = Path(tmp) / "model.mps"
+        out = Path(tmp) / "model.sol"
+        write_mps(model, mps)
+
+        cmd = [cbc_path(), str(mps), "-sec", str(time_limit), "-ratio", "0",
+               "-solve", "-solu", str(out)]
+        if run_command(cmd, wall_limit=time_limit + 30).timed_out:
+            return "limit", None
+
+        if not out.exists():
+            return "error", None
+
+        lines = out.read_text(encoding="utf-8").splitlines()
+        header = lines[0].lower() if lines else ""
+        if header.startswith("infeasible"):
+            return "infeasible", None
+        if header.startswith("optimal"):
+            status = "optimal"
+        elif "objective value" in header:
+            # stopped on a limit with an incumbent
+            status = "limit"
+        else:
+            return "limit", None
+
+        values = np.zeros(model.num_cols)
+        for line in lines[1:]:
+            parts = line.split()
+            # "<idx> c<j> <value> <reduced cost>", possibly prefixed by "**"
+            if parts and parts[0] == "**":
+                parts = parts[1:]
+            if len(parts) >= 3 and parts[1].startswith("c"):
+                values[int(parts[1][1:])] = float(parts[2])
+        return status, values
+
+
+def solve_open(model_name, solver_name, n, pairing="circle"):
+    t0 = time.perf_counter()
+    model = build_model(OPEN_MODELS[model_name], n, pairing=load_pairing(n, pairing))
+    build_time = time.perf_counter() - t0
+
+    remaining = max(1, int(TIME_LIMIT - build_time))
+    if solver_name == "highs":
+        status, values = solve_highs(model, remaining)
+    elif solver_name == "cbc":
+        status, values = solve_cbc(model, remaining)
+    else:
+        raise ValueError(f"Unknown solver: {solver_name}")
+
+    total_time = time.perf_counter() - t0
+
+    if status == "limit" and values is not None and model.y0 is not None:
+        # an incumbent at the parity bound is optimal even without the proof
+        if reaches_lb(n, int(round(float(model.c @ values)))):
+            status = "optimal"
+
+    if status == "limit":
+        return 300, False, None, []
+    if status != "optimal":
+        return total_time, False, None, []
+
+    obj = None
+    if model.y0 is not None:
+        obj = int(round(float(model.c @ values)))
+
+    sol = extract_schedule(model, values)
+    if sol == []:
+        return total_time, False, None, []
+
+    return total_time, True, obj, sol
+
+
+def run_all(n, solvers, models, pairing="circle"):
+    results = {}
+
+    print(f"\nRunning open-source MIP models for n = {n}...\n")
+
+    for model_name in models:
+        for solver_name in solvers:
+
+            tag = f"{model_name}_{solver_name}{pairing_suffix(pairing)}"
+            print(f"  → {tag}")
+
+            elapsed, optimal, obj, sol = solve_open(model_name, solver_name, n, pairing)
+
+            if model_name in DECOMPOSED_MODELS and optimal:
+                # W = n-1 is odd so F >= 1; the orientation reaches F = 1
+                t0 = time.perf_counter()
+                sol = orient_solution(sol)
+                obj = max_deviation(sol)
+                elapsed += time.perf_counter() - t0
+
+            if not model_name.startswith("MIP_opt"):
+                obj = None
+
+            if not optimal:
+                print("     ✗ No valid solution")
+                results[tag] = {
+                    "time": int(min(elapsed, 300)),
+                    "optimal": False,
+                    "obj": None,
+                    "sol": []
+                }
+            else:
+                print("     ✓ Solution found")
+                results[tag] = {
+                    "time": int(min(elapsed, 300)),
+                    "optimal": True,
+                    "obj": obj,
+                    "sol": sol
+                }
+
+    out = Path("res/MIP")
+    out.mkdir(parents=True, exist_ok=True)
+    outfile = out / f"{n}.json"
+
+    # keep the AMPL entries of the same file
+    merge_result_json(str(outfile), results)
+    print(f"\nSaved: {outfile}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run MIP models with HiGHS/CBC (no AMPL).")
+    parser.add_argument("-n", type=int, default=0, help="Instance size to run. Pass 0 to run all default instances.")
+    parser.add_argument("--solvers", type=str, default=",".join(SOLVERS), help="comma-separated: highs,cbc")
+    parser.add_argument("--models", type=str, default=",".join(OPEN_MODELS), help="comma-separated model names")
+    parser.add_argument("--pairing", type=str, default="circle",
+                        help="week pairings: circle, berger, greedy, an integer seed or file.json (common/pairings.py); "
+                             "keys get a _pair<spec> suffix")
+
+    args = parser.parse_args()
+    solvers = [s.strip() for s in args.solvers.split(",") if s.strip()]
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+
+    if args.n == 0:
+        default_instances = [6, 8, 10, 12, 14, 16]
+        print(f"Argument is 0. Running all default instances: {default_instances}")
+        for n in default_instances:
+            run_all(n, solvers, models, args.pairing)
+    else:
+        print(f"Running specific instance: n = {args.n}")
+        run_all(args.n, solvers, models, args.pairing)
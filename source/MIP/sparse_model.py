@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Sparse, vectorized generation of the STS MIP formulations.
+
+Builds the same models as sts_plain.mod / sts_symmetry.mod /
+sts_implied.mod / sts_opt.mod directly as a SciPy sparse constraint
+matrix, without AMPL:
+
+    min c^T v   s.t.  row_lo <= A v <= row_hi,  col_lo <= v <= col_hi
+
+Columns:
+  x[k, p]  k = index in generate_round_robin(n), p = period 0..P-1
+  (opt)    y[k, p], h[t], a[t], d[t], F
+
+Every constraint family is emitted as one block of (row, col, val)
+triplets computed with NumPy index arithmetic.
+
+build_reduced() emits the smallest equivalent model for the fixed
+pairing (MIP_reduced / MIP_reduced_opt):
+  - per-match assignment rows replace OneMatchPerTeamWeek (n*W rows
+    become W*P, each team is in exactly one match per week anyway)
+  - week 1 is fixed through column bounds instead of a row
+  - team-period counts go through the precomputed match index
+  - orientation is one binary y[k] per match instead of y[k,p], and
+    |home - away| is bounded directly by F (no h, a, d columns)
+  - optional valid inequalities: count(t,p) >= 1 and
+    NoThreeConsecutiveWeeksSamePeriod
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from round_robin import generate_round_robin
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.bounds import fairness_lb
+from common.schedule import Schedule
+
+FORMULATIONS = ["MIP_plain", "MIP_symmetry", "MIP_implied", "MIP_opt"]
+REDUCED = ["MIP_reduced", "MIP_reduced_opt"]
+
+
+class SparseModel:
+    def __init__(self, n, matches):
+        self.n = n
+        self.W = n - 1
+        self.P = n // 2
+        self.matches = np.asarray(matches, dtype=np.int64)   # (K, 3): i, j, w
+        self.K = len(self.matches)
+        self.num_cols = 0
+        self.col_lo = []
+        self.col_hi = []
+        self.col_int = []
+        self.objective = {}
+        self.blocks = []
+        self.row_names = []
+        self.num_rows = 0
+        self.A = None
+        self.row_lo = None
+        self.row_hi = None
+        self.y0 = None
+        self.y_per_period = True
+        self.fixed = []
+
+    def add_cols(self, count, lo, hi, integer=True):
+        start = self.num_cols
+        self.num_cols += count
+        self.col_lo.append(np.full(count, lo, dtype=float))
+        self.col_hi.append(np.full(count, hi, dtype=float))
+        self.col_int.append(np.full(count, 1 if integer else 0, dtype=np.uint8))
+        return start
+
+    def fix_cols(self, cols, value):
+        self.fixed.append((np.asarray(cols, dtype=np.int64), value))
+
+    def add_rows(self, name, count, rows, cols, vals, lo, hi):
+        """
+        rows are local to the block (0..count-1); lo/hi are scalars or arrays.
+        """
+        self.blocks.append((
+            np.asarray(rows, dtype=np.int64) + self.num_rows,
+            np.asarray(cols, dtype=np.int64),
+            np.broadcast_to(np.asarray(vals, dtype=float), np.shape(rows)),
+            np.broadcast_to(np.asarray(lo, dtype=float), (count,)),
+            np.broadcast_to(np.asarray(hi, dtype=float), (count,)),
+        ))
+        self.row_names.append((name, self.num_rows, count))
+        self.num_rows += count
+
+    def finalize(self):
+        rows = np.concatenate([b[0] for b in self.blocks])
+        cols = np.concatenate([b[1] for b in self.blocks])
+        vals = np.concatenate([b[2] for b in self.blocks])
+        self.A = sparse.csr_matrix((vals, (rows, cols)), shape=(self.num_rows, self.num_cols))
+        self.row_lo = np.concatenate([b[3] for b in self.blocks])
+        self.row_hi = np.concatenate([b[4] for b in self.blocks])
+        self.col_lo = np.concatenate(self.col_lo)
+        self.col_hi = np.concatenate(self.col_hi)
+        self.col_int = np.concatenate(self.col_int)
+        for cols, value in self.fixed:
+            self.col_lo[cols] = value
+            self.col_hi[cols] = value
+        self.c = np.zeros(self.num_cols)
+        for col, coef in self.objective.items():
+            self.c[col] = coef
+        self.blocks = []
+        return self
+
+    def stats(self):
+        return {"rows": self.A.shape[0], "cols": self.A.shape[1], "nnz": int(self.A.nnz)}
+
+
+def _team_incidence(model):
+    """
+    (match, team) incidence as two aligned arrays: for every match k its
+    two teams, so each team t sees exactly the matches it plays.
+    """
+    k = np.arange(model.K)
+    mk = np.concatenate([k, k])
+    teams = np.concatenate([model.matches[:, 0], model.matches[:, 1]])
+    return mk, teams
+
+
+def build_model(model_name, n, pairing=None):
+    """
+    Sparse equivalent of the AMPL model file for model_name, on the circle
+    pairing or the given Tournament (common/pairings.py).
+    """
+    if model_name in REDUCED:
+        return build_reduced(n, opt=(model_name == "MIP_reduced_opt"), pairing=pairing)
+    if model_name not in FORMULATIONS:
+        raise ValueError(f"Unknown formulation: {model_name}")
+
+    is_opt = model_name == "MIP_opt"
+    model = SparseModel(n, generate_round_robin(n, unordered=is_opt, pairing=pairing))
+    n, W, P, K = model.n, model.W, model.P, model.K
+    i_team, j_team, week = model.matches[:, 0], model.matches[:, 1], model.matches[:, 2]
+
+    x0 = model.add_cols(K * P, 0, 1)
+    kk = np.repeat(np.arange(K), P)          # match of every x column
+    pp = np.tile(np.arange(P), K)            # period of every x column
+    xcol = x0 + np.arange(K * P)
+
+    # OneMatchPerWeekPeriod {w, p}: sum_k x[k,p] = 1
+    model.add_rows("OneMatchPerWeekPeriod", W * P,
+                   (week[kk] - 1) * P + pp, xcol, 1.0, 1, 1)
+
+    mk, teams = _team_incidence(model)
+    # (team, x column) incidence: every match contributes P columns for both teams
+    tk = np.repeat(teams, P)
+    tcol = x0 + np.repeat(mk, P) * P + np.tile(np.arange(P), 2 * K)
+    tp = np.tile(np.arange(P), 2 * K)
+    tw = np.repeat(week[mk], P)
+
+    # OneMatchPerTeamWeek {t, w}
+    team_week_lo = 1 if is_opt else -np.inf
+    model.add_rows("OneMatchPerTeamWeek", n * W,
+                   (tk - 1) * W + (tw - 1), tcol, 1.0, team_week_lo, 1)
+
+    # PeriodLimit {t, p}: sum over matches of t in period p <= 2
+    model.add_rows("PeriodLimit", n * P,
+                   (tk - 1) * P + tp, tcol, 1.0, -np.inf, 2)
+
+    if model_name != "MIP_plain":
+        # FixFirstMatchToFirstPeriod: the week-1 match of team 1 is in period 1
+        first = np.flatnonzero((week == 1) & ((i_team == 1) | (j_team == 1)))
+        model.add_rows("FixFirstMatchToFirstPeriod", 1,
+                       np.zeros(len(first), dtype=np.int64), x0 + first * P, 1.0, 1, 1)
+
+    if model_name == "MIP_implied":
+        # NoThreeConsecutiveWeeksSamePeriod {t, p, w in 1..n-3}
+        windows = n - 3
+        rows, cols = [], []
+        for shift in range(3):
+            start = tw - shift                    # window w = ww - shift contains ww
+            ok = (start >= 1) & (start <= windows)
+            rows.append(((tk[ok] - 1) * P + tp[ok]) * windows + (start[ok] - 1))
+            cols.append(tcol[ok])
+        model.add_rows("NoThreeConsecutiveWeeksSamePeriod", n * P * windows,
+                       np.concatenate(rows), np.concatenate(cols), 1.0, -np.inf, 2)
+
+    if is_opt:
+        _add_fairness(model, xcol, kk)
+
+    return model.finalize()
+
+
+def _add_fairness(model, xcol, kk):
+    n, W, P, K = model.n, model.W, model.P, model.K
+    i_team, j_team = model.matches[:, 0], model.matches[:, 1]
+
+    y0 = model.add_cols(K * P, 0, 1)
+    h0 = model.add_cols(n, 0, np.inf)
+    a0 = model.add_cols(n, 0, np.inf)
+    d0 = model.add_cols(n, 0, np.inf)
+    # F >= parity lower bound (common/bounds.py)
+    f0 = model.add_cols(1, fairness_lb(n), np.inf)
+    ycol = y0 + np.arange(K * P)
+    teams = np.arange(n)
+
+    # OrientationLink: y - x <= 0
+    r = np.arange(K * P)
+    model.add_rows("OrientationLink", K * P,
+                   np.concatenate([r, r]), np.concatenate([ycol, xcol]),
+                   np.concatenate([np.ones(K * P), -np.ones(K * P)]), -np.inf, 0)
+
+    ii = i_team[kk] - 1      # first team of every x/y column
+    jj = j_team[kk] - 1      # second team of every x/y column
+
+    # HomeCount: h[t] - sum_{i=t} y - sum_{j=t} (x - y) = 0
+    model.add_rows("HomeCount", n,
+                   np.concatenate([teams, ii, jj, jj]),
+                   np.concatenate([h0 + teams, ycol, xcol, ycol]),
+                   np.concatenate([np.ones(n), -np.ones(K * P), -np.ones(K * P), np.ones(K * P)]),
+                   0, 0)
+
+    # AwayCount: a[t] - sum_{i=t} (x - y) - sum_{j=t} y = 0
+    model.add_rows("AwayCount", n,
+                   np.concatenate([teams, ii, ii, jj]),
+                   np.concatenate([a0 + teams, xcol, ycol, ycol]),
+                   np.concatenate([np.ones(n), -np.ones(K * P), np.ones(K * P), -np.ones(K * P)]),
+                   0, 0)
+
+    # DiffPos: d - h + a >= 0 ; DiffNeg: d - a + h >= 0
+    rows3 = np.concatenate([teams, teams, teams])
+    model.add_rows("DiffPos", n, rows3,
+                   np.concatenate([d0 + teams, h0 + teams, a0 + teams]),
+                   np.concatenate([np.ones(n), -np.ones(n), np.ones(n)]), 0, np.inf)
+    model.add_rows("DiffNeg", n, rows3,
+                   np.concatenate([d0 + teams, a0 + teams, h0 + teams]),
+                   np.concatenate([np.ones(n), -np.ones(n), np.ones(n)]), 0, np.inf)
+
+    # MaxDiff: F - d >= 0
+    model.add_rows("MaxDiff", n, np.concatenate([teams, teams]),
+                   np.concatenate([np.full(n, f0), d0 + teams]),
+                   np.concatenate([np.ones(n), -np.ones(n)]), 0, np.inf)
+
+    model.objective[f0] = 1.0
+    model.y0 = y0
+
+
+def build_reduced(n, opt=False, count_lb=True, no_three=False, sym=True, pairing=None):
+    model = SparseModel(n, generate_round_robin(n, pairing=pairing))
+    n, W, P, K = model.n, model.W, model.P, model.K
+    i_team, j_team, week = model.matches[:, 0], model.matches[:, 1], model.matches[:, 2]
+
+    x0 = model.add_cols(K * P, 0, 1)
+    xcol = x0 + np.arange(K * P)
+    kk = np.repeat(np.arange(K), P)
+    pp = np.tile(np.arange(P), K)
+
+    # MatchAssigned {k}: every match gets exactly one period
+    model.add_rows("MatchAssigned", K, kk, xcol, 1.0, 1, 1)
+
+    # PeriodFilled {w, p}: every period of every week hosts one match
+    model.add_rows("PeriodFilled", W * P, (week[kk] - 1) * P + pp, xcol, 1.0, 1, 1)
+
+    # match index: team t plays match team_match[t-1, w-1] in week w
+    team_match = np.empty((n, W), dtype=np.int64)
+    team_match[i_team - 1, week - 1] = np.arange(K)
+    team_match[j_team - 1, week - 1] = np.arange(K)
+
+    # TeamPeriodCount {t, p}: 1 <= sum_w x[match(t,w), p] <= 2
+    # (>= 1: each team has W = 2P-1 games and at most 2 per period)
+    tt = np.repeat(np.arange(n), W * P)
+    tw = np.tile(np.repeat(np.arange(W), P), n)
+    tp = np.tile(np.arange(P), n * W)
+    tcol = x0 + team_match[tt, tw] * P + tp
+    model.add_rows("TeamPeriodCount", n * P, tt * P + tp, tcol, 1.0, 1 if count_lb else -np.inf, 2)
+
+    if no_three:
+        windows = n - 3
+        rows, cols = [], []
+        for shift in range(3):
+            start = tw - shift
+            ok = (start >= 0) & (start < windows)
+            rows.append((tt[ok] * P + tp[ok]) * windows + start[ok])
+            cols.append(tcol[ok])
+        model.add_rows("NoThreeConsecutiveWeeksSamePeriod", n * P * windows,
+                       np.concatenate(rows), np.concatenate(cols), 1.0, -np.inf, 2)
+
+    if sym:
+        # periods are interchangeable: match m of week 1 is in period m
+        first = np.flatnonzero(week == 1)
+        m = np.arange(len(first))
+        model.fix_cols(x0 + np.repeat(first, P) * P + np.tile(np.arange(P), len(first)), 0)
+        model.fix_cols(x0 + first * P + m, 1)
+
+    if opt:
+        # y[k] = 1 <=> i_k plays at home; h_t = sum_{i=t} y + sum_{j=t} (1 - y)
+        y0 = model.add_cols(K, 0, 1)
+        f0 = model.add_cols(1, fairness_lb(n), np.inf)
+        ycol = y0 + np.arange(K)
+        away_games = np.bincount(j_team - 1, minlength=n)
+
+        # 2 h_t - W <= F  and  W - 2 h_t <= F
+        rows = np.concatenate([i_team - 1, j_team - 1, np.arange(n)])
+        cols = np.concatenate([ycol, ycol, np.full(n, f0)])
+        pos = np.concatenate([np.full(K, 2.0), np.full(K, -2.0), -np.ones(n)])
+        neg = np.concatenate([np.full(K, -2.0), np.full(K, 2.0), -np.ones(n)])
+        model.add_rows("HomeExcess", n, rows, cols, pos, -np.inf, W - 2 * away_games)
+        model.add_rows("AwayExcess", n, rows, cols, neg, -np.inf, 2 * away_games - W)
+
+        model.objective[f0] = 1.0
+        model.y0 = y0
+        model.y_per_period = False
+
+    return model.finalize()
+
+
+def extract_schedule(model, values):
+    """
+    Checker-format schedule from a column vector; only the nonzero x
+    entries are visited.
+    """
+    K, P, W = model.K, model.P, model.W
+    x = np.asarray(values[:K * P]).reshape(K, P)
+    ks, ps = np.nonzero(x > 0.5)
+
+    sched = Schedule(P, W)
+    for k, p in zip(ks.tolist(), ps.tolist()):
+        i, j, w = model.matches[k].tolist()
+        if model.y0 is not None:
+            y = model.y0 + (k * P + p if model.y_per_period else k)
+            if values[y] < 0.5:
+                # y = 1 means i plays at home (see HomeCount)
+                i, j = j, i
+        sched[p, w - 1] = (i, j)
+
+    return sched.tolist() if sched.is_complete() else []
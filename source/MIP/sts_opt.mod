@@ -32,6 +32,9 @@ var a{TEAMS} >= 0 integer;
 
 var d{TEAMS} >= 0 integer;
 
+# proven lower bound on F (parity, common/bounds.py), set by run.py
+param F_LB default 0;
+
 var F >= 0 integer;
 
 s.t. OneMatchPerWeekPeriod {w in WEEKS, p in PERIODS}:
@@ -71,4 +74,7 @@ s.t. DiffNeg {t in TEAMS}:
 s.t. MaxDiff {t in TEAMS}:
     F >= d[t];
 
+s.t. FairnessLowerBound:
+    F >= F_LB;
+
 minimize FairnessObjective: F;
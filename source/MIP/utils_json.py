@@ -1,14 +1,16 @@
-import json
 import math
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.store import update_result_file
+
 def write_result_json(path, approach_name=None, runtime=None, optimal=None, obj=None, sol_matrix=None, full_data=None):
    
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-
     if full_data is not None:
-        with open(path, "w") as f:
-            json.dump(full_data, f, indent=2)
+        # the given entries become the whole file
+        update_result_file(path, full_data, replace=True)
         print(f"JSON written to: {path}")
         return
     data = {
@@ -19,7 +21,15 @@ def write_result_json(path, approach_name=None, runtime=None, optimal=None, obj=
             "sol": sol_matrix
         }
     }
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    update_result_file(path, data)
 
     print(f"JSON written to: {path}")
+
+
+def merge_result_json(path, entries):
+    """
+    Update only the given approach entries of an existing result file.
+    """
+    update_result_file(path, entries)
+
+    print(f"JSON written to: {path}")
@@ -4,14 +4,29 @@ Run SAT approach (Glucose) for STS.
 """
 
 import argparse
-import subprocess
-import json
+import sys
+import threading
 import time
 from pathlib import Path
 
 import sat_dimacs
 import sat_decode
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.hints import load_hint, hint_assignment, relabel_periods
+from common.rolling import solve_rolling, periods_to_solution
+from common.enumeration import enumerate_to_jsonl
+from common.store import update_result_file
+from common.pairings import load_pairing, pairing_suffix
+from common.ir import build
+from common.ir_compile import to_cnf
+from common.symmetry import lex_leader
+from common.procs import run_command
+from common.racing import (
+    config_label, load_profile, profile_path, record, save_profile, successive_halving, tuned_config,
+)
+
 GLUCOSE = "glucose"
 TIMEOUT = 300
 
@@ -23,59 +38,158 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 DIMACS_DIR = OUTPUT_DIR / "dimacs"
 DIMACS_DIR.mkdir(parents=True, exist_ok=True)
 
+ENUM_DIR = OUTPUT_DIR / "enum"
 
-def load_json(path: Path):
-    if not path.exists():
-        return {}
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except:
-        return {}
-
-
-def safe_update_json(json_path: Path, entry: dict):
-    data = load_json(json_path)
-    data.update(entry)
-    json_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+PROFILE_PATH = profile_path(OUTPUT_DIR)
 
 
 def timeout_result():
     return {"time": 300, "optimal": False, "obj": None, "sol": []}
 
 
-def run_glucose(cnf_path: Path):
+def run_glucose(cnf_path: Path, timeout: float = TIMEOUT):
     """
-    Run Glucose on given CNF file.
-    Return (status, output):
+    Run Glucose on given CNF file, wall and CPU time limited to timeout
+    (common/procs.py, the whole process group is killed).
+    Return (status, output, proc):
       status in {"sat","unsat","unknown","timeout"}
+      proc   the ProcResult (wall / user / sys seconds)
+    """
+    proc = run_command([GLUCOSE, "-model", str(cnf_path)], wall_limit=timeout, cpu_limit=timeout)
+    if proc.timed_out:
+        return "timeout", "", proc
+    out = proc.stdout + proc.stderr
+    if "s SATISFIABLE" in out:
+        return "sat", out, proc
+    if "s UNSATISFIABLE" in out:
+        return "unsat", out, proc
+    return "unknown", out, proc
+
+
+def hint_phases(hint, n: int, use_sym: bool, anchor_week: int = 0):
+    """
+    Preferred polarity of every X_w_m_p literal from a hint schedule
+    (None if the hint does not fit the pairing). With --sym the hint's
+    periods are renamed so the anchor week matches the frozen week.
     """
     try:
-        r = subprocess.run(
-            [GLUCOSE, "-model", str(cnf_path)],
-            text=True,
-            capture_output=True,
-            timeout=TIMEOUT
-        )
-        out = r.stdout + r.stderr
-        if "s SATISFIABLE" in out:
-            return "sat", out
-        if "s UNSATISFIABLE" in out:
-            return "unsat", out
-        return "unknown", out
-    except subprocess.TimeoutExpired:
-        return "timeout", ""
-
-
-def generate_dimacs(n: int, use_sym: bool):
+        per, _ = hint_assignment(hint, sat_dimacs.get_pairings())
+    except ValueError as e:
+        print(f"Hint ignored: {e}")
+        return None
+    if use_sym:
+        per = relabel_periods(per, week=anchor_week % (n - 1))
+
+    phases = []
+    for w, row in enumerate(per):
+        for m, pm in enumerate(row):
+            for p in range(n // 2):
+                v = sat_dimacs.var_index[f"X_{w}_{m}_{p}"]
+                phases.append(v if pm == p else -v)
+    return phases
+
+
+def run_pysat(phases):
+    """
+    Solve the in-memory CNF with pysat's Glucose 4 after setting the
+    literal phases (the glucose binary has no way to take them).
+    Return (status, assignments) with assignments {var_id: True/False}.
+    """
+    from pysat.solvers import Glucose4
+
+    with Glucose4(bootstrap_with=sat_dimacs.clauses) as solver:
+        solver.set_phases(phases)
+        timer = threading.Timer(TIMEOUT, solver.interrupt)
+        timer.start()
+        try:
+            res = solver.solve_limited(expect_interrupt=True)
+        finally:
+            timer.cancel()
+
+        if res is True:
+            return "sat", {abs(lit): lit > 0 for lit in solver.get_model()}
+        if res is False:
+            return "unsat", {}
+        return "timeout", {}
+
+
+def run_rolling(n: int, k: int):
+    """
+    Rolling-horizon solve in blocks of k weeks (common/rolling.py), each
+    block a small CNF for pysat's Glucose 4. Returns a result entry.
+    """
+    start = time.time()
+    weeks = load_pairing(n, args.pairing).weeks()
+    status, per, stats = solve_rolling(n, weeks, k, backend="sat", time_limit=TIMEOUT)
+    elapsed = time.time() - start
+    print(f"[rolling k={k}] n={n} {status.upper()} time={elapsed:.3f}s {stats}")
+
+    if status == "timeout":
+        return timeout_result()
+    return {
+        "time": int(min(elapsed, TIMEOUT)),
+        "optimal": True,
+        "obj": None,
+        "sol": periods_to_solution(weeks, per) if status == "sat" else []
+    }
+
+
+def run_enumerate(n: int, k: int):
+    """
+    Up to k schedules, distinct modulo period relabelling (anchor week
+    frozen), from one incremental pysat Glucose 4 instance with a blocking
+    clause per solution. Streamed to res/SAT/enum/{n}.jsonl.
+    """
+    from pysat.solvers import Glucose4
+
+    sat_dimacs.build_dimacs(n, use_sym=True, anchor_week=args.anchor_week, pairing=load_pairing(n, args.pairing))
+    weeks = sat_dimacs.get_pairings()
+    W, P = n - 1, n // 2
+    X = [[[sat_dimacs.var_index[f"X_{w}_{m}_{p}"] for p in range(P)] for m in range(P)] for w in range(W)]
+
+    with Glucose4(bootstrap_with=sat_dimacs.clauses) as solver:
+        def next_solution(time_left):
+            timer = threading.Timer(time_left, solver.interrupt)
+            timer.start()
+            try:
+                res = solver.solve_limited(expect_interrupt=True)
+            finally:
+                timer.cancel()
+                solver.clear_interrupt()
+            if res is not True:
+                return None
+            true = {lit for lit in solver.get_model() if lit > 0}
+            return [[next(p for p in range(P) if X[w][m][p] in true) for m in range(P)] for w in range(W)]
+
+        def block(per):
+            solver.add_clause([-X[w][m][p] for w, row in enumerate(per) for m, p in enumerate(row)])
+
+        path = ENUM_DIR / f"{n}{pairing_suffix(args.pairing)}.jsonl"
+        count, exhausted = enumerate_to_jsonl(weeks, next_solution, block, k, path, TIMEOUT)
+
+    print(f"[enumerate] n={n} {count} schedules{' (all of them)' if exhausted else ''} -> {path}")
+
+
+def generate_dimacs(n: int, use_sym: bool, anchor_week: int = 0, lex: bool = False, pin_team1: int = 0):
     """
     Generate CNF in-process so we can keep the reverse map for decoding.
     Writes: res/SAT/dimacs/{n}.cnf
     Returns (cnf_path, reverse_map, pairings)
     """
-    sat_dimacs.build_dimacs(n, use_sym=use_sym, anchor_week=args.anchor_week)
+    pairing = load_pairing(n, args.pairing)
+    cnf_path = DIMACS_DIR / f"{n}.cnf"
+    if args.ir:
+        # shared model (common/ir.py), same variable numbering as build_dimacs
+        model = build(n, pairing=pairing, sym=use_sym, anchor_week=anchor_week, pin_team1=pin_team1,
+                      implied=args.implied)
+        if lex:
+            lex_leader(model, length=args.lex_length)
+        to_cnf(model, amo=args.amo, amk=args.amk).write_dimacs(cnf_path)
+        return cnf_path, model.var_names(), pairing.weeks()
+
+    sat_dimacs.build_dimacs(n, use_sym=use_sym, anchor_week=anchor_week, pairing=pairing)
     #print(f"n={n} vars={sat_dimacs.next_var-1} clauses={len(sat_dimacs.clauses)} sym={args.sym}")
 
-    cnf_path = DIMACS_DIR / f"{n}.cnf"
     sat_dimacs.write_dimacs(str(cnf_path))
 
     reverse_map = sat_dimacs.get_reverse_map()
@@ -83,34 +197,173 @@ def generate_dimacs(n: int, use_sym: bool):
     return cnf_path, reverse_map, pairings
 
 
+def tune_grid(n: int):
+    """
+    Configurations raced by --autotune: no SB, or the frozen week at four
+    positions; with --ir also lex-leader constraints or team-1 pins (not
+    both, and no pin on a frozen week that puts team 1 elsewhere).
+    """
+    W = n - 1
+    base = [{"sym": False, "anchor_week": 0}]
+    base += [{"sym": True, "anchor_week": aw} for aw in sorted({0, 1, W // 2, W - 1})]
+    if not args.ir:
+        return base
+    match_of = load_pairing(n, args.pairing).match_of
+    grid = []
+    for cfg in base:
+        grid.append({**cfg, "lex": False, "pin": 0})
+        grid.append({**cfg, "lex": True, "pin": 0})
+        for pin in (1, 2):
+            if not (cfg["sym"] and cfg["anchor_week"] < pin and match_of[cfg["anchor_week"], 1] != 0):
+                grid.append({**cfg, "lex": False, "pin": pin})
+    return grid
+
+
+def race_config(n: int, cfg: dict, budget: float):
+    """
+    CNF generation + Glucose for cfg within budget seconds: (solved, wall).
+    """
+    start = time.time()
+    cnf_path, _, _ = generate_dimacs(n, cfg["sym"], cfg["anchor_week"], cfg.get("lex", False), cfg.get("pin", 0))
+    status, _, _ = run_glucose(cnf_path, timeout=max(budget - (time.time() - start), 0.1))
+    return status == "sat", time.time() - start
+
+
+def autotune(n_values, tune_key: str):
+    """
+    Successive halving over tune_grid() for every n; the winner is saved
+    to res/SAT/tuning/config_profile.json.
+    """
+    profile = load_profile(PROFILE_PATH)
+    for n in n_values:
+        grid = tune_grid(n)
+        print(f"\n=== SAT autotune {tune_key} n={n}: {len(grid)} configs from {args.tune_budget:g}s ===")
+        best, wall, final = successive_halving(grid, lambda cfg, b: race_config(n, cfg, b),
+                                               args.tune_budget, max_budget=args.tune_max_budget)
+        if best is None:
+            print(f"[{tune_key}] n={n} no configuration finished within {final:g}s, profile unchanged")
+            continue
+        record(profile, tune_key, n, best, wall, final, len(grid))
+        save_profile(PROFILE_PATH, profile)
+        print(f"[{tune_key}] n={n} best={config_label(best)} wall={wall:.3f}s")
+    print(f"Wrote config profile to {PROFILE_PATH}")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-n", type=int, default=0)
-    parser.add_argument("--sym", action="store_true", help="enable symmetry breaking")
-    parser.add_argument("--anchor_week", type=int, default=0)
+    # None when not given: runs then take sym / anchor week (and lex / pins with --ir) from the tuned profile
+    parser.add_argument("--sym", action="store_true", default=None, help="enable symmetry breaking")
+    parser.add_argument("--anchor_week", type=int, default=None, help="week frozen by --sym (default 0)")
+    parser.add_argument("--hint", type=str, default="",
+                        help="solve with pysat and phases from a schedule: 'auto' (res/*/n.json), 'construct' or path.json[:key]")
+    parser.add_argument("--rolling", type=int, default=0,
+                        help="solve weeks in blocks of K with pysat (rolling horizon, week 0 frozen)")
+    parser.add_argument("--enumerate", type=int, default=0,
+                        help="stream up to K distinct schedules (modulo period relabelling) to res/SAT/enum/n.jsonl")
+    parser.add_argument("--pairing", type=str, default="circle",
+                        help="week pairings: circle, berger, greedy, an integer seed or file.json (common/pairings.py)")
+    parser.add_argument("--ir", action="store_true",
+                        help="compile the CNF from the shared model (common/ir.py); keys get an _ir suffix")
+    parser.add_argument("--implied", type=str, default="lower",
+                        help="with --ir: comma-separated implied constraints (lower,window; '-' for none)")
+    parser.add_argument("--amo", type=str, default="pairwise", choices=["pairwise", "seq"],
+                        help="with --ir: at-most-one encoding")
+    parser.add_argument("--amk", type=str, default="subsets", choices=["subsets", "seq"],
+                        help="with --ir: at-most-2 encoding")
+    parser.add_argument("--lex", action="store_true", default=None,
+                        help="with --ir: lex-leader constraints for the pairing's team symmetries (common/symmetry.py)")
+    parser.add_argument("--pin-team1", type=int, default=None,
+                        help="with --ir: pin team 1 to period 0 for the first k weeks")
+    parser.add_argument("--lex_length", type=int, default=None,
+                        help="with --lex: keep only the first positions of each lex vector")
+    parser.add_argument("--autotune", action="store_true",
+                        help="race SB / anchor week (and lex / pins with --ir) by successive halving, save the winner per n")
+    parser.add_argument("--tune-budget", type=float, default=5,
+                        help="first-round time limit in seconds for --autotune (doubled every round)")
+    parser.add_argument("--tune-max-budget", type=float, default=None,
+                        help="last-round time limit for --autotune (default 8x --tune-budget)")
+    parser.add_argument("--no-profile", action="store_true", help="ignore res/SAT/tuning/config_profile.json")
     args = parser.parse_args()
+    args.implied = tuple(s for s in args.implied.split(",") if s and s != "-")
+    if args.ir and args.hint:
+        parser.error("--ir is not available with --hint")
+    if (args.lex or args.pin_team1) and not args.ir:
+        parser.error("--lex and --pin-team1 require --ir")
+    if args.lex and args.pin_team1:
+        parser.error("--lex is not compatible with --pin-team1")
+
+    explicit = any(v is not None for v in (args.sym, args.anchor_week, args.lex, args.pin_team1))
+    args.sym = bool(args.sym)
+    args.anchor_week = args.anchor_week or 0
+    args.lex = bool(args.lex)
+    args.pin_team1 = args.pin_team1 or 0
 
     if args.n == 0:
         N_VALUES = [6, 8, 10, 12, 14, 16, 18, 20, 22, 24]
     else:
         N_VALUES = [args.n]
 
+    # profile key: the encoding without the raced options
+    tune_key = "glucose" + pairing_suffix(args.pairing)
+    if args.ir:
+        tune_key += "_ir"
+        if args.implied != ("lower",):
+            tune_key += "_" + ("-".join(args.implied) or "noimplied")
+        tune_key += "_amoseq" if args.amo == "seq" else ""
+        tune_key += "_amkseq" if args.amk == "seq" else ""
+
+    if args.autotune:
+        autotune(N_VALUES, tune_key)
+        sys.exit(0)
+
+    profile = {} if explicit or args.no_profile else load_profile(PROFILE_PATH)
+
     for n in N_VALUES:
         print(f"\n====== Running n = {n} ======")
         json_path = OUTPUT_DIR / f"{n}.json"
 
-        approach = "glucose_sb" if args.sym else "glucose"
+        if args.enumerate > 0:
+            run_enumerate(n, args.enumerate)
+            continue
+
+        if args.rolling > 0:
+            key = f"glucose_sb_roll{args.rolling}{pairing_suffix(args.pairing)}"
+            update_result_file(json_path, {key: run_rolling(n, args.rolling)})
+            continue
+
+        cfg = {"sym": args.sym, "anchor_week": args.anchor_week, "lex": args.lex, "pin": args.pin_team1}
+        tuned = tuned_config(profile, tune_key, n)
+        if tuned:
+            cfg.update(tuned)
+            print(f"Tuned configuration from {PROFILE_PATH.name}: {config_label(tuned)}")
+            # runs configured by the profile are stored next to the hand-picked ones
+            approach = tune_key + "_tuned"
+        else:
+            # encodings other than build_dimacs' are stored side by side (_ir...)
+            approach = tune_key.replace("glucose", "glucose_sb", 1) if args.sym else tune_key
+            if args.lex:
+                approach += "_lex" if args.lex_length is None else f"_lex{args.lex_length}"
+            if args.pin_team1:
+                approach += f"_pin{args.pin_team1}"
+        hint = load_hint(n, args.hint, prefer="SAT") if args.hint else None
 
         start_all = time.time()
 
         try:
-            cnf_path, reverse_map, pairings = generate_dimacs(n, use_sym=args.sym)
+            cnf_path, reverse_map, pairings = generate_dimacs(n, cfg["sym"], cfg["anchor_week"], cfg["lex"], cfg["pin"])
         except Exception as e:
             print(f"[{approach}] CNF generation failed: {e}")
-            safe_update_json(json_path, {approach: timeout_result()})
+            update_result_file(json_path, {approach: timeout_result()})
             continue
 
-        status, output = run_glucose(cnf_path)
+        phases = hint_phases(hint, n, cfg["sym"], cfg["anchor_week"]) if hint else None
+        if phases:
+            approach += "_ws"
+            status, assignments = run_pysat(phases)
+        else:
+            status, output, proc = run_glucose(cnf_path)
+            print(f"[{approach}] glucose {proc.status} wall={proc.wall:.3f}s user={proc.user:.3f}s sys={proc.sys:.3f}s")
 
         # includes DIMACS gen + solver time
         elapsed = time.time() - start_all
@@ -118,15 +371,16 @@ if __name__ == "__main__":
         if status == "sat":
             print(f"[{approach}] n={n} SAT time={elapsed:.3f}s, decoding...")
 
-            assignments = sat_decode.parse_glucose_solution(output)
+            if not phases:
+                assignments = sat_decode.parse_glucose_solution(output)
             sol = sat_decode.decode_schedule(assignments, reverse_map, pairings, n)
 
             if sol is None:
                 print(f"[{approach}] decoding failed -> marking as timeout")
-                safe_update_json(json_path, {approach: timeout_result()})
+                update_result_file(json_path, {approach: timeout_result()})
                 continue
 
-            safe_update_json(json_path, {
+            update_result_file(json_path, {
                 approach: {
                     "time": int(min(elapsed, TIMEOUT)),
                     "optimal": True,
@@ -137,7 +391,7 @@ if __name__ == "__main__":
 
         elif status == "unsat":
             print(f"[{approach}] n={n} UNSAT time={elapsed:.3f}s")
-            safe_update_json(json_path, {
+            update_result_file(json_path, {
                 approach: {
                     "time": int(min(elapsed, TIMEOUT)),
                     "optimal": True,
@@ -148,6 +402,6 @@ if __name__ == "__main__":
 
         else:
             print(f"[{approach}] n={n} TIMEOUT/UNKNOWN -> marking time=300")
-            safe_update_json(json_path, {approach: timeout_result()})
+            update_result_file(json_path, {approach: timeout_result()})
 
     print("\nDone.\n")
@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
 import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.schedule import Schedule
 
 def parse_glucose_solution(output: str):
     """
@@ -33,9 +39,8 @@ def decode_schedule(assignments, reverse_var, pairings, n: int):
     weeks = n - 1
     matches_per_week = n // 2
 
-    sol = [[None for _ in range(weeks)] for _ in range(periods)]
+    sched = Schedule(periods, weeks)
 
-    import re
     pat = re.compile(r"^X_(\d+)_(\d+)_(\d+)$")
 
     for vid, val in assignments.items():
@@ -61,12 +66,10 @@ def decode_schedule(assignments, reverse_var, pairings, n: int):
         a, b = pairings[w][mi]
 
         # fixed orientation: a is home, b is away
-        sol[p][w] = [a, b]
+        sched[p, w] = (a, b)
 
     # sanity check- all slots must be filled
-    for p in range(periods):
-        for w in range(weeks):
-            if sol[p][w] is None:
-                return None
+    if not sched.is_complete():
+        return None
 
-    return sol
+    return sched.tolist()
@@ -19,7 +19,13 @@ SAT constraints enforce:
 
 """
 
+import sys
 from itertools import combinations
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.tournament import tournament
 
 # Global CNF state
 
@@ -128,33 +134,15 @@ def at_most_2(lits):
 
 # Round-robin pairings(circle method)
 def circle_method_pairings(n: int):
-
-    if n % 2 != 0:
-        raise ValueError("n must be even")
-
-    teams = list(range(1, n + 1))
-    fixed = teams[-1]
-    rot = teams[:-1]
-
-    W = n - 1
-    half = n // 2
-    out = []
-
-    for _w in range(W):
-        left = rot[:half - 1] + [fixed]
-        right = rot[half - 1:][::-1]
-        out.append(list(zip(left, right)))
-
-        # rotate
-        rot = [rot[-1]] + rot[:-1]
-
-    return out
+    # shared, cached precomputation (common/tournament.py)
+    return tournament(n).weeks()
 
 # DIMACS builder
 
-def build_dimacs(n: int, use_sym: bool = False, anchor_week: int = 0):
+def build_dimacs(n: int, use_sym: bool = False, anchor_week: int = 0, pairing=None):
     """
     Build the DIMACS CNF using X_w_m_p variables.
+    pairing: a common.tournament.Tournament (default: the circle method).
     """
     global clauses, var_index, reverse_var, next_var, weeks
     clauses = []
@@ -165,7 +153,10 @@ def build_dimacs(n: int, use_sym: bool = False, anchor_week: int = 0):
     if n % 2 != 0:
         raise ValueError("n must be even")
 
-    weeks = circle_method_pairings(n)
+    if pairing is None:
+        pairing = tournament(n)
+    weeks = pairing.weeks()
+    match_of = pairing.match_of.tolist()
 
     W = n - 1
     P = n // 2
@@ -190,22 +181,10 @@ def build_dimacs(n: int, use_sym: bool = False, anchor_week: int = 0):
             exactly_one([X(w, m, p) for m in range(M)])
 
     # 3) Each team appears in the same period at most twice overall
-    # For each team t and period p, collect the unique match index m(t,w) in each week w
+    # For each team t and period p, the match index m(t,w) of each week w is match_of[w][t]
     for t in range(1, n + 1):
         for p in range(P):
-            lits = []
-            for w in range(W):
-                # find match index in week w that includes team t
-                mtw = None
-                for m, (a, b) in enumerate(weeks[w]):
-                    if a == t or b == t:
-                        mtw = m
-                        break
-            
-                if mtw is None:
-                    raise RuntimeError("circle method failed unexpectedly")
-
-                lits.append(X(w, mtw, p))
+            lits = [X(w, match_of[w][t], p) for w in range(W)]
 
             # Implied constraint    
             add_clause(lits[:])
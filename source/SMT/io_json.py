@@ -1,5 +1,4 @@
-import json
-from pathlib import Path
+from common.store import update_result_file
 
 def write_result_json(approach_name, json_path, solve_time, status, solution_matrix, obj=None):
     """
@@ -24,18 +23,6 @@ def write_result_json(approach_name, json_path, solve_time, status, solution_mat
         sol     = []
     """
 
-    json_path = Path(json_path)
-    json_path.parent.mkdir(parents=True, exist_ok=True)
-
-    if json_path.exists():
-        try:
-            with open(json_path, "r") as f:
-                data = json.load(f)
-        except Exception:
-            data = {}
-    else:
-        data = {}
-
     if status == "sat":
         entry = {
             "time": int(min(solve_time, 300)),
@@ -58,7 +45,4 @@ def write_result_json(approach_name, json_path, solve_time, status, solution_mat
             "sol": []
         }
 
-    data[approach_name] = entry
-
-    with open(json_path, "w") as f:
-        json.dump(data, f, indent=2)
+    update_result_file(json_path, {approach_name: entry})
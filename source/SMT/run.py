@@ -2,9 +2,9 @@
 import sys
 import time
 import argparse
-import subprocess
+import shutil
 from pathlib import Path
-from z3 import sat, unsat
+from z3 import sat, unsat, Not, Or
 
 SMT_DIR = Path(__file__).resolve().parent
 SRC_DIR = SMT_DIR.parent
@@ -16,16 +16,29 @@ from io_json import write_result_json
 from smt_period_core_bool import build_model
 from smt2_export import write_smt2_file, per_var, home_var
 from smt2_parse import parse_status, parse_get_value
+from common.bounds import fairness_lb
+from common.hints import load_hint
+from common.orientation import orient_solution, max_deviation
+from common.rolling import solve_rolling, periods_to_solution
+from common.enumeration import enumerate_to_jsonl
+from common.schedule import Schedule
+from common.pairings import load_pairing, pairing_suffix
+from common.procs import run_command
+from common.racing import (
+    config_label, load_profile, profile_path, record, save_profile, successive_halving, tuned_config,
+)
 
 TIME_LIMIT = 300
+PAIRING = "circle"
 ALL_N = [6, 8, 10, 12, 14, 16, 18, 20, 22, 24]
+PROFILE_PATH = profile_path(ROOT / "res" / "SMT")
 
 
 def extract_schedule_z3(model, weeks, X, home, n):
     P = n // 2
     W = n - 1
     M = n // 2
-    sol = [[None for _ in range(W)] for _ in range(P)]
+    sched = Schedule(P, W)
 
     for w in range(W):
         for m in range(M):
@@ -38,20 +51,16 @@ def extract_schedule_z3(model, weeks, X, home, n):
                 continue
             a, b = weeks[w][m]
             if home is None:
-                sol[chosen_p][w] = [a, b]
+                sched[chosen_p, w] = (a, b)
             else:
                 hv = bool(model.evaluate(home[w][m], model_completion=True))
-                sol[chosen_p][w] = [a, b] if hv else [b, a]
+                sched[chosen_p, w] = (a, b) if hv else (b, a)
 
-    for p in range(P):
-        for w in range(W):
-            if sol[p][w] is None:
-                return []
-    return sol
+    return sched.tolist() if sched.is_complete() else []
 
 
 def decode_schedule_env(env, weeks, W, P, with_home: bool):
-    sol = [[None for _ in range(W)] for _ in range(P)]
+    sched = Schedule(P, W)
 
     for w in range(W):
         for m in range(P):
@@ -62,19 +71,19 @@ def decode_schedule_env(env, weeks, W, P, with_home: bool):
                 return []
             a, b = weeks[w][m]
             if not with_home:
-                sol[int(pv)][w] = [a, b]
+                sched[int(pv), w] = (a, b)
             else:
                 hv = bool(env.get(home_var(w, m), True))
-                sol[int(pv)][w] = [a, b] if hv else [b, a]
+                sched[int(pv), w] = (a, b) if hv else (b, a)
 
-    for p in range(P):
-        for w in range(W):
-            if sol[p][w] is None:
-                return []
-    return sol
+    return sched.tolist() if sched.is_complete() else []
 
 
-def run_external(backend: str, smt2_path: Path, timeout_s: int):
+def run_external(backend: str, smt2_path: Path, timeout_s: float):
+    """
+    Run cvc5 / OpenSMT on the .smt2 file, wall and CPU time limited
+    (common/procs.py). Returns the ProcResult.
+    """
     if backend == "cvc5":
         cmd = ["cvc5", "--lang", "smt2", "--produce-models", str(smt2_path)]
     elif backend == "opensmt":
@@ -82,45 +91,39 @@ def run_external(backend: str, smt2_path: Path, timeout_s: int):
     else:
         raise ValueError(f"Unknown external backend: {backend}")
 
-    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_s)
-    return proc.stdout, proc.stderr
+    return run_command(cmd, wall_limit=timeout_s, cpu_limit=timeout_s)
 
 
-def run_one(n: int, sym: bool, pin_team1_weeks: int, max_diff=None, backend: str = "z3"):
+def run_one(n: int, sym: bool, pin_team1_weeks: int, max_diff=None, backend: str = "z3", hint=None,
+            anchor_week: int = 0, time_limit: float = TIME_LIMIT):
     t_start = time.time()
 
     if backend == "z3":
-        s, weeks, X, home, W, P, D_var = build_model(
+        s, weeks, X, home, W, P = build_model(
             n=n,
             use_sym=sym,
-            anchor_week=0,
-            with_home=True if (max_diff is not None) else False,
-            max_diff=None,                 # not used in optimize mode
-            optimize=(max_diff is not None),
-            timeout_ms=TIME_LIMIT * 1000,
+            anchor_week=anchor_week,
+            with_home=(max_diff is not None),
+            max_diff=max_diff,
+            timeout_ms=int(time_limit * 1000),
             pin_team1_weeks=pin_team1_weeks,
+            hint=hint,
+            pairing=load_pairing(n, PAIRING),
         )
 
         r = s.check()
 
         if r == sat:
-            model = s.model()
-            sol = extract_schedule_z3(model, weeks, X, home, n)
-            elapsed = min(time.time() - t_start, TIME_LIMIT)
-
-            if max_diff is not None:
-                # optimization case: return D*
-                Dstar = model.evaluate(D_var, model_completion=True).as_long()
-                return (elapsed, "sat", sol, Dstar) if sol else (TIME_LIMIT, "timeout", [], None)
-
-            return (elapsed, "sat", sol, None) if sol else (TIME_LIMIT, "timeout", [], None)
+            sol = extract_schedule_z3(s.model(), weeks, X, home, n)
+            elapsed = min(time.time() - t_start, time_limit)
+            return (elapsed, "sat", sol) if sol else (time_limit, "timeout", [])
 
         if r == unsat:
-            elapsed = min(time.time() - t_start, TIME_LIMIT)
-            return elapsed, "unsat", [], None
+            elapsed = min(time.time() - t_start, time_limit)
+            return elapsed, "unsat", []
 
-        elapsed = min(time.time() - t_start, TIME_LIMIT)
-        return elapsed, "timeout", [], None
+        elapsed = min(time.time() - t_start, time_limit)
+        return elapsed, "timeout", []
 
 
     tmp_dir = ROOT / "res" / "SMT" / "smt2"
@@ -129,6 +132,7 @@ def run_one(n: int, sym: bool, pin_team1_weeks: int, max_diff=None, backend: str
     label = (
         f"{backend}_{'opt' if max_diff is not None else 'dec'}"
         f"{'_sb' if sym else ''}"
+        f"{'_aw'+str(anchor_week) if sym and anchor_week else ''}"
         f"{'_pin'+str(pin_team1_weeks) if pin_team1_weeks>0 else ''}"
         f"{'_D'+str(max_diff) if max_diff is not None else ''}"
     )
@@ -145,12 +149,15 @@ def run_one(n: int, sym: bool, pin_team1_weeks: int, max_diff=None, backend: str
         add_implied_exact_counts=True,
         add_team1_pins=pin_team1_weeks,
         fix_home_sym=True,
+        pairing=load_pairing(n, PAIRING),
+        anchor_week=anchor_week,
     )
 
-    try:
-        stdout, stderr = run_external(backend, out_path, TIME_LIMIT)
-    except subprocess.TimeoutExpired:
-        return TIME_LIMIT, "timeout", []
+    proc = run_external(backend, out_path, time_limit)
+    if proc.timed_out:
+        # same shape as the z3 path: elapsed time, capped
+        return min(time.time() - t_start, time_limit), "timeout", []
+    stdout = proc.stdout
 
     st = parse_status(stdout)
 
@@ -158,15 +165,145 @@ def run_one(n: int, sym: bool, pin_team1_weeks: int, max_diff=None, backend: str
         env = parse_get_value(stdout)
         sol = decode_schedule_env(env, weeks, W, P, with_home=(max_diff is not None))
         elapsed = time.time() - t_start
-        elapsed = min(elapsed, TIME_LIMIT)
-        return (elapsed, "sat", sol) if sol else (TIME_LIMIT, "timeout", [])
+        elapsed = min(elapsed, time_limit)
+        return (elapsed, "sat", sol) if sol else (time_limit, "timeout", [])
 
     if st == "unsat":
         elapsed = time.time() - t_start
-        elapsed = min(elapsed, TIME_LIMIT)
+        elapsed = min(elapsed, time_limit)
         return elapsed, "unsat", []
 
-    return TIME_LIMIT, "timeout", []
+    return time_limit, "timeout", []
+
+def run_decomposed(n: int, sym: bool, pin_team1_weeks: int, backend: str = "z3", hint=None, anchor_week: int = 0):
+    """
+    Fairness by decomposition: decision solve, then optimal orientation.
+    W = n-1 is odd, so max_diff >= 1 and the orientation (max_diff = 1) is optimal.
+    Returns (time, status, sol, obj).
+    """
+    t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin_team1_weeks, max_diff=None, backend=backend, hint=hint,
+                         anchor_week=anchor_week)
+    if st != "sat":
+        return t, st, sol, None
+
+    t0 = time.time()
+    sol = orient_solution(sol)
+    obj = max_deviation(sol)
+    return min(t + time.time() - t0, TIME_LIMIT), "sat", sol, obj
+
+
+def run_rolling(n: int, k: int, decomposed: bool = False):
+    """
+    Rolling-horizon z3 solve in blocks of k weeks (common/rolling.py),
+    optionally followed by the optimal orientation.
+    Returns (time, status, sol, obj).
+    """
+    t_start = time.time()
+    weeks = load_pairing(n, PAIRING).weeks(sorted_pairs=True)
+    st, per, stats = solve_rolling(n, weeks, k, backend="z3", time_limit=TIME_LIMIT)
+    print(f"  rolling: {stats}")
+    if st != "sat":
+        return min(time.time() - t_start, TIME_LIMIT), st, [], None
+
+    sol = periods_to_solution(weeks, per)
+    obj = None
+    if decomposed:
+        sol = orient_solution(sol)
+        obj = max_deviation(sol)
+    return min(time.time() - t_start, TIME_LIMIT), "sat", sol, obj
+
+
+def run_enumerate(n: int, k: int, out_dir: Path):
+    """
+    Up to k schedules, distinct modulo period relabelling (week 0 frozen),
+    from one incremental z3 solver with a blocking clause per solution.
+    Streamed to res/SMT/enum/{n}.jsonl.
+    """
+    s, weeks, X, _, W, P = build_model(n=n, use_sym=True, timeout_ms=TIME_LIMIT * 1000,
+                                       pairing=load_pairing(n, PAIRING))
+
+    def next_solution(time_left):
+        s.set("timeout", max(int(time_left * 1000), 1))
+        if s.check() != sat:
+            return None
+        model = s.model()
+        return [[next(p for p in range(P) if model.evaluate(X[w][m][p], model_completion=True))
+                 for m in range(P)] for w in range(W)]
+
+    def block(per):
+        s.add(Or([Not(X[w][m][p]) for w, row in enumerate(per) for m, p in enumerate(row)]))
+
+    path = out_dir / "enum" / f"{n}{pairing_suffix(PAIRING)}.jsonl"
+    count, exhausted = enumerate_to_jsonl(weeks, next_solution, block, k, path, TIME_LIMIT)
+    print(f"[enumerate] n={n} {count} schedules{' (all of them)' if exhausted else ''} -> {path}")
+
+
+def tune_key(opt: bool) -> str:
+    # backend, SB, pins and anchor week are the raced configuration, not part of the key
+    return ("SMT_OPT" if opt else "SMT_DECISION") + pairing_suffix(PAIRING)
+
+
+def tune_grid(n: int, backends, pins):
+    """
+    Configurations raced by --autotune. A frozen week that is also a
+    pinned week must already have team 1 in period 0, other combinations
+    are unsatisfiable and left out.
+    """
+    W = n - 1
+    match_of = load_pairing(n, PAIRING).match_of
+    grid = []
+    for backend in backends:
+        for pin in pins:
+            grid.append({"backend": backend, "sym": False, "pin": pin, "anchor_week": 0})
+            for aw in sorted({0, 1, W // 2, W - 1}):
+                if aw < pin and match_of[aw, 1] != 0:
+                    continue
+                grid.append({"backend": backend, "sym": True, "pin": pin, "anchor_week": aw})
+    return grid
+
+
+def race_config(n: int, cfg: dict, budget: float, opt: bool, maxD: int):
+    """
+    One run of cfg within budget seconds, the max_diff sweep for opt.
+    Returns (solved, wall).
+    """
+    t_start = time.time()
+    for D in (range(fairness_lb(n), maxD + 1) if opt else [None]):
+        left = budget - (time.time() - t_start)
+        if left <= 0:
+            break
+        _, st, _ = run_one(n, sym=cfg["sym"], pin_team1_weeks=cfg["pin"], max_diff=D, backend=cfg["backend"],
+                           anchor_week=cfg["anchor_week"], time_limit=left)
+        if st == "sat":
+            return True, time.time() - t_start
+    return False, time.time() - t_start
+
+
+def autotune(n_values, backends, pins, opt: bool, maxD: int, budget: float, max_budget=None):
+    """
+    Successive halving over tune_grid() for every n; the winner is saved
+    to res/SMT/tuning/config_profile.json.
+    """
+    missing = [b for b in backends if b != "z3" and shutil.which(b) is None]
+    if missing:
+        print(f"Skipping backends not on PATH: {','.join(missing)}")
+    backends = [b for b in backends if b not in missing]
+
+    profile = load_profile(PROFILE_PATH)
+    key = tune_key(opt)
+    for n in n_values:
+        grid = tune_grid(n, backends, pins)
+        print(f"\n=== SMT autotune {key} n={n}: {len(grid)} configs from {budget:g}s ===")
+        best, wall, final = successive_halving(
+            grid, lambda cfg, b: race_config(n, cfg, b, opt, maxD), budget, max_budget=max_budget)
+        if best is None:
+            print(f"[{key}] n={n} no configuration finished within {final:g}s, profile unchanged")
+            continue
+        record(profile, key, n, best, wall, final, len(grid))
+        save_profile(PROFILE_PATH, profile)
+        print(f"[{key}] n={n} best={config_label(best)} wall={wall:.3f}s")
+    print(f"Wrote config profile to {PROFILE_PATH}")
+
 
 def build_approaches(selected_backends, selected_modes, selected_sb, selected_pins, maxD):
     approaches = []
@@ -177,7 +314,8 @@ def build_approaches(selected_backends, selected_modes, selected_sb, selected_pi
                     approaches.append(
                         {
                             "backend": backend,
-                            "opt": (mode == "opt"),
+                            "opt": (mode in ("opt", "decomposed")),
+                            "decomposed": (mode == "decomposed"),
                             "sym": bool(sb),
                             "pin": int(pin),
                             "maxD": int(maxD),
@@ -190,6 +328,13 @@ def key_for(cfg, D=None):
     backend = cfg["backend"].upper()
     pin = cfg["pin"]
     sym = cfg["sym"]
+    if cfg.get("decomposed", False):
+        k = f"SMT_{backend}_BOOL_OPT_DECOMP"
+        if sym:
+            k += "_SB"
+        if pin > 0:
+            k += f"_pin1w{pin}"
+        return k
     if cfg["opt"]:
         k = f"SMT_{backend}_BOOL_OPT"
         if sym:
@@ -208,6 +353,12 @@ def key_for(cfg, D=None):
         return k
 
 
+def tagged(key: str, hint) -> str:
+    # runs on other pairings and hinted runs are stored next to the plain ones
+    key += pairing_suffix(PAIRING)
+    return f"{key}_ws" if hint else key
+
+
 def parse_csv_ints(s: str):
     out = []
     for part in s.split(","):
@@ -222,32 +373,96 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("-n", type=int, default=0, help="n teams (0 => run all default sizes)")
 
-    parser.add_argument("--sym", action="store_true", help="enable symmetry breaking")
-    parser.add_argument("--pin-team1", type=int, default=0, help="pin team 1 match to period 0 for first k weeks")
-    parser.add_argument("--backend", type=str, default="z3", choices=["z3", "cvc5", "opensmt"], help="solver backend")
+    # None when not given: single runs then take sym / pins / backend / anchor week from the tuned profile
+    parser.add_argument("--sym", action="store_true", default=None, help="enable symmetry breaking")
+    parser.add_argument("--pin-team1", type=int, default=None, help="pin team 1 match to period 0 for first k weeks")
+    parser.add_argument("--backend", type=str, default=None, choices=["z3", "cvc5", "opensmt"], help="solver backend (default z3)")
+    parser.add_argument("--anchor_week", type=int, default=None, help="week frozen by --sym (default 0)")
 
     parser.add_argument("--opt", action="store_true", help="run fairness optimization by sweeping max_diff")
-    parser.add_argument("--maxD", type=int, default=6, help="maximum max_diff to try when --opt is enabled")
+    parser.add_argument("--maxD", type=int, default=6, help="maximum max_diff to try when --opt is enabled (the sweep starts at the parity bound)")
+    parser.add_argument("--decomposed", action="store_true",
+                        help="with --opt: solve the decision model, then orient home/away optimally")
 
     parser.add_argument("--all", action="store_true", help="run all combinations")
     parser.add_argument("--backends", type=str, default="", help="comma-separated backends: z3,cvc5,opensmt")
-    parser.add_argument("--modes", type=str, default="", help="comma-separated modes: decision,opt")
+    parser.add_argument("--modes", type=str, default="", help="comma-separated modes: decision,opt,decomposed")
     parser.add_argument("--sb", type=int, choices=[0, 1], default=None, help="restrict SB off/on")
     parser.add_argument("--pins", type=str, default="", help="comma-separated pin values, e.g. 0,1,2")
     parser.add_argument("--models", type=str, default="", help="comma-separated exact keys to run")
+    parser.add_argument("--hint", type=str, default="",
+                        help="z3 initial values from a schedule: 'auto' (res/*/n.json), 'construct' or path.json[:key]; keys get a _ws suffix")
+    parser.add_argument("--rolling", type=int, default=0,
+                        help="z3 only: solve weeks in blocks of K (rolling horizon); keys get a _ROLL<K> suffix")
+    parser.add_argument("--enumerate", type=int, default=0,
+                        help="z3 only: stream up to K distinct schedules (modulo period relabelling) to res/SMT/enum/n.jsonl")
+    parser.add_argument("--pairing", type=str, default="circle",
+                        help="week pairings: circle, berger, greedy, an integer seed or file.json (common/pairings.py); "
+                             "keys get a _pair<spec> suffix")
+
+    parser.add_argument("--autotune", action="store_true",
+                        help="race backends x SB x pins x anchor week by successive halving and save the winner per n "
+                             "(--backends / --pins restrict the grid)")
+    parser.add_argument("--tune-budget", type=float, default=5,
+                        help="first-round time limit in seconds for --autotune (doubled every round)")
+    parser.add_argument("--tune-max-budget", type=float, default=None,
+                        help="last-round time limit for --autotune (default 8x --tune-budget)")
+    parser.add_argument("--no-profile", action="store_true",
+                        help="ignore res/SMT/tuning/config_profile.json")
 
     args = parser.parse_args()
+    global PAIRING
+    PAIRING = args.pairing
+
+    explicit = any(v is not None for v in (args.sym, args.pin_team1, args.backend, args.anchor_week))
+    args.sym = bool(args.sym)
+    args.pin_team1 = args.pin_team1 or 0
+    args.backend = args.backend or "z3"
+    args.anchor_week = args.anchor_week or 0
 
     N_VALUES = ALL_N if args.n == 0 else [args.n]
 
     out_dir = ROOT / "res" / "SMT"
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    if args.autotune:
+        backends = [b.strip() for b in args.backends.split(",") if b.strip()] or ["z3", "cvc5", "opensmt"]
+        pins = parse_csv_ints(args.pins) if args.pins.strip() else [0, 1, 2]
+        autotune(N_VALUES, backends, pins, bool(args.opt and not args.decomposed), int(args.maxD),
+                 args.tune_budget, args.tune_max_budget)
+        return
+
+    if args.enumerate > 0:
+        if args.backend != "z3":
+            parser.error("--enumerate is only implemented for the z3 backend")
+        for n in N_VALUES:
+            run_enumerate(n, args.enumerate, out_dir)
+        return
+
+    if args.rolling > 0:
+        if args.backend != "z3":
+            parser.error("--rolling is only implemented for the z3 backend")
+        decomposed = bool(args.opt and args.decomposed)
+        for n in N_VALUES:
+            json_path = out_dir / f"{n}.json"
+            print(f"\n=== SMT rolling k={args.rolling} n={n} ===")
+            key = key_for({"backend": "z3", "opt": decomposed, "decomposed": decomposed, "sym": True, "pin": 0})
+            key += f"_ROLL{args.rolling}" + pairing_suffix(PAIRING)
+            t, st, sol, obj = run_rolling(n, args.rolling, decomposed=decomposed)
+            write_result_json(key, str(json_path), t, st, sol, obj=obj)
+            print(f"[{key}] status={st} time={t:.3f}s obj={obj}")
+        return
+
     if args.models.strip():
         wanted = [k.strip() for k in args.models.split(",") if k.strip()]
         selected = []
         for k in wanted:
+            if k.endswith("_ws"):
+                k = k[:-len("_ws")]
+            if pairing_suffix(PAIRING) and k.endswith(pairing_suffix(PAIRING)):
+                k = k[:-len(pairing_suffix(PAIRING))]
             cfg = {"backend": None, "opt": None, "sym": False, "pin": 0, "maxD": int(args.maxD)}
+            cfg["decomposed"] = ("_BOOL_OPT_DECOMP" in k)
             if "_BOOL_OPT" in k:
                 cfg["opt"] = True
             elif "_DECISION" in k:
@@ -290,52 +505,71 @@ def main():
 
         for n in N_VALUES:
             json_path = out_dir / f"{n}.json"
+            hint = load_hint(n, args.hint, prefer="SMT") if args.hint else None
             print(f"\n=== SMT n={n} ===")
             for cfg in selected:
                 backend = cfg["backend"]
                 sym = cfg["sym"]
                 pin = cfg["pin"]
-                if not cfg["opt"]:
-                    t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=None, backend=backend)
-                    write_result_json(cfg["forced_key"], str(json_path), t, st, sol, obj=None)
-                    print(f"[{cfg['forced_key']}] status={st} time={t:.3f}s")
+                key = tagged(cfg["forced_key"], hint)
+                if cfg["decomposed"]:
+                    t, st, sol, obj = run_decomposed(n, sym=sym, pin_team1_weeks=pin, backend=backend, hint=hint)
+                    write_result_json(key, str(json_path), t, st, sol, obj=obj)
+                    print(f"[{key}] status={st} time={t:.3f}s obj={obj}")
+                elif not cfg["opt"]:
+                    t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=None, backend=backend, hint=hint)
+                    write_result_json(key, str(json_path), t, st, sol, obj=None)
+                    print(f"[{key}] status={st} time={t:.3f}s")
                 else:
                     if cfg.get("forced_D", None) is not None:
                         D = int(cfg["forced_D"])
-                        t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=D, backend=backend)
+                        t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=D, backend=backend, hint=hint)
                         if st == "sat":
-                            write_result_json(cfg["forced_key"], str(json_path), t, "sat", sol, obj=D)
+                            write_result_json(key, str(json_path), t, "sat", sol, obj=D)
                         else:
-                            write_result_json(cfg["forced_key"], str(json_path), TIME_LIMIT, "timeout", [], obj=None)
-                        print(f"[{cfg['forced_key']}] status={st} time={t:.3f}s")
+                            write_result_json(key, str(json_path), TIME_LIMIT, "timeout", [], obj=None)
+                        print(f"[{key}] status={st} time={t:.3f}s")
                     else:
                         best = None
-                        for D in range(0, int(args.maxD) + 1):
-                            t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=D, backend=backend)
+                        for D in range(fairness_lb(n), int(args.maxD) + 1):
+                            t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=D, backend=backend, hint=hint)
                             if st == "sat":
                                 best = (D, t, sol)
                                 break
                         if best is None:
-                            write_result_json(cfg["forced_key"], str(json_path), TIME_LIMIT, "timeout", [], obj=None)
-                            print(f"[{cfg['forced_key']}] status=timeout")
+                            write_result_json(key, str(json_path), TIME_LIMIT, "timeout", [], obj=None)
+                            print(f"[{key}] status=timeout")
                         else:
                             D, t, sol = best
-                            write_result_json(cfg["forced_key"], str(json_path), t, "sat", sol, obj=D)
-                            print(f"[{cfg['forced_key']}] status=sat time={t:.3f}s obj={D}")
+                            write_result_json(key, str(json_path), t, "sat", sol, obj=D)
+                            print(f"[{key}] status=sat time={t:.3f}s obj={D}")
         return
 
     if not args.all:
-        backend = args.backend
-        sym = bool(args.sym)
-        pins = max(0, int(args.pin_team1))
+        profile = {} if explicit or args.no_profile else load_profile(PROFILE_PATH)
         for n in N_VALUES:
+            backend, sym, pins, aw = args.backend, args.sym, max(0, int(args.pin_team1)), args.anchor_week
+            tuned = tuned_config(profile, tune_key(bool(args.opt and not args.decomposed)), n)
+            if tuned:
+                backend, sym, pins, aw = tuned["backend"], tuned["sym"], tuned["pin"], tuned["anchor_week"]
+                print(f"Tuned configuration from {PROFILE_PATH.name}: {config_label(tuned)}")
+            # runs configured by the profile are stored next to the hand-picked ones
+            suffix = "_TUNED" if tuned else ""
             json_path = out_dir / f"{n}.json"
+            hint = load_hint(n, args.hint, prefer="SMT") if args.hint else None
             print(f"\n=== SMT solver={backend} n={n} ===")
 
-            if args.opt:
+            if args.opt and args.decomposed:
+                key = key_for({"backend": backend, "opt": True, "decomposed": True, "sym": sym, "pin": pins}) + suffix
+                t, st, sol, obj = run_decomposed(n, sym=sym, pin_team1_weeks=pins, backend=backend, hint=hint,
+                                                 anchor_week=aw)
+                write_result_json(tagged(key, hint), str(json_path), t, st, sol, obj=obj)
+                print(f"[{tagged(key, hint)}] status={st} time={t:.3f}s obj={obj}")
+            elif args.opt:
                 best = None
-                for D in range(0, int(args.maxD) + 1):
-                    t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pins, max_diff=D, backend=backend)
+                for D in range(fairness_lb(n), int(args.maxD) + 1):
+                    t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pins, max_diff=D, backend=backend, hint=hint,
+                                         anchor_week=aw)
                     if st == "sat":
                         best = (D, t, sol)
                         break
@@ -345,24 +579,27 @@ def main():
                     base_key += "_SB"
                 if pins > 0:
                     base_key += f"_pin1w{pins}"
+                base_key += suffix
 
                 if best is None:
-                    write_result_json(base_key, str(json_path), TIME_LIMIT, "timeout", [], obj=None)
-                    print(f"[{base_key}] status=timeout")
+                    write_result_json(tagged(base_key, hint), str(json_path), TIME_LIMIT, "timeout", [], obj=None)
+                    print(f"[{tagged(base_key, hint)}] status=timeout")
                 else:
                     D, t, sol = best
                     key = base_key + f"_D{D}"
-                    write_result_json(key, str(json_path), t, "sat", sol, obj=D)
-                    print(f"[{key}] status=sat time={t:.3f}s obj={D}")
+                    write_result_json(tagged(key, hint), str(json_path), t, "sat", sol, obj=D)
+                    print(f"[{tagged(key, hint)}] status=sat time={t:.3f}s obj={D}")
             else:
-                t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pins, max_diff=None, backend=backend)
+                t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pins, max_diff=None, backend=backend, hint=hint,
+                                     anchor_week=aw)
                 key = f"SMT_{backend.upper()}_DECISION"
                 if sym:
                     key += "_SB"
                 if pins > 0:
                     key += f"_pin1w{pins}"
-                write_result_json(key, str(json_path), t, st, sol, obj=None)
-                print(f"[{key}] status={st} time={t:.3f}s")
+                key += suffix
+                write_result_json(tagged(key, hint), str(json_path), t, st, sol, obj=None)
+                print(f"[{tagged(key, hint)}] status={st} time={t:.3f}s")
         return
 
     selected_backends = ["z3", "cvc5", "opensmt"]
@@ -383,33 +620,39 @@ def main():
 
     for n in N_VALUES:
         json_path = out_dir / f"{n}.json"
+        hint = load_hint(n, args.hint, prefer="SMT") if args.hint else None
         print(f"\n=== SMT n={n} ===")
         for cfg in approaches:
             backend = cfg["backend"]
             sym = cfg["sym"]
             pin = cfg["pin"]
 
-            if not cfg["opt"]:
-                t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=None, backend=backend)
+            if cfg["decomposed"]:
+                t, st, sol, obj = run_decomposed(n, sym=sym, pin_team1_weeks=pin, backend=backend, hint=hint)
+                key = key_for(cfg)
+                write_result_json(tagged(key, hint), str(json_path), t, st, sol, obj=obj)
+                print(f"[{tagged(key, hint)}] status={st} time={t:.3f}s obj={obj}")
+            elif not cfg["opt"]:
+                t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=None, backend=backend, hint=hint)
                 key = key_for(cfg)
-                write_result_json(key, str(json_path), t, st, sol, obj=None)
-                print(f"[{key}] status={st} time={t:.3f}s")
+                write_result_json(tagged(key, hint), str(json_path), t, st, sol, obj=None)
+                print(f"[{tagged(key, hint)}] status={st} time={t:.3f}s")
             else:
                 best = None
-                for D in range(0, int(cfg["maxD"]) + 1):
-                    t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=D, backend=backend)
+                for D in range(fairness_lb(n), int(cfg["maxD"]) + 1):
+                    t, st, sol = run_one(n, sym=sym, pin_team1_weeks=pin, max_diff=D, backend=backend, hint=hint)
                     if st == "sat":
                         best = (D, t, sol)
                         break
                 if best is None:
                     key = key_for(cfg)
-                    write_result_json(key, str(json_path), TIME_LIMIT, "timeout", [], obj=None)
-                    print(f"[{key}] status=timeout")
+                    write_result_json(tagged(key, hint), str(json_path), TIME_LIMIT, "timeout", [], obj=None)
+                    print(f"[{tagged(key, hint)}] status=timeout")
                 else:
                     D, t, sol = best
                     key = key_for(cfg, D=D)
-                    write_result_json(key, str(json_path), t, "sat", sol, obj=D)
-                    print(f"[{key}] status=sat time={t:.3f}s obj={D}")
+                    write_result_json(tagged(key, hint), str(json_path), t, "sat", sol, obj=D)
+                    print(f"[{tagged(key, hint)}] status=sat time={t:.3f}s obj={D}")
 
 
 if __name__ == "__main__":
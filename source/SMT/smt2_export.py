@@ -8,7 +8,7 @@ Fairness uses Bool home_{w,m}.
 
 from __future__ import annotations
 from pathlib import Path
-from round_robin import circle_method_pairs
+from common.tournament import tournament
 
 
 def per_var(w, m) -> str:
@@ -30,11 +30,14 @@ def write_smt2_file(
     add_team1_pins: int = 0,
     # symmetry break for home variables when optimizing
     fix_home_sym: bool = True,
+    pairing=None,
+    anchor_week: int = 0,
 ):
     """
     Notes:
     - This is separate from the Z3 PB encoding. It's for external solvers only.
     - If max_diff is not None => with_home must be True.
+    - pairing: a Tournament (common/pairings.py), default the circle method.
     """
     if n % 2 != 0:
         raise ValueError("n must be even")
@@ -44,18 +47,11 @@ def write_smt2_file(
 
     P = n // 2
     W = n - 1
-    weeks = circle_method_pairs(n)
-
-    # Precompute match_of[w][t]
-    match_of = [[None] * (n + 1) for _ in range(W)]
-    for w in range(W):
-        for m, (a, b) in enumerate(weeks[w]):
-            match_of[w][a] = m
-            match_of[w][b] = m
-    for w in range(W):
-        for t in range(1, n + 1):
-            if match_of[w][t] is None:
-                raise RuntimeError(f"Bad RR: team {t} missing in week {w}")
+    T = pairing or tournament(n)
+    weeks = T.weeks(sorted_pairs=True)
+
+    # match_of[w][t], precomputed once per n (common/tournament.py)
+    match_of = T.match_of.tolist()
 
     with out_path.open("w", encoding="utf-8") as f:
         f.write("(set-logic QF_LIA)\n")
@@ -103,11 +99,12 @@ def write_smt2_file(
                 totals = " ".join(sum_exprs)
                 f.write(f"(assert (= (+ {totals}) {W}))\n")
 
-        # Symmetry breaking: name periods by fixing week 0 diagonally
-        # per_{0,m} = m
+        # Symmetry breaking: name periods by fixing the anchor week diagonally
+        # per_{aw,m} = m
         if use_sym:
+            aw = anchor_week % W
             for m in range(P):
-                f.write(f"(assert (= {per_var(0,m)} {m}))\n")
+                f.write(f"(assert (= {per_var(aw,m)} {m}))\n")
 
         # Optional extra SB: pin team1 match to period 0 for first k weeks
         if add_team1_pins > 0:
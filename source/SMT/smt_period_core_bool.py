@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-from z3 import Solver, Bool, Not, SolverFor, PbEq, PbLe, PbGe, Implies, And, Optimize
-from round_robin import circle_method_pairs
+from z3 import Solver, SimpleSolver, Bool, BoolVal, Not, SolverFor, PbEq, PbLe, PbGe, Implies, And, Optimize
+from common.tournament import tournament
+from common.hints import hint_assignment, relabel_periods
 
 
 def pb_exactly_one(s: Solver, lits):
@@ -40,7 +41,9 @@ def build_model(
     max_diff: int | None = None,
     timeout_ms: int = 300_000,
     pin_team1_weeks: int = 0,
-    optimize: bool = False
+    optimize: bool = False,
+    hint=None,
+    pairing=None
 ):
 
     if n % 2 != 0:
@@ -49,7 +52,9 @@ def build_model(
     P = n // 2
     W = n - 1
     M = n // 2
-    weeks = circle_method_pairs(n)
+    # circle method unless another 1-factorization is given (common/pairings.py)
+    T = pairing or tournament(n)
+    weeks = T.weeks(sorted_pairs=True)
 
     seen = set()
     for w in range(W):
@@ -69,9 +74,13 @@ def build_model(
     if len(seen) != n * (n - 1) // 2:
         raise RuntimeError("Bad RR: not all pairs generated")
     
-    if optimize():
+    if optimize:
         s = Optimize()
         solver_tag = "Z3_OPT"
+    elif hint:
+        # set_initial_value is only accepted by the SMT core, not SolverFor("SAT")
+        s = SimpleSolver()
+        solver_tag = "SMT"
     else:
         solver_tag = "SAT"
         try:
@@ -103,12 +112,8 @@ def build_model(
         for p in range(P):
             pb_exactly_one(s, [X[w][m][p] for m in range(M)])
 
-    # Precompute match_of[w][t]
-    match_of = [[None] * (n + 1) for _ in range(W)]
-    for w in range(W):
-        for m, (a, b) in enumerate(weeks[w]):
-            match_of[w][a] = m
-            match_of[w][b] = m
+    # match_of[w][t], precomputed once per n (common/tournament.py)
+    match_of = T.match_of.tolist()
 
     # 3 team appears in same period at most twice
         #  For each team t and period p:
@@ -141,41 +146,66 @@ def build_model(
             s.add(X[w][m][0])
 
     if use_sym:
+        aw = anchor_week % W
         for m in range(M):
-            s.add(X[0][m][m])
+            s.add(X[aw][m][m])
+
+    if max_diff is not None:
+        if home is None:
+            raise ValueError("Fairness requires with_home=True")
 
-       #aw = anchor_week % W
-       #for m in range(M):
-       #    s.add(X[aw][m][m])
+        from z3 import If, Sum
 
-        if max_diff is not None:
-            if home is None:
-                raise ValueError("Fairness requires with_home=True")
+        # Symmetry break for home/away:
+        # Flipping all home[w][m] yields an equivalent solution
+        # Fix one arbitrary match orientation to cut that symmetry.
+        s.add(home[0][0])
 
-            from z3 import If, Sum
+        for t in range(1, n + 1):
+            terms = []
+            for w in range(W):
+                m = match_of[w][t]
+                a, b = weeks[w][m]
 
-            # Symmetry break for home/away:
-            # Flipping all home[w][m] yields an equivalent solution
-            # Fix one arbitrary match orientation to cut that symmetry.
-            s.add(home[0][0])
+                # home[w][m] == True means 'a' is home, else 'b' is home.
+                if t == a:
+                    terms.append(If(home[w][m], 1, 0))
+                else:
+                    terms.append(If(home[w][m], 0, 1))
 
-            for t in range(1, n + 1):
-                terms = []
-                for w in range(W):
-                    m = match_of[w][t]
-                    a, b = weeks[w][m]
+            hg = Sum(terms)  # number of home games for team t
 
-                    # home[w][m] == True means 'a' is home, else 'b' is home.
-                    if t == a:
-                        terms.append(If(home[w][m], 1, 0))
-                    else:
-                        terms.append(If(home[w][m], 0, 1))
+            # |2*hg - W| <= max_diff
+            s.add(2 * hg - W <= max_diff)
+            s.add(W - 2 * hg <= max_diff)
 
-                hg = Sum(terms)  # number of home games for team t
+    if hint:
+        set_hint(s, weeks, X, home, hint, use_sym, anchor_week % W)
 
-                # |2*hg - W| <= max_diff
-                s.add(2 * hg - W <= max_diff)
-                s.add(W - 2 * hg <= max_diff)
+    return s, weeks, X, home, W, P
 
 
-    return s, weeks, X, home, W, P
\ No newline at end of file
+def set_hint(s, weeks, X, home, hint, use_sym: bool = False, anchor_week: int = 0) -> bool:
+    """
+    Seed the phase of every X (and home) literal from a hint schedule via
+    set_initial_value (z3 >= 4.13); silently skipped on older z3.
+    """
+    if not hasattr(s, "set_initial_value"):
+        return False
+    try:
+        per, is_home = hint_assignment(hint, weeks)
+    except ValueError:
+        return False
+    if use_sym:
+        per = relabel_periods(per, week=anchor_week)
+    if not is_home[0][0]:
+        # the model fixes home[0][0]; flipping every match keeps |h - a|
+        is_home = [[not h for h in row] for row in is_home]
+
+    for w in range(len(X)):
+        for m in range(len(X[w])):
+            for p in range(len(X[w][m])):
+                s.set_initial_value(X[w][m][p], BoolVal(per[w][m] == p))
+            if home is not None:
+                s.set_initial_value(home[w][m], BoolVal(is_home[w][m]))
+    return True
\ No newline at end of file
@@ -8,6 +8,7 @@ sys.path.insert(0, str(SRC_DIR))
 
 from io_json import write_result_json
 from smt_period_core_bool import build_model
+from common.schedule import Schedule
 
 TIME_LIMIT = 300
 
@@ -15,17 +16,14 @@ def extract_schedule(model, weeks, X, n):
     P = n // 2
     W = n - 1
     M = n // 2
-    sol = [[None for _ in range(W)] for _ in range(P)]
+    sched = Schedule(P, W)
     for w in range(W):
         for m in range(M):
             for p in range(P):
                 if model.evaluate(X[w][m][p], model_completion=True):
                     a, b = weeks[w][m]
-                    sol[p][w] = [a, b]
-    return sol
-
-def is_full(sol):
-    return sol and all(all(c is not None for c in row) for row in sol)
+                    sched[p, w] = (a, b)
+    return sched
 
 def solve(n, anchor_week=0, timeout_s=300):
     s, weeks, X, home, W, P = build_model(n, use_sym=True, anchor_week=anchor_week, timeout_ms=timeout_s*1000)
@@ -33,8 +31,10 @@ def solve(n, anchor_week=0, timeout_s=300):
     r = s.check()
     t = time.time() - t0
     if r == sat:
-        sol = extract_schedule(s.model(), weeks, X, n)
-        return ("sat" if is_full(sol) else "unknown"), sol, t
+        sched = extract_schedule(s.model(), weeks, X, n)
+        if not sched.is_complete():
+            return "unknown", [], t
+        return "sat", sched.tolist(), t
     if r == unsat:
         return "unsat", [], t
     return "unknown", [], t
@@ -8,6 +8,8 @@ sys.path.insert(0, str(SRC_DIR))
 
 from io_json import write_result_json
 from smt_period_core_bool import build_model
+from common.schedule import Schedule
+from common.bounds import fairness_lb, fairness_ub, reaches_lb
 
 TIME_LIMIT = 300
 
@@ -15,25 +17,23 @@ def extract_schedule(model, weeks, X, home, n):
     P = n // 2
     W = n - 1
     M = n // 2
-    sol = [[None for _ in range(W)] for _ in range(P)]
+    sched = Schedule(P, W)
     for w in range(W):
         for m in range(M):
             for p in range(P):
                 if model.evaluate(X[w][m][p], model_completion=True):
                     a, b = weeks[w][m]
                     if home is None:
-                        sol[p][w] = [a, b]
+                        sched[p, w] = (a, b)
                     else:
                         hv = bool(model.evaluate(home[w][m], model_completion=True))
-                        sol[p][w] = [a, b] if hv else [b, a]
-    return sol
-
-def is_full(sol):
-    return sol and all(all(c is not None for c in row) for row in sol)
+                        sched[p, w] = (a, b) if hv else (b, a)
+    return sched
 
 def solve(n, use_sym=False, anchor_week=0, time_limit_s=300):
     W = n - 1
-    lo, hi = 0, W
+    # proven bounds: lb by parity, ub by orientation (common/bounds.py)
+    lo, hi = fairness_lb(n), fairness_ub(n)
     best_sol, best = None, None
     proved = True
     start = time.time()
@@ -55,11 +55,13 @@ def solve(n, use_sym=False, anchor_week=0, time_limit_s=300):
 
         r = s.check()
         if r == sat:
-            sol = extract_schedule(s.model(), weeks, X, home, n)
-            if not is_full(sol):
+            sched = extract_schedule(s.model(), weeks, X, home, n)
+            if not sched.is_complete():
                 proved = False
                 break
-            best, best_sol = mid, sol
+            best, best_sol = mid, sched.tolist()
+            if reaches_lb(n, best):
+                break
             hi = mid - 1
         elif r == unsat:
             lo = mid + 1
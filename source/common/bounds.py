@@ -0,0 +1,31 @@
+"""
+Proven bounds on the fairness objective F = max_t |home_t - away_t|.
+
+Lower bound (parity): every team plays W = n-1 games and n is even, so W
+is odd and |home - away| = |2*home - W| is odd for every team: F >= 1.
+
+Upper bound (orientation): periods never constrain home/away, and
+common.orientation orients any valid period assignment so that every
+team has |home - away| = 1 (Euler circuit argument, see that module).
+So whenever the instance is feasible, F = 1 is attainable and optimal.
+
+Optimizers start their search at fairness_lb(n), cap it at
+fairness_ub(n) and stop as soon as an incumbent reaches the lower bound.
+"""
+
+
+def fairness_lb(n: int) -> int:
+    W = n - 1
+    return W % 2
+
+
+def fairness_ub(n: int) -> int:
+    # attained by common.orientation on any feasible schedule
+    return max(1, fairness_lb(n))
+
+
+def reaches_lb(n: int, obj) -> bool:
+    """
+    True if obj is a proven optimum (it meets the parity lower bound).
+    """
+    return obj is not None and obj <= fairness_lb(n)
@@ -0,0 +1,56 @@
+"""
+Enumeration of distinct schedules on one live solver.
+
+Periods are interchangeable, so every schedule has P! relabelled copies.
+With the anchor week frozen (match m in period m, the usual use_sym
+break) each relabelling class has exactly one member in the model, so
+blocking the exact assignment of each solution found enumerates distinct
+schedules modulo period relabelling. The blocking clause is added to the
+same solver, which keeps its learnt clauses between solutions.
+
+Backends supply two closures:
+
+    next_solution(time_left) -> per[w][m] | None   (None: exhausted or out of time)
+    block(per)                                      add the blocking clause
+
+Solutions are streamed to a JSONL file as they are found, one record per
+line: {"index", "time", "sol"} with sol in checker format.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from common.rolling import periods_to_solution
+
+
+def enumerate_to_jsonl(weeks, next_solution, block, limit: int, path, time_limit: float = 300):
+    """
+    Find up to `limit` schedules and append each one to `path` (the file
+    is truncated first). Returns (count, exhausted): exhausted is True if
+    the solver proved there are no more.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    start = time.time()
+    count = 0
+    exhausted = False
+
+    with open(path, "w", encoding="utf-8") as f:
+        while count < limit:
+            left = time_limit - (time.time() - start)
+            if left <= 0:
+                break
+            per = next_solution(left)
+            if per is None:
+                exhausted = time.time() - start < time_limit
+                break
+
+            count += 1
+            record = {"index": count, "time": round(time.time() - start, 3),
+                      "sol": periods_to_solution(weeks, per)}
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            block(per)
+
+    return count, exhausted
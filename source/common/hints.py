@@ -0,0 +1,135 @@
+"""
+Warm-start / solution-hint API shared by all approaches.
+
+A hint is any valid schedule in checker format, sol[p][w] = [home, away]
+(from another approach's res/<APP>/{n}.json, an earlier decision run or
+the CONSTRUCT approach). hint_assignment() maps it onto the pairing used
+by a model:
+
+    per[w][m]  = period of match m of week w
+    home[w][m] = True if weeks[w][m][0] plays at home
+
+Weeks are matched by their set of pairings, so a hint produced with the
+same 1-factorization in a different week order (e.g. MIP vs CP circle
+method) is accepted. Each approach turns (per, home) into its own
+warm-start mechanism (z3 initial values, MIP start, MiniZinc
+warm_start, SAT phases).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+RES_DIR = ROOT / "res"
+
+# searched in this order by "auto" (after the preferred approach)
+APPROACHES = ["CONSTRUCT", "CP", "MIP", "SAT", "SMT", "SMT_BOOL", "LS", "BT"]
+
+# time budget of the repair step when the hint is built on the fly
+CONSTRUCT_TIME = 30
+
+
+def is_valid_schedule(sol) -> bool:
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from fast_checker import check_solution
+
+    if not sol:
+        return False
+    try:
+        return check_solution(sol, None, 0, True) == "Valid solution"
+    except Exception:
+        return False
+
+
+def _entries(path: Path):
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def load_hint(n: int, spec: str, prefer: str = None):
+    """
+    spec:
+      "auto"            first valid schedule in res/<APP>/{n}.json,
+                        trying `prefer` first, then APPROACHES
+      "construct"       build one with CONSTRUCT/construct.py
+      "<file>.json"     first valid schedule in that file
+      "<file>.json:key" that entry only
+    Returns sol or None.
+    """
+    if not spec:
+        return None
+
+    if spec == "auto":
+        order = ([prefer] if prefer else []) + [a for a in APPROACHES if a != prefer]
+        for app in order:
+            for entry in _entries(RES_DIR / app / f"{n}.json").values():
+                sol = entry.get("sol")
+                if sol and len(sol) == n // 2 and is_valid_schedule(sol):
+                    return sol
+        return None
+
+    if spec == "construct":
+        construct_dir = str(ROOT / "source" / "CONSTRUCT")
+        if construct_dir not in sys.path:
+            sys.path.insert(0, construct_dir)
+        from construct import construct_schedule
+
+        sol = construct_schedule(n, time_limit=CONSTRUCT_TIME)
+        return sol if sol and is_valid_schedule(sol) else None
+
+    path, _, key = spec.partition(":")
+    data = _entries(Path(path))
+    candidates = [data[key]] if key else list(data.values())
+    for entry in candidates:
+        sol = entry.get("sol")
+        if sol and len(sol) == n // 2 and is_valid_schedule(sol):
+            return sol
+    return None
+
+
+def hint_assignment(sol, weeks):
+    """
+    Map a schedule onto weeks[w] = list of (a, b).
+    Returns (per, home); raises ValueError if the schedule does not use
+    the same set of weekly pairings.
+    """
+    W = len(weeks)
+    index = {}
+    for w, week in enumerate(weeks):
+        key = frozenset(frozenset(pair) for pair in week)
+        index[key] = w
+
+    P = len(sol)
+    per = [[None] * len(weeks[w]) for w in range(W)]
+    home = [[None] * len(weeks[w]) for w in range(W)]
+
+    for hw in range(W):
+        column = [sol[p][hw] for p in range(P)]
+        key = frozenset(frozenset(match) for match in column)
+        w = index.get(key)
+        if w is None:
+            raise ValueError(f"hint week {hw} is not a week of this pairing")
+
+        slot = {frozenset(match): (p, match[0]) for p, match in enumerate(column)}
+        for m, (a, b) in enumerate(weeks[w]):
+            p, h = slot[frozenset((a, b))]
+            per[w][m] = p
+            home[w][m] = (h == a)
+
+    return per, home
+
+
+def relabel_periods(per, week=0):
+    """
+    Rename periods so that match m of `week` is in period m. Period labels
+    are interchangeable, so this keeps the hint valid and consistent with
+    the "week 1 fixed" symmetry breaking of the models.
+    """
+    rename = {p: m for m, p in enumerate(per[week])}
+    return [[rename[p] for p in row] for row in per]
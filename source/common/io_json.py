@@ -1,20 +1,7 @@
-import json
-from pathlib import Path
+from common.store import update_result_file
 
 def write_result_json(approach_name, json_path, solve_time, status, solution_matrix, obj=None):
 
-    json_path = Path(json_path)
-    json_path.parent.mkdir(parents=True, exist_ok=True)
-
-    if json_path.exists():
-        try:
-            with open(json_path, "r") as f:
-                data = json.load(f)
-        except Exception:
-            data = {}
-    else:
-        data = {}
-
     if status == "sat":
         entry = {
             "time": int(min(solve_time, 300)),
@@ -37,7 +24,4 @@ def write_result_json(approach_name, json_path, solve_time, status, solution_mat
             "sol": []
         }
 
-    data[approach_name] = entry
-
-    with open(json_path, "w") as f:
-        json.dump(data, f, indent=2)
+    update_result_file(json_path, {approach_name: entry})
@@ -0,0 +1,222 @@
+"""
+Solver-independent model of the period assignment.
+
+The same STS constraints used to be written once per solver family
+(sat_dimacs.build_dimacs, smt_period_core_bool.build_model,
+smt2_export.write_smt2_file, the .mzn and the .mod files), each with
+its own implied constraints and symmetry breaking. build() writes them
+once, as NumPy arrays of literals, and common/ir_compile.py compiles
+the result to CNF, z3, SMT-LIB2, MiniZinc and AMPL.
+
+Variables are numbered from 1 (DIMACS style), a literal is +v or -v:
+
+    X[w, m, p]    match m of week w is played in period p
+    H[w, m]       the first team of match m (a < b) plays at home (fairness only)
+
+X is numbered first, in (w, m, p) order, so the CNF numbering is the
+one of sat_dimacs.build_dimacs.
+
+Every constraint is a cardinality family: a rows x width array of
+literals and one pair of bounds lo <= sum(row) <= hi for all rows.
+
+    MatchPeriod      each match in exactly one period
+    PeriodMatch      each period holds exactly one match per week
+    TeamPeriod       each team at most twice per period (at least once
+                     with the "lower" implied option: W = 2P - 1 games
+                     in P periods)
+    TeamWindow       at most twice in any 3 consecutive weeks ("window",
+                     implied, the NoThreeConsecutiveWeeks cut of the MIP)
+    Fairness         home games of each team within (W -+ D) / 2, added
+                     by with_max_diff(D)
+
+Unit literals (fixed) hold the symmetry breaking: week `anchor_week`
+frozen to match m in period m, team 1 pinned to period 0 for the first
+weeks, and H[0, 0] true when fairness is on (flipping every match).
+
+Lex-leader constraints (common/symmetry.py) are kept as (name, x, y)
+pairs of literal vectors meaning x <=lex y; each target compiles them
+its own way (clauses, lex_lesseq, linear rows).
+"""
+
+import copy
+
+import numpy as np
+
+from common.schedule import Schedule
+from common.tournament import tournament
+
+IMPLIED = ("lower", "window")
+
+
+class Card:
+    __slots__ = ("name", "lits", "lo", "hi")
+
+    def __init__(self, name: str, lits, lo: int = 0, hi: int | None = None):
+        self.name = name
+        self.lits = np.asarray(lits, dtype=np.int64).reshape(-1, np.shape(lits)[-1])
+        self.lo = lo
+        self.hi = self.width if hi is None else hi
+
+    @property
+    def rows(self) -> int:
+        return self.lits.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.lits.shape[1]
+
+    def __repr__(self):
+        return f"Card({self.name}, {self.rows} x {self.width}, {self.lo}..{self.hi})"
+
+
+class Model:
+    def __init__(self, n: int, pairing=None):
+        self.n = n
+        self.W = n - 1
+        self.P = n // 2
+        self.pairing = pairing or tournament(n)
+        # weeks[w][m] = (a, b) with a < b, the orientation of H
+        self.weeks = self.pairing.weeks(sorted_pairs=True)
+        self.num_vars = 0
+        self.blocks = {}
+        self.cards = []
+        self.units = []
+        # team x week literals "team plays at home", set with fairness
+        self.home_lits = None
+        self.lex = []
+        self.options = {}
+
+    def new_block(self, name: str, shape):
+        size = int(np.prod(shape))
+        ids = np.arange(self.num_vars + 1, self.num_vars + size + 1, dtype=np.int64).reshape(shape)
+        self.num_vars += size
+        self.blocks[name] = ids
+        return ids
+
+    def add_card(self, name: str, lits, lo: int = 0, hi: int | None = None):
+        card = Card(name, lits, lo, hi)
+        if card.rows:
+            self.cards.append(card)
+        return card
+
+    def fix(self, name: str, lits):
+        self.units.append((name, np.asarray(lits, dtype=np.int64).ravel()))
+
+    def add_lex(self, name: str, x, y):
+        """
+        x <=lex y (false < true), positions where x and y agree dropped.
+        """
+        x = np.asarray(x, dtype=np.int64).ravel()
+        y = np.asarray(y, dtype=np.int64).ravel()
+        keep = x != y
+        if keep.any():
+            self.lex.append((name, x[keep], y[keep]))
+
+    def with_max_diff(self, max_diff: int):
+        """
+        Copy with every team's home count within (W - max_diff) / 2 ..
+        (W + max_diff) / 2, i.e. |home - away| <= max_diff.
+        """
+        if self.home_lits is None:
+            raise ValueError("max_diff requires fairness=True")
+        model = copy.copy(self)
+        model.cards = list(self.cards)
+        model.lex = list(self.lex)
+        model.options = dict(self.options, max_diff=max_diff)
+        W = self.W
+        model.add_card("Fairness", self.home_lits, max(0, (W - max_diff + 1) // 2), min(W, (W + max_diff) // 2))
+        return model
+
+    def var_names(self):
+        """
+        names[v - 1] = name of variable v (X_w_m_p, H_w_m), the reverse
+        map format of sat_dimacs.
+        """
+        names = [None] * self.num_vars
+        for block, ids in self.blocks.items():
+            for idx in np.ndindex(ids.shape):
+                names[ids[idx] - 1] = "_".join([block] + [str(i) for i in idx])
+        return names
+
+    def decode(self, values, weeks=None) -> Schedule:
+        """
+        Schedule of an assignment: values[v] truthy for true variables
+        (a dict or an array indexed by variable id). Matches are oriented
+        by H when present, else as in weeks (default self.weeks).
+        """
+        weeks = weeks or self.weeks
+        truth = np.zeros(self.num_vars + 1, dtype=bool)
+        if isinstance(values, dict):
+            for v, val in values.items():
+                if val and 0 < v <= self.num_vars:
+                    truth[v] = True
+        else:
+            truth[:len(values)] = np.asarray(values, dtype=bool)[:self.num_vars + 1]
+
+        sched = Schedule(self.P, self.W)
+        X = self.blocks["X"]
+        H = self.blocks.get("H")
+        for w, m, p in np.argwhere(truth[X]):
+            a, b = weeks[w][m]
+            if H is not None and not truth[H[w, m]]:
+                a, b = b, a
+            sched[p, w] = (a, b)
+        return sched
+
+    def stats(self):
+        literals = sum(card.rows * card.width for card in self.cards)
+        return {"vars": self.num_vars, "families": len(self.cards),
+                "rows": sum(card.rows for card in self.cards), "literals": literals,
+                "units": sum(len(lits) for _, lits in self.units),
+                "lex": len(self.lex), "lex_literals": sum(len(x) for _, x, _ in self.lex)}
+
+    def __repr__(self):
+        return f"Model(n={self.n}, {self.stats()})"
+
+
+def build(n: int, pairing=None, sym: bool = True, anchor_week: int = 0, pin_team1: int = 0,
+          implied=("lower",), fairness: bool = False) -> Model:
+    """
+    Model of the period assignment on pairing (default the circle method).
+    implied: subset of IMPLIED.
+    """
+    if n % 2 != 0:
+        raise ValueError("n must be even")
+    unknown = set(implied) - set(IMPLIED)
+    if unknown:
+        raise ValueError(f"unknown implied constraints: {sorted(unknown)}")
+
+    model = Model(n, pairing)
+    model.options = {"sym": sym, "anchor_week": anchor_week, "pin_team1": pin_team1,
+                     "implied": tuple(implied), "fairness": fairness}
+    W, P = model.W, model.P
+    T = model.pairing
+
+    X = model.new_block("X", (W, P, P))
+    model.add_card("MatchPeriod", X.reshape(-1, P), 1, 1)
+    model.add_card("PeriodMatch", X.transpose(0, 2, 1).reshape(-1, P), 1, 1)
+
+    # team_period[t - 1, p, w] = X[w, match of t in week w, p]
+    tm = T.match_of[:, 1:]
+    team_period = X[np.arange(W)[None, None, :], tm.T[:, None, :], np.arange(P)[None, :, None]]
+    model.add_card("TeamPeriod", team_period.reshape(-1, W), 1 if "lower" in implied else 0, 2)
+    if "window" in implied and W >= 3:
+        windows = np.lib.stride_tricks.sliding_window_view(team_period, 3, axis=2)
+        model.add_card("TeamWindow", windows.reshape(-1, 3), 0, 2)
+
+    if sym:
+        aw = anchor_week % W
+        model.fix("FreezeWeek", X[aw, np.arange(P), np.arange(P)])
+    if pin_team1 > 0:
+        k = min(pin_team1, W)
+        model.fix("PinTeam1", X[np.arange(k), tm[:k, 0], 0])
+
+    if fairness:
+        H = model.new_block("H", (W, P))
+        w_idx = np.arange(W)[:, None]
+        first = T.sorted_pairs[w_idx, tm, 0] == np.arange(1, n + 1)[None, :]
+        model.home_lits = np.where(first, H[w_idx, tm], -H[w_idx, tm]).T
+        if sym:
+            model.fix("FlipHome", H[0, 0])
+
+    return model
@@ -0,0 +1,633 @@
+"""
+Compile a common.ir.Model to every solver family.
+
+    to_cnf(model, amo, amk)   Cnf (clause blocks as NumPy arrays) for pysat / DIMACS
+    to_z3(model)              z3 solver with PbEq / PbLe / PbGe
+    to_smt2(model)            SMT-LIB2 text (QF_LIA, Bool + ite sums)
+    to_mzn(model)             MiniZinc text (var bool, bool2int sums)
+    to_ampl(model)            AMPL .mod and .dat text (binary x, one row per constraint)
+
+The CNF cardinality encodings are chosen here, so a new encoding is one
+function and applies to every family of the model:
+
+    amo    at most one:  "pairwise" (binomial) or "seq" (Sinz sequential counter)
+    amk    at most k:    "subsets" (forbid every (k+1)-subset, used up to k = 2)
+                         or "seq"; larger k always use "seq"
+
+With the defaults (pairwise, subsets) and implied=("lower",) the CNF is
+the one of sat_dimacs.build_dimacs, clause for clause.
+
+Lex-leader constraints (model.lex, common/symmetry.py) become clauses
+over one chain of "equal so far" variables per constraint (lex_clauses)
+in CNF, z3, SMT2 and AMPL, and lex_lesseq in MiniZinc.
+
+Objective: with_max_diff(D) adds the fairness bound as a constraint
+(CNF, z3, SMT2 sweep D like the SAT/SMT runners). A fairness model
+without a bound compiles to "minimize max |home - away|" for MiniZinc
+and AMPL.
+
+    python source/common/ir_compile.py stats -n 12 --implied lower,window
+    python source/common/ir_compile.py emit -n 12 --targets cnf smt2 mzn ampl -o /tmp/ir
+    python source/common/ir_compile.py bench -n 10 12 14 --implied lower lower,window --amo pairwise seq
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from common.bounds import fairness_lb
+from common.ir import build
+from common.orientation import max_deviation
+from common.procs import run_command
+
+TARGETS = ("cnf", "z3", "smt2", "mzn", "ampl")
+
+
+# ---- CNF -------------------------------------------------------------------
+
+class Cnf:
+    def __init__(self, num_vars: int):
+        self.num_vars = num_vars
+        # clause blocks: each a rows x width array of literals
+        self.blocks = []
+
+    def new_vars(self, shape):
+        size = int(np.prod(shape))
+        ids = np.arange(self.num_vars + 1, self.num_vars + size + 1, dtype=np.int64).reshape(shape)
+        self.num_vars += size
+        return ids
+
+    def add(self, *columns):
+        """
+        Clauses given column-wise: add(a, b) adds (a[r] or b[r]) for every r.
+        """
+        block = np.stack([np.asarray(c, dtype=np.int64).ravel() for c in columns], axis=1)
+        if block.size:
+            self.blocks.append(block)
+
+    def add_block(self, block):
+        block = np.asarray(block, dtype=np.int64)
+        if block.size:
+            self.blocks.append(block)
+
+    @property
+    def num_clauses(self) -> int:
+        return sum(len(block) for block in self.blocks)
+
+    def clauses(self):
+        return [clause for block in self.blocks for clause in block.tolist()]
+
+    def write_dimacs(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"p cnf {self.num_vars} {self.num_clauses}\n")
+            for block in self.blocks:
+                # literals are never 0, so " 0 " only matches the clause terminators
+                rows = np.hstack([block, np.zeros((len(block), 1), dtype=np.int64)])
+                f.write((" " + " ".join(map(str, rows.ravel().tolist())) + " ").replace(" 0 ", " 0\n")[1:])
+
+
+def at_most_seq(cnf: Cnf, lits, k: int):
+    """
+    Sinz sequential counter for sum(row) <= k on every row of lits, with
+    s[r, i, j] = "at least j+1 of the first i+1 literals".
+    """
+    R, L = lits.shape
+    s = cnf.new_vars((R, L - 1, k))
+    cnf.add(-lits[:, 0], s[:, 0, 0])
+    for j in range(1, k):
+        cnf.add(-s[:, 0, j])
+    for i in range(1, L - 1):
+        cnf.add(-lits[:, i], s[:, i, 0])
+        cnf.add(-s[:, i - 1, 0], s[:, i, 0])
+        for j in range(1, k):
+            cnf.add(-lits[:, i], -s[:, i - 1, j - 1], s[:, i, j])
+            cnf.add(-s[:, i - 1, j], s[:, i, j])
+        cnf.add(-lits[:, i], -s[:, i - 1, k - 1])
+    cnf.add(-lits[:, L - 1], -s[:, L - 2, k - 1])
+
+
+def at_most(cnf: Cnf, lits, k: int, method: str):
+    R, L = lits.shape
+    if k >= L:
+        return
+    if k <= 0:
+        cnf.add(-lits)
+    elif method in ("pairwise", "subsets") and k <= 2:
+        subsets = np.array(list(combinations(range(L), k + 1)))
+        cnf.add_block(-lits[:, subsets].reshape(-1, k + 1))
+    elif method in ("pairwise", "subsets", "seq"):
+        at_most_seq(cnf, lits, k)
+    else:
+        raise ValueError(f"unknown cardinality encoding '{method}'")
+
+
+def lex_clauses(x, y, e):
+    """
+    Clause blocks of x <=lex y (false < true) with e[i] = "x and y are
+    equal on positions 0..i" (len(x) - 1 fresh variables): x[i] <= y[i]
+    while the prefix is equal, and an equal position extends the prefix.
+    """
+    x, y, e = (np.asarray(a, dtype=np.int64) for a in (x, y, e))
+    blocks = [np.stack([-x[:1], y[:1]], axis=1)]
+    if len(x) > 1:
+        blocks.append(np.stack([-x[:1], -y[:1], e[:1]], axis=1))
+        blocks.append(np.stack([x[:1], y[:1], e[:1]], axis=1))
+        blocks.append(np.stack([-e, -x[1:], y[1:]], axis=1))
+        blocks.append(np.stack([-e[:-1], -x[1:-1], -y[1:-1], e[1:]], axis=1))
+        blocks.append(np.stack([-e[:-1], x[1:-1], y[1:-1], e[1:]], axis=1))
+    return [block for block in blocks if len(block)]
+
+
+def lex_blocks(model, first=None):
+    """
+    (blocks, aux) for every lex constraint of model, the auxiliaries
+    numbered from first (default after model.num_vars): aux[i] = (name,
+    number of variables).
+    """
+    blocks, aux = [], []
+    first = model.num_vars + 1 if first is None else first
+    for name, x, y in model.lex:
+        e = np.arange(first, first + len(x) - 1)
+        first += len(e)
+        blocks += lex_clauses(x, y, e)
+        aux.append((name, len(e)))
+    return blocks, aux
+
+
+def to_cnf(model, amo: str = "pairwise", amk: str = "subsets") -> Cnf:
+    cnf = Cnf(model.num_vars)
+    for _, lits in model.units:
+        cnf.add(lits)
+    for card in model.cards:
+        lits, L = card.lits, card.width
+        if card.lo > card.hi:
+            cnf.add_block(np.zeros((1, 0), dtype=np.int64))
+            continue
+        if card.lo == 1:
+            cnf.add_block(lits)
+        elif card.lo > 1:
+            # sum(row) >= lo  <=>  at most L - lo literals false
+            at_most(cnf, -lits, L - card.lo, amk)
+        at_most(cnf, lits, card.hi, amo if card.hi == 1 else amk)
+    # after the counter variables of the cardinality encodings
+    blocks, aux = lex_blocks(model, cnf.num_vars + 1)
+    cnf.new_vars(sum(k for _, k in aux))
+    for block in blocks:
+        cnf.add_block(block)
+    return cnf
+
+
+# ---- z3 --------------------------------------------------------------------
+
+def to_z3(model, solver=None):
+    """
+    (solver, xs) with xs[v] the z3 Bool of variable v (xs[0] unused).
+    """
+    from z3 import Bool, Not, Or, PbEq, PbGe, PbLe, Solver, SolverFor
+
+    if solver is None:
+        try:
+            solver = SolverFor("SAT")
+        except Exception:
+            solver = Solver()
+    xs = [None] + [Bool(name) for name in model.var_names()]
+    blocks, aux = lex_blocks(model)
+    # lex auxiliaries after the model variables, not returned
+    all_vars = xs + [Bool(f"{name}_e{i}") for name, k in aux for i in range(k)]
+
+    def lit(l):
+        return all_vars[l] if l > 0 else Not(all_vars[-l])
+
+    for _, lits in model.units:
+        solver.add(*[lit(l) for l in lits.tolist()])
+    for card in model.cards:
+        for row in card.lits.tolist():
+            terms = [(lit(l), 1) for l in row]
+            if card.lo == card.hi:
+                solver.add(PbEq(terms, card.lo))
+                continue
+            if card.lo > 0:
+                solver.add(PbGe(terms, card.lo))
+            if card.hi < card.width:
+                solver.add(PbLe(terms, card.hi))
+    for block in blocks:
+        solver.add(*[Or([lit(l) for l in row]) for row in block.tolist()])
+    return solver, xs
+
+
+# ---- SMT-LIB2 --------------------------------------------------------------
+
+def to_smt2(model) -> str:
+    names = model.var_names()
+    blocks, aux = lex_blocks(model)
+    aux_names = [f"{name}_e{i}" for name, k in aux for i in range(k)]
+
+    def term(l):
+        return f"(ite {names[l - 1]} 1 0)" if l > 0 else f"(ite {names[-l - 1]} 0 1)"
+
+    out = ["(set-logic QF_LIA)", "(set-option :produce-models true)"]
+    out += [f"(declare-fun {name} () Bool)" for name in names]
+    for _, lits in model.units:
+        out += [f"(assert {names[l - 1]})" if l > 0 else f"(assert (not {names[-l - 1]}))" for l in lits.tolist()]
+    for card in model.cards:
+        out.append(f"; {card.name}: {card.rows} x {card.width}, {card.lo}..{card.hi}")
+        for row in card.lits.tolist():
+            total = f"(+ {' '.join(term(l) for l in row)})"
+            if card.lo == card.hi:
+                out.append(f"(assert (= {total} {card.lo}))")
+                continue
+            if card.lo > 0:
+                out.append(f"(assert (>= {total} {card.lo}))")
+            if card.hi < card.width:
+                out.append(f"(assert (<= {total} {card.hi}))")
+    if blocks:
+        all_names = names + aux_names
+        out.append(f"; lex-leader: {len(aux)} constraints")
+        out += [f"(declare-fun {name} () Bool)" for name in aux_names]
+        for block in blocks:
+            for row in block.tolist():
+                terms = " ".join(all_names[l - 1] if l > 0 else f"(not {all_names[-l - 1]})" for l in row)
+                out.append(f"(assert (or {terms}))")
+    out.append("(check-sat)")
+    out.append(f"(get-value ({' '.join(names)}))")
+    out.append("(exit)")
+    return "\n".join(out) + "\n"
+
+
+# ---- MiniZinc --------------------------------------------------------------
+
+def mzn_array(name, lits):
+    R, L = lits.shape
+    values = ", ".join(str(l) for l in lits.ravel().tolist())
+    return f"array[1..{R}, 1..{L}] of int: {name} = array2d(1..{R}, 1..{L}, [{values}]);"
+
+
+def to_mzn(model) -> str:
+    out = [
+        f"% STS n={model.n}, compiled from common/ir.py",
+        f"int: V = {model.num_vars};",
+        "array[1..V] of var bool: x;",
+        "function var int: lit(int: l) = if l > 0 then bool2int(x[l]) else 1 - bool2int(x[-l]) endif;",
+    ]
+    for name, lits in model.units:
+        out.append(f"% {name}")
+        out += [f"constraint x[{l}];" if l > 0 else f"constraint not x[{-l}];" for l in lits.tolist()]
+    for card in model.cards:
+        out.append(mzn_array(card.name, card.lits))
+        total = f"sum(k in 1..{card.width})(lit({card.name}[r, k]))"
+        if card.lo == card.hi:
+            body = f"{total} = {card.lo}"
+        else:
+            body = f"{total} >= {card.lo} /\\ {total} <= {card.hi}"
+        out.append(f"constraint forall(r in 1..{card.rows})({body});")
+    if model.lex:
+        out.insert(1, 'include "lex_lesseq.mzn";')
+
+        def vec(lits):
+            return ", ".join(f"x[{l}]" if l > 0 else f"not x[{-l}]" for l in lits.tolist())
+
+        for name, x, y in model.lex:
+            out.append(f"constraint lex_lesseq([{vec(x)}], [{vec(y)}]);  % {name}")
+
+    if model.home_lits is not None and "max_diff" not in model.options:
+        W = model.W
+        out.append(mzn_array("Home", model.home_lits))
+        out.append(f"var {fairness_lb(model.n)}..{W}: dev;")
+        out.append(f"constraint forall(t in 1..{model.n})(let {{ var int: h = sum(w in 1..{W})(lit(Home[t, w])) }} in "
+                   f"2 * h - {W} <= dev /\\ {W} - 2 * h <= dev);")
+        out.append("solve minimize dev;")
+    else:
+        out.append("solve satisfy;")
+    out.append('output [show([v | v in 1..V where fix(x[v])]), "\\n"];')
+    return "\n".join(out) + "\n"
+
+
+# ---- AMPL ------------------------------------------------------------------
+
+AMPL_MOD = """\
+# STS compiled from common/ir.py: every constraint is lo <= sum of literals <= hi
+param V integer > 0;
+var x {1..V} binary;
+
+set ROWS;
+param lo {ROWS} integer;
+param hi {ROWS} integer;
+set POS within {ROWS, 1..V};
+set NEG within {ROWS, 1..V};
+set FIX_TRUE within 1..V;
+set FIX_FALSE within 1..V;
+
+s.t. Card {r in ROWS}:
+    lo[r] <= sum {(r, v) in POS} x[v] + sum {(r, v) in NEG} (1 - x[v]) <= hi[r];
+s.t. FixTrue {v in FIX_TRUE}: x[v] = 1;
+s.t. FixFalse {v in FIX_FALSE}: x[v] = 0;
+"""
+
+AMPL_FAIRNESS = """
+param W integer;
+param F_LB default 0;
+set TEAMS;
+set HOME_POS within {TEAMS, 1..V};
+set HOME_NEG within {TEAMS, 1..V};
+var F >= F_LB integer;
+
+s.t. HomeDev {t in TEAMS}:
+    2 * (sum {(t, v) in HOME_POS} x[v] + sum {(t, v) in HOME_NEG} (1 - x[v])) - W <= F;
+s.t. AwayDev {t in TEAMS}:
+    W - 2 * (sum {(t, v) in HOME_POS} x[v] + sum {(t, v) in HOME_NEG} (1 - x[v])) <= F;
+
+minimize Fairness: F;
+"""
+
+
+def ampl_pairs(name, rows, lits):
+    pairs = " ".join(f"({r},{abs(l)})" for r, l in zip(rows, lits))
+    return f"set {name} := {pairs};"
+
+
+def to_ampl(model):
+    """
+    (mod, dat) text. Rows of all families are numbered 1.. in order.
+    """
+    objective = model.home_lits is not None and "max_diff" not in model.options
+    # lex-leader clauses are rows with lo = 1 over the auxiliaries after V
+    blocks, aux = lex_blocks(model)
+    rows = [(card.lits, card.lo, card.hi) for card in model.cards] + [(block, 1, block.shape[1]) for block in blocks]
+    dat = [f"param V := {model.num_vars + sum(k for _, k in aux)};"]
+    bounds, pos, neg = [], ([], []), ([], [])
+    row = 0
+    for card_lits, lo, hi in rows:
+        ids = np.arange(row + 1, row + len(card_lits) + 1)
+        row += len(card_lits)
+        bounds += [f"{r} {lo} {hi}" for r in ids.tolist()]
+        r = np.repeat(ids, card_lits.shape[1])
+        lits = card_lits.ravel()
+        pos[0].extend(r[lits > 0].tolist())
+        pos[1].extend(lits[lits > 0].tolist())
+        neg[0].extend(r[lits < 0].tolist())
+        neg[1].extend(lits[lits < 0].tolist())
+    dat.append(f"set ROWS := {' '.join(str(r) for r in range(1, row + 1))};")
+    dat.append("param: lo hi :=\n" + "\n".join(bounds) + ";")
+    dat.append(ampl_pairs("POS", *pos))
+    dat.append(ampl_pairs("NEG", *neg))
+    units = np.concatenate([lits for _, lits in model.units]) if model.units else np.zeros(0, dtype=np.int64)
+    dat.append(f"set FIX_TRUE := {' '.join(str(l) for l in units[units > 0].tolist())};")
+    dat.append(f"set FIX_FALSE := {' '.join(str(-l) for l in units[units < 0].tolist())};")
+
+    mod = AMPL_MOD
+    if objective:
+        mod += AMPL_FAIRNESS
+        teams = np.repeat(np.arange(1, model.n + 1), model.W)
+        lits = model.home_lits.ravel()
+        dat.append(f"param W := {model.W};")
+        dat.append(f"param F_LB := {fairness_lb(model.n)};")
+        dat.append(f"set TEAMS := {' '.join(str(t) for t in range(1, model.n + 1))};")
+        dat.append(ampl_pairs("HOME_POS", teams[lits > 0].tolist(), lits[lits > 0].tolist()))
+        dat.append(ampl_pairs("HOME_NEG", teams[lits < 0].tolist(), lits[lits < 0].tolist()))
+    return mod, "\n".join(dat) + "\n"
+
+
+# ---- emit / solve ----------------------------------------------------------
+
+def emit(model, target: str, out_dir, amo: str = "pairwise", amk: str = "subsets"):
+    """
+    Write the model for target into out_dir, returns the paths written.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = out_dir / f"sts_{model.n}"
+    if target == "cnf":
+        path = stem.with_suffix(".cnf")
+        to_cnf(model, amo, amk).write_dimacs(path)
+        return [path]
+    if target == "smt2":
+        path = stem.with_suffix(".smt2")
+        path.write_text(to_smt2(model), encoding="utf-8")
+        return [path]
+    if target == "mzn":
+        path = stem.with_suffix(".mzn")
+        path.write_text(to_mzn(model), encoding="utf-8")
+        return [path]
+    if target == "ampl":
+        mod, dat = to_ampl(model)
+        paths = [stem.with_suffix(".mod"), stem.with_suffix(".dat")]
+        paths[0].write_text(mod, encoding="utf-8")
+        paths[1].write_text(dat, encoding="utf-8")
+        return paths
+    raise ValueError(f"cannot emit target '{target}' (cnf, smt2, mzn, ampl)")
+
+
+def solve_cnf(model, time_limit, amo="pairwise", amk="subsets"):
+    from pysat.solvers import Glucose4
+
+    cnf = to_cnf(model, amo, amk)
+    with Glucose4(bootstrap_with=cnf.clauses()) as solver:
+        timer = threading.Timer(time_limit, solver.interrupt)
+        timer.start()
+        try:
+            res = solver.solve_limited(expect_interrupt=True)
+        finally:
+            timer.cancel()
+        if res is True:
+            return "sat", {abs(l): l > 0 for l in solver.get_model()}
+        return ("unsat" if res is False else "timeout"), None
+
+
+def z3_values(z3_model, xs):
+    from z3 import is_true
+
+    return {v: is_true(z3_model.evaluate(x, model_completion=True)) for v, x in enumerate(xs) if v > 0}
+
+
+def solve_z3(model, time_limit):
+    from z3 import sat, unsat
+
+    solver, xs = to_z3(model)
+    solver.set("timeout", int(time_limit * 1000))
+    res = solver.check()
+    if res == sat:
+        return "sat", z3_values(solver.model(), xs)
+    return ("unsat" if res == unsat else "timeout"), None
+
+
+def solve_smt2(model, time_limit):
+    # the SMT-LIB2 text read back by z3 (cvc5 / OpenSMT read the same file)
+    from z3 import Bool, Solver, sat, unsat
+
+    solver = Solver()
+    solver.from_string(to_smt2(model))
+    solver.set("timeout", int(time_limit * 1000))
+    res = solver.check()
+    if res == sat:
+        xs = [None] + [Bool(name) for name in model.var_names()]
+        return "sat", z3_values(solver.model(), xs)
+    return ("unsat" if res == unsat else "timeout"), None
+
+
+def solve_mzn(model, time_limit, solver="gecode"):
+    if shutil.which("minizinc") is None:
+        return "skipped", None
+    with tempfile.TemporaryDirectory() as tmp:
+        path = emit(model, "mzn", tmp)[0]
+        # minizinc stops at --time-limit, the wall limit only catches a hung flattening
+        r = run_command(["minizinc", "--solver", solver, "--time-limit", str(int(time_limit * 1000)), str(path)],
+                        wall_limit=time_limit + 30)
+    out = r.stdout.strip().splitlines()
+    if not out or not out[0].startswith("["):
+        return ("unsat" if "UNSATISFIABLE" in r.stdout else "timeout"), None
+    true_vars = [int(v) for v in out[0].strip("[]").split(",") if v.strip()]
+    return "sat", {v: True for v in true_vars}
+
+
+def solve_ampl(model, time_limit, solver="highs"):
+    try:
+        from amplpy import AMPL
+    except ImportError:
+        return "skipped", None
+    mod, dat = to_ampl(model)
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "m.mod").write_text(mod, encoding="utf-8")
+        Path(tmp, "m.dat").write_text(dat, encoding="utf-8")
+        ampl = AMPL()
+        try:
+            ampl.read(str(Path(tmp, "m.mod")))
+            ampl.readData(str(Path(tmp, "m.dat")))
+            ampl.setOption("solver", solver)
+            ampl.setOption(f"{solver}_options", f"timelim={int(time_limit)}")
+            ampl.solve()
+            if ampl.getValue("solve_result") != "solved":
+                return ampl.getValue("solve_result"), None
+            values = ampl.getVariable("x").getValues().to_dict()
+        finally:
+            ampl.close()
+    return "sat", {int(v): val > 0.5 for v, val in values.items()}
+
+
+SOLVERS = {"cnf": solve_cnf, "z3": solve_z3, "smt2": solve_smt2, "mzn": solve_mzn, "ampl": solve_ampl}
+
+
+def compile_size(model, target, amo, amk):
+    if target == "cnf":
+        cnf = to_cnf(model, amo, amk)
+        return f"{cnf.num_vars}v/{cnf.num_clauses}c"
+    if target == "z3":
+        solver, _ = to_z3(model)
+        return f"{len(solver.assertions())}a"
+    if target == "smt2":
+        return f"{len(to_smt2(model)) // 1024}KB"
+    if target == "mzn":
+        return f"{len(to_mzn(model)) // 1024}KB"
+    mod, dat = to_ampl(model)
+    return f"{(len(mod) + len(dat)) // 1024}KB"
+
+
+def check(model, values):
+    from fast_checker import check_solution
+
+    sol = model.decode(values).tolist()
+    obj = max_deviation(sol) if model.home_lits is not None else None
+    return check_solution(sol, obj, 0, True) == "Valid solution", obj
+
+
+def bench(ns, targets, implied_sets, amos, amks, time_limit, sym=True, max_diff=None):
+    rows = []
+    for n in ns:
+        for implied in implied_sets:
+            t0 = time.perf_counter()
+            model = build(n, sym=sym, implied=implied, fairness=max_diff is not None)
+            if max_diff is not None:
+                model = model.with_max_diff(max_diff)
+            t_build = time.perf_counter() - t0
+            for target in targets:
+                variants = [(a, k) for a in amos for k in amks] if target == "cnf" else [("-", "-")]
+                for amo, amk in variants:
+                    t0 = time.perf_counter()
+                    size = compile_size(model, target, amo, amk)
+                    t_compile = time.perf_counter() - t0
+                    t0 = time.perf_counter()
+                    if target == "cnf":
+                        status, values = solve_cnf(model, time_limit, amo, amk)
+                    else:
+                        status, values = SOLVERS[target](model, time_limit)
+                    t_solve = time.perf_counter() - t0
+                    valid, obj = check(model, values) if status == "sat" else (None, None)
+                    rows.append((n, ",".join(implied) or "-", target, amo, amk, t_build, t_compile, size,
+                                 status, t_solve, valid, obj))
+                    print(f"n={n:<3} implied={rows[-1][1]:<13} {target:<5} amo={amo:<8} amk={amk:<7} "
+                          f"build={t_build * 1000:7.1f}ms compile={t_compile * 1000:8.1f}ms {size:<14} "
+                          f"{status:<8} solve={t_solve:7.3f}s valid={valid} obj={obj}")
+    return rows
+
+
+def parse_implied(spec: str):
+    return tuple(s for s in spec.split(",") if s and s != "-")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the shared STS model (common/ir.py) to every solver family.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def model_args(p):
+        p.add_argument("--implied", type=str, default="lower", help="comma-separated: lower,window ('-' for none)")
+        p.add_argument("--no-sym", action="store_true", help="do not freeze week 0")
+        p.add_argument("--max_diff", type=int, default=None, help="add home/away fairness |home - away| <= D")
+        p.add_argument("--fairness", action="store_true", help="fairness as objective (MiniZinc / AMPL)")
+
+    p_stats = sub.add_parser("stats", help="size of the model and of each compiled target")
+    p_stats.add_argument("-n", type=int, nargs="+", default=[12])
+    model_args(p_stats)
+
+    p_emit = sub.add_parser("emit", help="write the compiled model files")
+    p_emit.add_argument("-n", type=int, nargs="+", default=[12])
+    p_emit.add_argument("--targets", nargs="+", default=["cnf", "smt2", "mzn", "ampl"],
+                        choices=["cnf", "smt2", "mzn", "ampl"])
+    p_emit.add_argument("--amo", default="pairwise", choices=["pairwise", "seq"])
+    p_emit.add_argument("--amk", default="subsets", choices=["subsets", "seq"])
+    p_emit.add_argument("-o", "--out_dir", default="res/IR")
+    model_args(p_emit)
+
+    p_bench = sub.add_parser("bench", help="build, compile and solve on every available target")
+    p_bench.add_argument("-n", type=int, nargs="+", default=[8, 10, 12])
+    p_bench.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    p_bench.add_argument("--implied", nargs="+", default=["lower"], help="implied sets to compare, e.g. - lower lower,window")
+    p_bench.add_argument("--amo", nargs="+", default=["pairwise"], choices=["pairwise", "seq"])
+    p_bench.add_argument("--amk", nargs="+", default=["subsets"], choices=["subsets", "seq"])
+    p_bench.add_argument("--no-sym", action="store_true")
+    p_bench.add_argument("--max_diff", type=int, default=None)
+    p_bench.add_argument("--time_limit", type=float, default=60)
+
+    args = parser.parse_args()
+    if args.command == "bench":
+        bench(args.n, args.targets, [parse_implied(s) for s in args.implied], args.amo, args.amk,
+              args.time_limit, sym=not args.no_sym, max_diff=args.max_diff)
+        return
+
+    for n in args.n:
+        model = build(n, sym=not args.no_sym, implied=parse_implied(args.implied),
+                      fairness=args.fairness or args.max_diff is not None)
+        if args.max_diff is not None:
+            model = model.with_max_diff(args.max_diff)
+        if args.command == "stats":
+            print(f"n={n} {model.stats()}")
+            for card in model.cards:
+                print(f"  {card}")
+            for target in TARGETS:
+                print(f"  {target:<5} {compile_size(model, target, 'pairwise', 'subsets')}")
+        else:
+            for target in args.targets:
+                for path in emit(model, target, args.out_dir, args.amo, args.amk):
+                    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Compact columnar encoding of the whole res/ tree.
+
+The JSON result files put every team number of every `sol` on its own
+line (indent=2), so loading many results is mostly JSON parsing. Here
+all entries of res/<APP>/{n}.json go into one .npz with one row per
+(app, n, approach):
+
+    app, approach         str
+    n, time               int
+    optimal               bool
+    obj, obj_kind         float64 + 0 None / 1 int / 2 float (1 and 1.0 both occur)
+    periods, weeks        shape of sol (0 x 0 for an empty sol)
+    offset                start of the row's schedule in `teams`
+    teams                 all schedules, flattened P x W x 2, uint8 (uint16 if n > 255)
+    raw                   the entry as JSON if it does not fit the columns above, else ""
+
+solution(cols, i) is a P x W x 2 view into `teams`, no parsing at all.
+The encoding is lossless: unpack writes back the same JSON files (same
+entry order, same int/float obj), which `verify` checks byte for byte.
+
+    python source/common/packed.py pack res -o res/results.npz
+    python source/common/packed.py unpack res/results.npz out_res
+    python source/common/packed.py verify res
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.store import RES_DIR, read_json, write_json_atomic
+
+FIELDS = ("time", "optimal", "obj", "sol")
+OBJ_NONE, OBJ_INT, OBJ_FLOAT = 0, 1, 2
+
+
+def team_dtype(max_team: int):
+    return np.uint8 if max_team <= np.iinfo(np.uint8).max else np.uint16
+
+
+def pack_solution(sol):
+    """
+    P x W x 2 array of a checker-format schedule (uint8 or uint16).
+    Returns None if sol is not a regular P x W matrix of [int, int].
+    """
+    if type(sol) != list:
+        return None
+    if len(sol) == 0:
+        return np.zeros((0, 0, 2), dtype=np.uint8)
+    width = len(sol[0]) if type(sol[0]) == list else -1
+    for row in sol:
+        if type(row) != list or len(row) != width:
+            return None
+        for match in row:
+            if type(match) != list or len(match) != 2 or type(match[0]) != int or type(match[1]) != int:
+                return None
+    arr = np.array(sol, dtype=np.int64).reshape(len(sol), width, 2)
+    if arr.size and (arr.min() < 0 or arr.max() > np.iinfo(np.uint16).max):
+        return None
+    return arr.astype(team_dtype(int(arr.max()) if arr.size else 0))
+
+
+def unpack_solution(arr):
+    return arr.astype(np.int64).tolist()
+
+
+def packable(entry):
+    return (type(entry) == dict and tuple(sorted(entry)) == tuple(sorted(FIELDS))
+            and type(entry["time"]) == int and type(entry["optimal"]) == bool
+            and (entry["obj"] is None or type(entry["obj"]) in (int, float))
+            and pack_solution(entry["sol"]) is not None)
+
+
+def pack_results(res_dir=RES_DIR):
+    """
+    Columns (dict of arrays) for every entry of res_dir/<APP>/{n}.json.
+    """
+    rows = []
+    for json_path in sorted(Path(res_dir).glob("*/*.json")):
+        if not json_path.stem.isdigit():
+            continue
+        for approach, entry in read_json(json_path).items():
+            rows.append((json_path.parent.name, int(json_path.stem), approach, entry))
+
+    count = len(rows)
+    cols = {
+        "app": np.array([r[0] for r in rows], dtype=str),
+        "n": np.array([r[1] for r in rows], dtype=np.int32),
+        "approach": np.array([r[2] for r in rows], dtype=str),
+        "time": np.zeros(count, dtype=np.int64),
+        "optimal": np.zeros(count, dtype=bool),
+        "obj": np.full(count, np.nan),
+        "obj_kind": np.zeros(count, dtype=np.uint8),
+        "periods": np.zeros(count, dtype=np.int32),
+        "weeks": np.zeros(count, dtype=np.int32),
+        "offset": np.zeros(count, dtype=np.int64),
+    }
+    raw = [""] * count
+    chunks = []
+    size = 0
+
+    for i, (_, _, _, entry) in enumerate(rows):
+        cols["offset"][i] = size
+        if not packable(entry):
+            raw[i] = json.dumps(entry)
+            continue
+        cols["time"][i] = entry["time"]
+        cols["optimal"][i] = entry["optimal"]
+        obj = entry["obj"]
+        if obj is not None:
+            cols["obj"][i] = obj
+            cols["obj_kind"][i] = OBJ_INT if type(obj) == int else OBJ_FLOAT
+        arr = pack_solution(entry["sol"])
+        cols["periods"][i], cols["weeks"][i] = arr.shape[0], arr.shape[1]
+        chunks.append(arr.ravel())
+        size += arr.size
+
+    max_team = max((int(c.max()) for c in chunks if c.size), default=0)
+    cols["teams"] = (np.concatenate(chunks) if chunks else np.zeros(0)).astype(team_dtype(max_team))
+    cols["raw"] = np.array(raw, dtype=str)
+    return cols
+
+
+def save_npz(cols, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **cols)
+
+
+def load_npz(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def solution(cols, i):
+    """
+    Schedule of row i as a P x W x 2 view into cols["teams"].
+    """
+    P, W = int(cols["periods"][i]), int(cols["weeks"][i])
+    start = int(cols["offset"][i])
+    return cols["teams"][start:start + P * W * 2].reshape(P, W, 2)
+
+
+def entry(cols, i):
+    """
+    Row i as the JSON entry it was packed from.
+    """
+    if cols["raw"][i]:
+        return json.loads(str(cols["raw"][i]))
+    kind = int(cols["obj_kind"][i])
+    obj = None if kind == OBJ_NONE else int(cols["obj"][i]) if kind == OBJ_INT else float(cols["obj"][i])
+    return {
+        "time": int(cols["time"][i]),
+        "optimal": bool(cols["optimal"][i]),
+        "obj": obj,
+        "sol": unpack_solution(solution(cols, i)),
+    }
+
+
+def to_result_files(cols):
+    """
+    {(app, n): {approach: entry}} in packing order.
+    """
+    files = {}
+    for i in range(len(cols["app"])):
+        key = (str(cols["app"][i]), int(cols["n"][i]))
+        files.setdefault(key, {})[str(cols["approach"][i])] = entry(cols, i)
+    return files
+
+
+def unpack_results(cols, res_dir):
+    written = []
+    for (app, n), data in to_result_files(cols).items():
+        json_path = Path(res_dir) / app / f"{n}.json"
+        write_json_atomic(json_path, data)
+        written.append(json_path)
+    return written
+
+
+def verify(res_dir=RES_DIR):
+    """
+    Pack res_dir, unpack in memory and compare with the files as they
+    would be written (json indent=2). Returns the list of mismatching files.
+    """
+    cols = pack_results(res_dir)
+    bad = []
+    for (app, n), data in to_result_files(cols).items():
+        json_path = Path(res_dir) / app / f"{n}.json"
+        if json.dumps(read_json(json_path), indent=2) != json.dumps(data, indent=2):
+            bad.append(json_path)
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack res/ into a columnar .npz and back.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_pack = sub.add_parser("pack", help="res/<APP>/{n}.json -> .npz")
+    p_pack.add_argument("res_dir", nargs="?", default=str(RES_DIR))
+    p_pack.add_argument("-o", "--output", default=str(RES_DIR / "results.npz"))
+
+    p_unpack = sub.add_parser("unpack", help=".npz -> res/<APP>/{n}.json")
+    p_unpack.add_argument("npz")
+    p_unpack.add_argument("res_dir", nargs="?", default=str(RES_DIR))
+
+    p_verify = sub.add_parser("verify", help="check the round trip of every result file")
+    p_verify.add_argument("res_dir", nargs="?", default=str(RES_DIR))
+
+    args = parser.parse_args()
+    if args.command == "pack":
+        cols = pack_results(args.res_dir)
+        save_npz(cols, args.output)
+        print(f"Packed {len(cols['app'])} entries into {args.output}")
+    elif args.command == "unpack":
+        written = unpack_results(load_npz(args.npz), args.res_dir)
+        print(f"Wrote {len(written)} files under {args.res_dir}")
+    else:
+        bad = verify(args.res_dir)
+        for json_path in bad:
+            print(f"Round trip differs: {json_path}")
+        print("Round trip OK" if not bad else f"{len(bad)} files differ")
+        sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+"""
+Portfolio of round-robin pairings (1-factorizations of K_n).
+
+Every approach fixes the weekly pairings first and only assigns periods,
+and whether (and how fast) a period assignment is found depends on the
+1-factorization. Besides the circle method this module generates
+
+    circle      circle method (common/tournament.py, the default)
+    berger      Berger tables (circle rounds in Berger order, fixed team alternating sides)
+    greedy      week by week, each week the first perfect matching in team
+                order on the pairs left (backtracking over weeks)
+    <seed>      random 1-factorization: Dinitz-Stinson hill-climbing (with Kempe
+                swaps) from that seed
+    file.json   weeks from a file: {"weeks": [[[a, b], ...], ...]} or the bare list
+
+load_pairing(n, spec) returns a common.tournament.Tournament, which
+every encoder takes as `pairing`; runners expose it as --pairing and
+suffix their result keys with _pair<spec> for anything but circle.
+
+Period assignment does not care about team names or week order, so two
+factorizations that differ only by those are the same instance.
+canonical_id() is an exact certificate for that equivalence: vertices
+are labelled by individualize-and-refine (pick a, b; close the labelling
+under "partner of a labelled team in the colour of a labelled edge at
+a"; branch on the next vertex when it stalls) and the smallest partner
+sequence over all branches is hashed. The sequence is compared while it
+is built, so most branches stop after a few entries. portfolio() keeps
+one pairing per class (Berger, for instance, is the circle method in
+another week order and is dropped).
+
+Generated pairings and their ids are cached in res/pairings/{n}/<spec>.json.
+
+    python source/common/pairings.py list -n 16 -k 8
+    python source/common/pairings.py race -n 16 -k 8 --backend sat --time_limit 60
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import queue
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.tournament import Tournament, tournament
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = ROOT / "res" / "pairings"
+
+NAMED = ("circle", "berger", "greedy")
+
+
+def berger(n: int):
+    """
+    Berger tables: round k is the first round with every rotating team
+    shifted by k * n/2 (mod n-1); the fixed team n changes side each round.
+    """
+    W, half = n - 1, n // 2
+    base = [(i, n - 1 - i) for i in range(1, half)]
+    weeks = []
+    for k in range(W):
+        shift = k * half
+
+        def rot(t):
+            return (t - 1 + shift) % W + 1
+
+        fixed = (rot(W), n) if k % 2 == 0 else (n, rot(W))
+        weeks.append([fixed] + [(rot(a), rot(b)) for a, b in base])
+    return weeks
+
+
+def greedy(n: int, node_limit: int = 2_000_000):
+    """
+    Week by week, the lexicographically first perfect matching of the
+    pairs not used yet (lowest free team takes the lowest free opponent),
+    backtracking into earlier weeks when a week cannot be completed.
+    Returns None if node_limit search nodes do not suffice.
+    """
+    W = n - 1
+    used = [[False] * (n + 1) for _ in range(n + 1)]
+    weeks = []
+    nodes = 0
+
+    def matchings(free):
+        # perfect matchings of the free teams on unused pairs, in lexicographic order
+        nonlocal nodes
+        if not free:
+            yield []
+            return
+        a = free[0]
+        for i in range(1, len(free)):
+            b = free[i]
+            nodes += 1
+            if nodes > node_limit:
+                return
+            if used[a][b]:
+                continue
+            for rest in matchings(free[1:i] + free[i + 1:]):
+                yield [(a, b)] + rest
+
+    def extend():
+        if len(weeks) == W:
+            return True
+        for week in matchings(list(range(1, n + 1))):
+            for a, b in week:
+                used[a][b] = used[b][a] = True
+            weeks.append(week)
+            if extend():
+                return True
+            weeks.pop()
+            for a, b in week:
+                used[a][b] = used[b][a] = False
+            if nodes > node_limit:
+                return False
+        return False
+
+    return weeks if extend() else None
+
+
+def random_factorization(n: int, seed: int, kempe: float = 0.05):
+    """
+    Dinitz-Stinson hill-climbing: colour the edges of K_n with W colours
+    so that every colour class is a matching. A step takes a team v
+    missing colour c and a random uncoloured edge vu; if u also misses c
+    the edge gets c, otherwise u's c-edge uw is uncoloured first, so the
+    number of coloured edges never decreases. With probability `kempe` a
+    step instead swaps c and a random d along the c/d path from v: plain
+    hill-climbing can cycle forever once every uncoloured edge joins a
+    team missing c to one missing d. Ends with a 1-factorization
+    (colour class = week).
+    """
+    rng = random.Random(seed)
+    W = n - 1
+    partner = [[0] * W for _ in range(n + 1)]      # partner[v][c], 0 = none
+    missing = [set(range(W)) for _ in range(n + 1)]
+    uncoloured = [set(u for u in range(1, n + 1) if u != v) for v in range(n + 1)]
+    deficient = set(range(1, n + 1))
+    left = n * W // 2
+
+    while left:
+        v = rng.choice(sorted(deficient))
+        c = rng.choice(sorted(missing[v]))
+
+        if rng.random() < kempe:
+            d = rng.choice([k for k in range(W) if k != c])
+            path, col = [v], d
+            while partner[path[-1]][col]:
+                path.append(partner[path[-1]][col])
+                col = c if col == d else d
+            edges = [(x, y, d if i % 2 == 0 else c) for i, (x, y) in enumerate(zip(path, path[1:]))]
+            for x, y, k in edges:
+                partner[x][k] = partner[y][k] = 0
+            for x, y, k in edges:
+                k = c if k == d else d
+                partner[x][k], partner[y][k] = y, x
+            for x in (path[0], path[-1]):
+                missing[x] = {k for k in range(W) if not partner[x][k]}
+            continue
+
+        u = rng.choice(sorted(uncoloured[v]))
+        w = partner[u][c]
+        if w:
+            partner[u][c] = partner[w][c] = 0
+            missing[u].add(c)
+            missing[w].add(c)
+            uncoloured[u].add(w)
+            uncoloured[w].add(u)
+            deficient.add(w)
+            left += 1
+        partner[v][c], partner[u][c] = u, v
+        missing[v].discard(c)
+        missing[u].discard(c)
+        uncoloured[v].discard(u)
+        uncoloured[u].discard(v)
+        for t in (u, v):
+            if not missing[t]:
+                deficient.discard(t)
+        left -= 1
+
+    return [sorted((v, partner[v][c]) for v in range(1, n + 1) if v < partner[v][c]) for c in range(W)]
+
+
+def canonical_id(n: int, weeks) -> str:
+    """
+    Hash of the canonical partner sequence: equal for two pairings iff
+    they are the same up to renaming teams and reordering weeks.
+    """
+    W = n - 1
+    colour = [[-1] * n for _ in range(n)]          # colour[u][v], teams 0-based
+    partner = [[0] * n for _ in range(W)]          # partner[c][v]
+    for c, week in enumerate(weeks):
+        for a, b in week:
+            colour[a - 1][b - 1] = colour[b - 1][a - 1] = c
+            partner[c][a - 1], partner[c][b - 1] = b - 1, a - 1
+
+    best = []
+
+    def search(order, label, code, pos, shell):
+        """
+        Continue the closure from `shell` on. While `tied` the code
+        built so far equals the best code's prefix and every new entry is
+        compared; once smaller nothing is compared until the end.
+        """
+        nonlocal best
+        if best and code[:pos] > best[:pos]:
+            return
+        tied = bool(best) and code[:pos] == best[:pos]
+        a = order[0]
+        s = shell
+        while s < len(order):
+            # pairs (i, j) with max(i, j) == s: (0..s, s), then (s, 1..s-1); j >= 1 names colour(a, order[j])
+            pairs = [(i, s) for i in range(s + 1)] + [(s, j) for j in range(1, s)] if s >= 1 else []
+            for i, j in pairs:
+                p = partner[colour[a][order[j]]][order[i]]
+                if p not in label:
+                    label[p] = len(order)
+                    order.append(p)
+                value = label[p]
+                if tied:
+                    if value > best[pos]:
+                        return
+                    if value < best[pos]:
+                        tied = False
+                code.append(value)
+                pos += 1
+            s += 1
+            if s == len(order) and len(order) < n:
+                # stalled: branch on every unlabelled team as the next label
+                for v in range(n):
+                    if v in label:
+                        continue
+                    search(order + [v], {**label, v: len(order)}, list(code), pos, s)
+                return
+        if tied and pos == len(best):
+            return
+        best = code
+
+    for a in range(n):
+        for b in range(n):
+            if b != a:
+                search([a, b], {a: 0, b: 1}, [], 0, 1)
+
+    return hashlib.sha1(",".join(map(str, best)).encode()).hexdigest()[:16]
+
+
+def generate(n: int, spec: str):
+    """
+    Weeks (list of lists of (a, b)) for a pairing spec.
+    """
+    if spec == "circle":
+        return tournament(n).weeks(sorted_pairs=True)
+    if spec == "berger":
+        return berger(n)
+    if spec == "greedy":
+        weeks = greedy(n)
+        if weeks is None:
+            raise ValueError(f"greedy pairing not found for n={n}")
+        return weeks
+    if spec.lstrip("-").isdigit():
+        return random_factorization(n, int(spec))
+    path = Path(spec)
+    if path.suffix == ".json" and path.exists():
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data["weeks"] if isinstance(data, dict) else data
+    raise ValueError(f"unknown pairing '{spec}' (circle, berger, greedy, an integer seed or file.json)")
+
+
+def cache_path(n: int, spec: str) -> Path:
+    name = Path(spec).stem if spec.endswith(".json") else spec
+    return CACHE_DIR / str(n) / f"{name}.json"
+
+
+def cached(n: int, spec: str, with_id: bool = False):
+    """
+    {"spec", "weeks", "id"} from the disk cache, generated on a miss. The
+    canonical id is only computed when asked for (it is the costly part).
+    """
+    path = cache_path(n, spec)
+    entry = None
+    if path.exists():
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            entry = None
+    changed = entry is None
+    if changed:
+        entry = {"spec": spec, "weeks": [[list(pair) for pair in week] for week in generate(n, spec)], "id": None}
+    if with_id and entry.get("id") is None:
+        entry["id"] = canonical_id(n, entry["weeks"])
+        changed = True
+    if changed:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(entry), encoding="utf-8")
+    return entry
+
+
+def load_pairing(n: int, spec: str = "circle") -> Tournament:
+    if spec in (None, "", "circle"):
+        return tournament(n)
+    return Tournament(n, [[tuple(pair) for pair in week] for week in cached(n, spec)["weeks"]])
+
+
+def pairing_suffix(spec: str) -> str:
+    """
+    Result-key suffix for a pairing spec ("" for the circle method).
+    """
+    if spec in (None, "", "circle"):
+        return ""
+    return "_pair" + (Path(spec).stem if spec.endswith(".json") else spec)
+
+
+def portfolio(n: int, k: int, seeds=None):
+    """
+    Up to k pairwise non-isomorphic pairing specs: circle, berger,
+    greedy, then random seeds 0, 1, ... Returns [(spec, id)].
+    """
+    candidates = list(NAMED) + [str(s) for s in (seeds if seeds is not None else range(4 * k))]
+    chosen, seen = [], set()
+    for spec in candidates:
+        if len(chosen) >= k:
+            break
+        try:
+            entry = cached(n, spec, with_id=True)
+        except ValueError as e:
+            print(f"  {spec}: {e}")
+            continue
+        if entry["id"] in seen:
+            continue
+        seen.add(entry["id"])
+        chosen.append((spec, entry["id"]))
+    return chosen
+
+
+# ---- racing --------------------------------------------------------------
+
+def solve_sat(n, pairing, time_limit):
+    """
+    SAT/sat_dimacs.py encoding (week 0 frozen) solved by pysat's Glucose 4.
+    """
+    import threading
+    sys.path.insert(0, str(ROOT / "source" / "SAT"))
+    import sat_dimacs
+    from pysat.solvers import Glucose4
+
+    sat_dimacs.build_dimacs(n, use_sym=True, pairing=pairing)
+    W, P = n - 1, n // 2
+    with Glucose4(bootstrap_with=sat_dimacs.clauses) as solver:
+        timer = threading.Timer(time_limit, solver.interrupt)
+        timer.start()
+        try:
+            res = solver.solve_limited(expect_interrupt=True)
+        finally:
+            timer.cancel()
+        if res is not True:
+            return ("unsat" if res is False else "timeout"), None
+        true = {lit for lit in solver.get_model() if lit > 0}
+    var = sat_dimacs.var_index
+    return "sat", [[next(p for p in range(P) if var[f"X_{w}_{m}_{p}"] in true) for m in range(P)]
+                   for w in range(W)]
+
+
+def solve_bt(n, pairing, time_limit):
+    sys.path.insert(0, str(ROOT / "source" / "BT"))
+    from bt_search import solve
+
+    status, per, _ = solve(n, pairing.weeks(), use_sym=True, time_limit=time_limit)
+    return status, per
+
+
+BACKENDS = {
+    "sat": solve_sat,
+    "bt": solve_bt,
+}
+
+
+def race_worker(n, spec, backend, time_limit, results):
+    start = time.perf_counter()
+    pairing = load_pairing(n, spec)
+    status, per = BACKENDS[backend](n, pairing, time_limit)
+    results.put((spec, status, time.perf_counter() - start, per))
+
+
+def race(n: int, specs, backend: str = "sat", time_limit: float = 300, workers: int = None):
+    """
+    Solve the same instance under several pairings in parallel (at most
+    `workers` at a time); the first schedule found stops the others.
+    Returns (winner spec or None, per, [(spec, status, seconds)]).
+    """
+    workers = workers or mp.cpu_count() or 1
+    for spec in specs:
+        cached(n, spec)      # generate in the parent, workers only read the cache
+
+    results = mp.Queue()
+    pending = list(specs)
+    running = {}
+    report = []
+    winner, per = None, None
+    deadline = time.time() + time_limit
+
+    def launch():
+        while pending and len(running) < workers:
+            spec = pending.pop(0)
+            proc = mp.Process(target=race_worker,
+                              args=(n, spec, backend, max(deadline - time.time(), 0.1), results))
+            proc.start()
+            running[spec] = proc
+
+    launch()
+    while running and winner is None and time.time() < deadline + 5:
+        try:
+            spec, status, seconds, sol_per = results.get(timeout=0.2)
+        except queue.Empty:
+            for spec, proc in list(running.items()):
+                if not proc.is_alive():
+                    # died without reporting (e.g. out of memory)
+                    running.pop(spec)
+                    report.append((spec, "error", None))
+            launch()
+            continue
+        running.pop(spec).join()
+        report.append((spec, status, seconds))
+        if status == "sat":
+            winner, per = spec, sol_per
+        else:
+            launch()
+
+    for spec, proc in running.items():
+        proc.kill()
+        proc.join()
+        report.append((spec, "stopped", None))
+    return winner, per, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate, deduplicate and race round-robin pairings.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list", help="non-isomorphic portfolio with canonical ids")
+    p_list.add_argument("-n", type=int, required=True)
+    p_list.add_argument("-k", type=int, default=8)
+
+    p_race = sub.add_parser("race", help="solve under k pairings in parallel, first schedule wins")
+    p_race.add_argument("-n", type=int, required=True)
+    p_race.add_argument("-k", type=int, default=8)
+    p_race.add_argument("--specs", nargs="+", default=None, help="race these pairings instead of the portfolio")
+    p_race.add_argument("--backend", choices=list(BACKENDS), default="sat")
+    p_race.add_argument("--time_limit", type=float, default=300)
+    p_race.add_argument("--workers", type=int, default=mp.cpu_count() or 1)
+
+    args = parser.parse_args()
+    if args.command == "list":
+        for spec, pid in portfolio(args.n, args.k):
+            print(f"{spec:>8}  {pid}")
+        return
+
+    specs = args.specs or [spec for spec, _ in portfolio(args.n, args.k)]
+    winner, _, report = race(args.n, specs, args.backend, args.time_limit, args.workers)
+    for spec, status, seconds in report:
+        print(f"{spec:>8}  {status:<8} {'' if seconds is None else f'{seconds:.3f}s'}")
+    print(f"winner: {winner}  (use --pairing {winner})" if winner else "no pairing solved in time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Asyncio manager for external solver processes (glucose, cvc5, OpenSMT,
+minizinc, cbc).
+
+subprocess.run(..., timeout=...) kills only the direct child, reads the
+output once it exits and says nothing about CPU time. run_process()
+instead:
+
+  - starts the command in its own session (process group), so a kill
+    reaches the solver and anything it spawned;
+  - streams stdout line by line (on_line(line) may return True to stop
+    the process early) and collects stderr next to it;
+  - enforces a wall deadline and a CPU deadline (RLIMIT_CPU in the child,
+    plus a watchdog on the group leader's CPU time from /proc);
+  - measures wall, user and sys seconds (solver and its waited-for
+    children): the RUSAGE_CHILDREN delta when it ran alone, the last
+    /proc sample when other processes overlapped it;
+  - turns task cancellation into a group kill, so race_processes() can
+    stop the other jobs once one has answered.
+
+Every call returns a ProcResult; run_command() and race_commands() are
+the blocking wrappers used by the runners.
+
+    res = run_command(["glucose", "-model", "f.cnf"], wall_limit=300)
+    res.status, res.returncode, res.wall, res.user, res.sys
+"""
+
+import asyncio
+import os
+import resource
+import signal
+import time
+
+POLL = 0.05
+
+# flags of the processes running now: [True] once another one overlapped
+_active = {}
+
+try:
+    TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    TICKS = 100
+
+
+class ProcResult:
+    """
+    status: "exit" (finished on its own), "stopped" (on_line asked to
+    stop), "timeout" (wall deadline), "cpu" (CPU deadline) or "cancelled".
+    """
+
+    __slots__ = ("cmd", "status", "returncode", "stdout", "stderr", "wall", "user", "sys")
+
+    def __init__(self, cmd, status, returncode, stdout, stderr, wall, user, sys):
+        self.cmd = cmd
+        self.status = status
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.wall = wall
+        self.user = user
+        self.sys = sys
+
+    @property
+    def timed_out(self) -> bool:
+        return self.status in ("timeout", "cpu")
+
+    @property
+    def cpu(self) -> float:
+        return self.user + self.sys
+
+    def __repr__(self):
+        return (f"ProcResult({self.cmd[0]}, {self.status}, rc={self.returncode}, "
+                f"wall={self.wall:.3f}s, user={self.user:.3f}s, sys={self.sys:.3f}s)")
+
+
+def proc_times(pid: int):
+    """
+    (user, sys) seconds of pid and its waited-for children from
+    /proc/<pid>/stat, None when unavailable (not Linux, already reaped).
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # the command name (field 2) may contain spaces: split after its ')'
+    fields = stat[stat.rindex(b")") + 2:].split()
+    utime, stime, cutime, cstime = (int(x) for x in fields[11:15])
+    return (utime + cutime) / TICKS, (stime + cstime) / TICKS
+
+
+def kill_group(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def cpu_rlimit(cpu_limit):
+    if cpu_limit is None:
+        return None
+    seconds = max(1, int(cpu_limit + 0.999))
+
+    def limit():
+        # SIGXCPU at the soft limit, SIGKILL one second later
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+    return limit
+
+
+async def run_process(cmd, wall_limit=None, cpu_limit=None, on_line=None, cwd=None) -> ProcResult:
+    """
+    Run cmd (a list) under the deadlines; see the module docstring.
+    FileNotFoundError propagates when the executable is missing.
+    """
+    cmd = [str(c) for c in cmd]
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        start_new_session=True, preexec_fn=cpu_rlimit(cpu_limit),
+    )
+    shared = [bool(_active)]
+    for flag in _active.values():
+        flag[0] = True
+    _active[proc.pid] = shared
+    out, err = [], []
+    status = None
+    sampled = (0.0, 0.0)
+
+    async def read_stdout():
+        nonlocal status
+        async for raw in proc.stdout:
+            line = raw.decode(errors="replace")
+            out.append(line)
+            if on_line is not None and on_line(line) and status is None:
+                status = "stopped"
+                kill_group(proc)
+
+    async def read_stderr():
+        err.append((await proc.stderr.read()).decode(errors="replace"))
+
+    async def watchdog():
+        nonlocal status, sampled
+        while True:
+            await asyncio.sleep(POLL)
+            times = proc_times(proc.pid)
+            if times is not None:
+                sampled = times
+            if status is None and wall_limit is not None and time.perf_counter() - start >= wall_limit:
+                status = "timeout"
+            elif status is None and cpu_limit is not None and sum(sampled) >= cpu_limit:
+                status = "cpu"
+            else:
+                continue
+            kill_group(proc)
+
+    watch = asyncio.ensure_future(watchdog())
+    try:
+        await asyncio.gather(read_stdout(), read_stderr())
+        returncode = await proc.wait()
+    except asyncio.CancelledError:
+        status = "cancelled"
+        kill_group(proc)
+        returncode = await proc.wait()
+    finally:
+        watch.cancel()
+        # no orphans left in the group (solvers that fork helpers)
+        kill_group(proc)
+        _active.pop(proc.pid, None)
+
+    wall = time.perf_counter() - start
+    if status is None:
+        # RLIMIT_CPU fired before the watchdog noticed
+        hit = cpu_limit is not None and (returncode == -signal.SIGXCPU or
+                                         (returncode == -signal.SIGKILL and sum(sampled) >= cpu_limit - 1))
+        status = "cpu" if hit else "exit"
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    user, sys_ = after.ru_utime - before.ru_utime, after.ru_stime - before.ru_stime
+    if shared[0] and sum(sampled) > 0:
+        # the delta also holds the overlapping processes, /proc is per process
+        user, sys_ = sampled
+    return ProcResult(cmd, status, returncode, "".join(out), "".join(err), wall, user, sys_)
+
+
+async def race_processes(cmds, done, wall_limit=None, cpu_limit=None):
+    """
+    Run every command concurrently; as soon as one result satisfies
+    done(result) the others are cancelled (group kill). Returns the
+    results in the order of cmds.
+    """
+    tasks = [asyncio.ensure_future(run_process(cmd, wall_limit, cpu_limit)) for cmd in cmds]
+    pending = set(tasks)
+    while pending:
+        finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        if any(not t.cancelled() and t.exception() is None and done(t.result()) for t in finished):
+            for t in pending:
+                t.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            break
+    results = []
+    for cmd, t in zip(cmds, tasks):
+        if t.cancelled():
+            results.append(ProcResult([str(c) for c in cmd], "cancelled", None, "", "", 0.0, 0.0, 0.0))
+        elif t.exception() is not None:
+            raise t.exception()
+        else:
+            results.append(t.result())
+    return results
+
+
+def run_command(cmd, wall_limit=None, cpu_limit=None, on_line=None, cwd=None) -> ProcResult:
+    return asyncio.run(run_process(cmd, wall_limit, cpu_limit, on_line, cwd))
+
+
+def race_commands(cmds, done, wall_limit=None, cpu_limit=None):
+    return asyncio.run(race_processes(cmds, done, wall_limit, cpu_limit))
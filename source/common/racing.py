@@ -0,0 +1,93 @@
+"""
+Successive-halving race of solver configurations and the per-n profile.
+
+The SAT and SMT runners have knobs that only pay off for some n (frozen
+anchor week, team-1 pins, symmetry breaking, backend). --autotune races
+a grid of them with successive_halving(): every configuration gets a
+short budget, the better half (1 / eta) survives to a budget eta times
+longer, until one is left or max_budget is reached. Unsolved runs rank
+after solved ones, solved runs by wall time.
+
+The winner per (approach, n) is stored in res/<APP>/tuning/config_profile.json
+(same layout as CP's search_profile.json):
+
+    {"<approach>": {"<n>": {"config": {...}, "label": "...", "wall": 0.41,
+                            "budget": 8.0, "raced": 9}}}
+
+and runs that do not set the knobs on the command line read it back
+with tuned_config().
+"""
+
+import json
+import math
+from pathlib import Path
+
+PROFILE_NAME = "config_profile.json"
+
+
+def profile_path(output_dir: Path) -> Path:
+    return Path(output_dir) / "tuning" / PROFILE_NAME
+
+
+def load_profile(path: Path) -> dict:
+    if path.exists() and path.stat().st_size > 0:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return {}
+    return {}
+
+
+def save_profile(path: Path, profile: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(profile, indent=2), encoding="utf-8")
+
+
+def tuned_config(profile: dict, approach: str, n: int):
+    """
+    Winning configuration for (approach, n), or None if it was never raced.
+    """
+    entry = profile.get(approach, {}).get(str(n))
+    return None if entry is None else dict(entry["config"])
+
+
+def config_label(cfg: dict) -> str:
+    return ",".join(f"{k}={v}" for k, v in cfg.items())
+
+
+def successive_halving(configs, evaluate, budget: float, eta: int = 2, max_budget: float | None = None,
+                       log=print):
+    """
+    Race configs with evaluate(cfg, time_limit) -> (solved, wall), from
+    budget up to max_budget (default budget * eta ** 3). While nothing
+    solves the instance every configuration moves on to the longer budget.
+    Returns (best, wall, budget): best is None if nothing solved it.
+    """
+    max_budget = budget * eta ** 3 if max_budget is None else max_budget
+    alive = list(configs)
+    while True:
+        ranked = []
+        for cfg in alive:
+            solved, wall = evaluate(cfg, budget)
+            ranked.append((0 if solved else 1, wall, cfg))
+            log(f"  budget={budget:g}s {config_label(cfg):<44} {'solved' if solved else 'failed'} wall={wall:.3f}s")
+        ranked.sort(key=lambda r: r[:2])
+        solved = [cfg for failed, _, cfg in ranked if not failed]
+        if solved:
+            alive = solved[:math.ceil(len(alive) / eta)]
+        if len(alive) == 1 or budget >= max_budget:
+            break
+        budget = min(budget * eta, max_budget)
+
+    failed, wall, best = ranked[0]
+    return (None if failed else best), wall, budget
+
+
+def record(profile: dict, approach: str, n: int, best: dict, wall: float, budget: float, raced: int) -> None:
+    profile.setdefault(approach, {})[str(n)] = {
+        "config": best,
+        "label": config_label(best),
+        "wall": round(wall, 3),
+        "budget": budget,
+        "raced": raced,
+    }
@@ -0,0 +1,188 @@
+"""
+Rolling-horizon decomposition of the period assignment.
+
+The monolithic models hold all W weeks at once (O(n^3) literals). Here
+the weeks of a fixed pairing are solved in blocks of k consecutive weeks.
+Everything earlier blocks decided is summarised by the residual capacity
+
+    cap[t][p] = 2 - (games of team t already placed in period p)
+
+which enters the next block as fixed bounds, so a block has only
+k * P * P variables whatever n is. The first block freezes week 0
+(match m in period m), the usual period-relabelling symmetry break.
+
+When a block is infeasible under the residual capacities, the previous
+block is undone and merged with it, and the merged block is solved as
+one subproblem (backtracking across the block boundary, at most
+max_backtracks merges in total; every merge enlarges the subproblem, so
+the budget also bounds the model size).
+
+Backends (block solvers) share one signature:
+
+    solver(block, caps, P, frozen, time_limit) -> per | None
+
+block: list of weeks, each a list of (a, b); caps: {(t, p): 0..2};
+frozen: fix the first week to match m -> period m. Returns per[i][m] for
+the block's weeks, or None if infeasible / out of time.
+"""
+
+import threading
+import time
+
+from common.schedule import Schedule
+
+
+def sat_block(block, caps, P, frozen, time_limit):
+    """
+    Block solved with pysat's Glucose 4, the same X_w_m_p encoding as
+    SAT/sat_dimacs.py with the period limit lowered to cap[t][p].
+    """
+    from pysat.card import CardEnc, EncType
+    from pysat.formula import IDPool
+    from pysat.solvers import Glucose4
+
+    pool = IDPool()
+
+    def X(i, m, p):
+        return pool.id(("X", i, m, p))
+
+    clauses = []
+    for i, week in enumerate(block):
+        for m in range(P):
+            lits = [X(i, m, p) for p in range(P)]
+            clauses += CardEnc.equals(lits, 1, vpool=pool, encoding=EncType.pairwise).clauses
+        for p in range(P):
+            lits = [X(i, m, p) for m in range(P)]
+            clauses += CardEnc.equals(lits, 1, vpool=pool, encoding=EncType.pairwise).clauses
+
+    for (t, p), cap in caps.items():
+        lits = [X(i, m, p) for i, week in enumerate(block) for m, pair in enumerate(week) if t in pair]
+        if cap < len(lits):
+            clauses += CardEnc.atmost(lits, cap, vpool=pool, encoding=EncType.seqcounter).clauses
+
+    if frozen:
+        clauses += [[X(0, m, m)] for m in range(P)]
+
+    with Glucose4(bootstrap_with=clauses) as solver:
+        timer = threading.Timer(max(time_limit, 0.01), solver.interrupt)
+        timer.start()
+        try:
+            res = solver.solve_limited(expect_interrupt=True)
+        finally:
+            timer.cancel()
+        if res is not True:
+            return None
+        true = {lit for lit in solver.get_model() if lit > 0}
+
+    return [[next(p for p in range(P) if X(i, m, p) in true) for m in range(P)] for i in range(len(block))]
+
+
+def z3_block(block, caps, P, frozen, time_limit):
+    """
+    Block solved with z3, Bool X_w_m_p and pseudo-boolean constraints as
+    in SMT/smt_period_core_bool.py.
+    """
+    from z3 import Bool, Not, PbEq, PbLe, SolverFor, is_true, sat
+
+    s = SolverFor("QF_FD")
+    s.set("timeout", max(int(time_limit * 1000), 1))
+    X = [[[Bool(f"X_{i}_{m}_{p}") for p in range(P)] for m in range(P)] for i in range(len(block))]
+
+    for i in range(len(block)):
+        for m in range(P):
+            s.add(PbEq([(X[i][m][p], 1) for p in range(P)], 1))
+        for p in range(P):
+            s.add(PbEq([(X[i][m][p], 1) for m in range(P)], 1))
+
+    for (t, p), cap in caps.items():
+        lits = [X[i][m][p] for i, week in enumerate(block) for m, pair in enumerate(week) if t in pair]
+        if cap == 0:
+            for lit in lits:
+                s.add(Not(lit))
+        elif cap < len(lits):
+            s.add(PbLe([(lit, 1) for lit in lits], cap))
+
+    if frozen:
+        for m in range(P):
+            s.add(X[0][m][m])
+
+    if s.check() != sat:
+        return None
+    model = s.model()
+    return [[next(p for p in range(P) if is_true(model.eval(X[i][m][p]))) for m in range(P)]
+            for i in range(len(block))]
+
+
+def periods_to_solution(weeks, per):
+    """
+    Checker-format schedule sol[p][w] = [a, b] from per[w][m].
+    """
+    sched = Schedule(len(weeks[0]), len(weeks))
+    for w, week in enumerate(weeks):
+        sched.week(w)[per[w]] = week
+    return sched.tolist()
+
+
+BACKENDS = {
+    "sat": sat_block,
+    "z3": z3_block,
+}
+
+
+def solve_rolling(n: int, weeks, k: int, backend: str = "sat", time_limit: float = 300,
+                  max_backtracks: int = 50, lookahead: int = 0, frozen: bool = True):
+    """
+    Returns (status, per, stats): status "sat" with per[w][m] for all
+    weeks, "unsat" only if a single block covering all weeks is
+    infeasible, otherwise "timeout" (also when the backtracking budget
+    runs out).
+
+    lookahead: also include that many following weeks in each block
+    subproblem, but only commit the block's own weeks.
+    """
+    solver = BACKENDS[backend]
+    W = len(weeks)
+    P = n // 2
+    bounds = [(lo, min(lo + k, W)) for lo in range(0, W, k)]
+    deadline = time.perf_counter() + time_limit
+
+    count = [[0] * P for _ in range(n + 1)]
+    chosen = []    # per of each committed block
+    stats = {"blocks": len(bounds), "block_solves": 0, "backtracks": 0}
+
+    def add(lo, per, sign):
+        for i, row in enumerate(per):
+            for m, (a, b) in enumerate(weeks[lo + i]):
+                count[a][row[m]] += sign
+                count[b][row[m]] += sign
+
+    while len(chosen) < len(bounds):
+        left = deadline - time.perf_counter()
+        if left <= 0:
+            return "timeout", None, stats
+
+        b = len(chosen)
+        lo, hi = bounds[b]
+        caps = {(t, p): 2 - count[t][p] for t in range(1, n + 1) for p in range(P)}
+
+        stats["block_solves"] += 1
+        per = solver(weeks[lo:min(W, hi + lookahead)], caps, P, frozen and lo == 0, left)
+        if per is not None:
+            per = per[:hi - lo]
+            add(lo, per, +1)
+            chosen.append(per)
+            continue
+
+        if b == 0 and hi == W and time.perf_counter() < deadline:
+            # the block was the whole instance: genuinely infeasible
+            return "unsat", None, stats
+
+        # dead end: undo the previous block and solve both as one block
+        if b == 0 or stats["backtracks"] >= max_backtracks:
+            return "timeout", None, stats
+        stats["backtracks"] += 1
+        prev_lo, _ = bounds[b - 1]
+        add(prev_lo, chosen.pop(), -1)
+        bounds[b - 1:b + 1] = [(prev_lo, hi)]
+
+    return "sat", [row for per in chosen for row in per], stats
@@ -0,0 +1,85 @@
+"""
+Array-backed schedule shared by the decoders.
+
+Decoders used to build [[None] * W for _ in range(P)], fill it one
+[a, b] list at a time and then scan it for holes. Schedule keeps one
+P x W x 2 int array instead; team numbers start at 1, so 0 marks an
+empty slot:
+
+    sched = Schedule.empty(n)
+    sched[p, w] = (home, away)          # O(1), no list allocated
+    sched.is_complete()                 # one vectorised test
+    sched.period(p), sched.week(w)      # views, no copy
+    sched.tolist()                      # checker format sol[p][w] = [home, away]
+
+np.asarray(sched) is the array itself, so fast_checker and the result
+store take a Schedule as is.
+"""
+
+import numpy as np
+
+
+class Schedule:
+    __slots__ = ("data",)
+
+    def __init__(self, periods: int, weeks: int, dtype=np.int32):
+        self.data = np.zeros((periods, weeks, 2), dtype=dtype)
+
+    @classmethod
+    def empty(cls, n: int):
+        return cls(n // 2, n - 1)
+
+    @classmethod
+    def from_list(cls, sol):
+        """
+        Schedule of a checker-format list (None slots stay empty).
+        """
+        periods = len(sol)
+        weeks = len(sol[0]) if periods else 0
+        sched = cls(periods, weeks)
+        for p, row in enumerate(sol):
+            for w, match in enumerate(row):
+                if match is not None:
+                    sched.data[p, w] = match
+        return sched
+
+    @property
+    def periods(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def weeks(self) -> int:
+        return self.data.shape[1]
+
+    def __setitem__(self, slot, match):
+        self.data[slot] = match
+
+    def __getitem__(self, slot):
+        return self.data[slot]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    def period(self, p: int):
+        """
+        W x 2 view of period p.
+        """
+        return self.data[p]
+
+    def week(self, w: int):
+        """
+        P x 2 view of week w.
+        """
+        return self.data[:, w]
+
+    def holes(self) -> int:
+        return int((self.data[:, :, 0] == 0).sum())
+
+    def is_complete(self) -> bool:
+        return self.data.size > 0 and bool(self.data[:, :, 0].all())
+
+    def tolist(self):
+        return self.data.tolist()
+
+    def __repr__(self):
+        return f"Schedule(periods={self.periods}, weeks={self.weeks}, holes={self.holes()})"
@@ -0,0 +1,211 @@
+"""
+Shared result store for all approaches.
+
+Every runner used to load res/<APP>/{n}.json, update it and write it
+back, so two runs on the same file could drop each other's entries.
+Results now go to one SQLite database (res/results.db, WAL mode), one
+row per (app, n, approach), and every write is a single transaction.
+
+The per-n JSON files stay the format the checker and the report read:
+after each write the file is re-exported from the database inside the
+same write transaction, so concurrent writers serialize on the database
+lock and the last export always holds every committed entry. The file
+is replaced atomically (temp file + os.replace), readers never see a
+half-written JSON.
+
+JSON files written before the store existed are imported the first
+time their (app, n) is touched, so no old entries are lost.
+
+    python source/common/store.py import res          # load existing JSON files
+    python source/common/store.py export [--app SAT] [-n 12]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+RES_DIR = ROOT_DIR / "res"
+DB_NAME = "results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    app      TEXT NOT NULL,
+    n        INTEGER NOT NULL,
+    approach TEXT NOT NULL,
+    entry    TEXT NOT NULL,
+    updated  REAL NOT NULL,
+    PRIMARY KEY (app, n, approach)
+)
+"""
+
+
+def connect(res_dir=RES_DIR):
+    res_dir = Path(res_dir)
+    res_dir.mkdir(parents=True, exist_ok=True)
+    # autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+    con = sqlite3.connect(str(res_dir / DB_NAME), timeout=60, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.execute(SCHEMA)
+    return con
+
+
+def split_path(json_path):
+    """
+    res/<APP>/{n}.json -> (res dir, APP, n).
+    """
+    json_path = Path(json_path)
+    return json_path.parent.parent, json_path.parent.name, int(json_path.stem)
+
+
+def read_json(json_path):
+    json_path = Path(json_path)
+    if not json_path.exists() or json_path.stat().st_size == 0:
+        return {}
+    try:
+        return json.loads(json_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def write_json_atomic(json_path, data):
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{json_path.name}.", dir=str(json_path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, json_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def fetch(con, app, n):
+    rows = con.execute(
+        "SELECT approach, entry FROM results WHERE app = ? AND n = ? ORDER BY rowid",
+        (app, n),
+    ).fetchall()
+    return {approach: json.loads(entry) for approach, entry in rows}
+
+
+def to_json(obj):
+    # Schedule objects and NumPy arrays/scalars in an entry
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def upsert(con, app, n, entries):
+    now = time.time()
+    con.executemany(
+        "INSERT INTO results (app, n, approach, entry, updated) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (app, n, approach) DO UPDATE SET entry = excluded.entry, updated = excluded.updated",
+        [(app, n, approach, json.dumps(entry, default=to_json), now) for approach, entry in entries.items()],
+    )
+
+
+def update_result_file(json_path, entries: dict, replace: bool = False):
+    """
+    Store the given {approach: entry} results for res/<APP>/{n}.json and
+    re-export that file. Other approaches already stored are kept unless
+    replace is set (then the file holds exactly `entries`).
+    """
+    res_dir, app, n = split_path(json_path)
+    con = connect(res_dir)
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            known = con.execute("SELECT 1 FROM results WHERE app = ? AND n = ? LIMIT 1", (app, n)).fetchone()
+            if replace:
+                con.execute("DELETE FROM results WHERE app = ? AND n = ?", (app, n))
+            elif known is None:
+                # first write since the store exists: keep what the file already has
+                upsert(con, app, n, read_json(json_path))
+            upsert(con, app, n, entries)
+            write_json_atomic(json_path, fetch(con, app, n))
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.close()
+
+
+def import_json(res_dir=RES_DIR, overwrite=False):
+    """
+    Load every res/<APP>/{n}.json into the store. Entries already in the
+    store win unless overwrite is set. Returns the number of entries read.
+    """
+    res_dir = Path(res_dir)
+    count = 0
+    con = connect(res_dir)
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        for json_path in sorted(res_dir.glob("*/*.json")):
+            if not json_path.stem.isdigit():
+                continue
+            _, app, n = split_path(json_path)
+            data = read_json(json_path)
+            if not overwrite:
+                stored = fetch(con, app, n)
+                data = {k: v for k, v in data.items() if k not in stored}
+            upsert(con, app, n, data)
+            count += len(data)
+        con.execute("COMMIT")
+    finally:
+        con.close()
+    return count
+
+
+def export_json(res_dir=RES_DIR, app=None, n=None):
+    """
+    Write res/<APP>/{n}.json from the store for every stored (app, n),
+    optionally restricted to one app and/or one n. Returns the files written.
+    """
+    res_dir = Path(res_dir)
+    written = []
+    con = connect(res_dir)
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        keys = con.execute("SELECT DISTINCT app, n FROM results ORDER BY app, n").fetchall()
+        for key_app, key_n in keys:
+            if (app is not None and key_app != app) or (n is not None and key_n != n):
+                continue
+            json_path = res_dir / key_app / f"{key_n}.json"
+            write_json_atomic(json_path, fetch(con, key_app, key_n))
+            written.append(json_path)
+        con.execute("COMMIT")
+    finally:
+        con.close()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import/export the shared result store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="load existing res/<APP>/{n}.json files")
+    p_import.add_argument("res_dir", nargs="?", default=str(RES_DIR))
+    p_import.add_argument("--overwrite", action="store_true", help="let the JSON files win over stored entries")
+
+    p_export = sub.add_parser("export", help="write res/<APP>/{n}.json from the store")
+    p_export.add_argument("res_dir", nargs="?", default=str(RES_DIR))
+    p_export.add_argument("--app", default=None)
+    p_export.add_argument("-n", type=int, default=None)
+
+    args = parser.parse_args()
+    if args.command == "import":
+        print(f"Imported {import_json(args.res_dir, args.overwrite)} entries into {Path(args.res_dir) / DB_NAME}")
+    else:
+        for json_path in export_json(args.res_dir, args.app, args.n):
+            print(f"Wrote {json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Symmetries of the period assignment and lex-leader constraints for them.
+
+Freezing one week (match m in period m) removes the period relabellings
+and is all the models did so far. The pairing itself usually has
+symmetries too: a team permutation pi that maps every week's matching
+onto some week's matching (tau(w)) carries any schedule to another one,
+X[w, m, p] -> X[tau(w), mu_w(m), p]. For the circle method these are the
+maps x -> c + a (x - c) on the rotating teams, (n - 1) * phi(n - 1) of
+them, and they are left in every model.
+
+automorphisms() finds the whole group by the individualize-and-refine
+closure of common/pairings.py: one labelling from a fixed base gives a
+reference code, and every base / branch that reproduces the code, entry
+for entry, is an automorphism (the code lists the partner of every
+labelled team in every labelled colour).
+
+With a frozen week only the automorphisms that keep that week (tau(aw)
+= aw) survive, composed with the period relabelling mu_aw that sends
+its frozen matches back to their periods; without one the whole group
+acts with the periods fixed. lex_leader() adds X <=lex g(X) for every
+non-identity element g (optionally a prefix of the vector only, which is
+weaker but cheaper). The constraints only read X, so the FlipHome unit
+of the fairness models stays valid (flipping every match commutes with
+the team maps and leaves X alone). Pinning team 1 is not invariant
+under the group and is rejected.
+
+    python source/common/symmetry.py group -n 6 8 10 12 24
+    python source/common/symmetry.py ablation -n 8 10 12 --targets cnf z3 --exhaust
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.ir import build
+
+
+def colouring(n: int, weeks):
+    colour = [[-1] * n for _ in range(n)]          # colour[u][v], teams 0-based
+    partner = [[0] * n for _ in range(n - 1)]      # partner[c][v]
+    for c, week in enumerate(weeks):
+        for a, b in week:
+            colour[a - 1][b - 1] = colour[b - 1][a - 1] = c
+            partner[c][a - 1], partner[c][b - 1] = b - 1, a - 1
+    return colour, partner
+
+
+def automorphisms(n: int, weeks):
+    """
+    All team permutations mapping the pairing onto itself, as arrays
+    perm[t] (teams 1..n, perm[0] unused), the identity first.
+    """
+    colour, partner = colouring(n, weeks)
+
+    def closure(order, label, code, shell, target, found, first_only):
+        a = order[0]
+        s = shell
+        while s < len(order):
+            pairs = [(i, s) for i in range(s + 1)] + [(s, j) for j in range(1, s)] if s >= 1 else []
+            for i, j in pairs:
+                p = partner[colour[a][order[j]]][order[i]]
+                if p not in label:
+                    label[p] = len(order)
+                    order.append(p)
+                if target is not None and (len(code) >= len(target) or label[p] != target[len(code)]):
+                    return
+                code.append(label[p])
+            s += 1
+            if s == len(order) and len(order) < n:
+                free = [v for v in range(n) if v not in label]
+                for v in free[:1] if first_only else free:
+                    closure(order + [v], {**label, v: len(order)}, list(code), s, target, found, first_only)
+                return
+        if target is None or len(code) == len(target):
+            found.append((order, code))
+
+    # reference labelling: base (0, 1), first free team at every stall
+    reference = []
+    closure([0, 1], {0: 0, 1: 1}, [], 1, None, reference, True)
+    ref_order, ref_code = reference[0]
+
+    found = []
+    for a in range(n):
+        for b in range(n):
+            if b != a:
+                closure([a, b], {a: 0, b: 1}, [], 1, ref_code, found, False)
+
+    perms = []
+    for order, _ in found:
+        perm = np.zeros(n + 1, dtype=np.int64)
+        perm[np.array(ref_order) + 1] = np.array(order) + 1
+        perms.append(perm)
+    perms.sort(key=lambda p: (not np.array_equal(p, np.arange(n + 1)), p.tolist()))
+    return perms
+
+
+def week_action(pairing, perm):
+    """
+    (tau, mu) of a team permutation: week w goes to week tau[w] and its
+    match m to match mu[w, m] there.
+    """
+    n, W = pairing.n, pairing.W
+    colour = np.full((n + 1, n + 1), -1, dtype=np.int64)
+    weeks = np.repeat(np.arange(W), pairing.P)
+    colour[pairing.pairs[:, :, 0].ravel(), pairing.pairs[:, :, 1].ravel()] = weeks
+    colour[pairing.pairs[:, :, 1].ravel(), pairing.pairs[:, :, 0].ravel()] = weeks
+    image = perm[pairing.pairs]
+    tau = colour[image[:, 0, 0], image[:, 0, 1]]
+    mu = pairing.match_of[tau[:, None], image[:, :, 0]]
+    return tau, mu
+
+
+def variable_maps(model, perms):
+    """
+    gX[w, m, p] = X[tau[w], mu[w, m], sigma[p]] for every element of the
+    group that acts on the model (the frozen week's stabilizer when the
+    model freezes one), identity and duplicates removed.
+    """
+    T = model.pairing
+    X = model.blocks["X"]
+    aw = model.options["anchor_week"] % model.W if model.options.get("sym") else None
+    maps, seen = [], {X.tobytes()}
+    for perm in perms:
+        tau, mu = week_action(T, perm)
+        if aw is None:
+            sigma = np.arange(model.P)
+        elif tau[aw] != aw:
+            continue
+        else:
+            # period p of the frozen week holds match p: follow its image
+            sigma = mu[aw]
+        gX = X[tau[:, None, None], mu[:, :, None], sigma[None, None, :]]
+        key = gX.tobytes()
+        if key not in seen:
+            seen.add(key)
+            maps.append(gX)
+    return maps
+
+
+def lex_leader(model, perms=None, length=None, limit=None) -> int:
+    """
+    Add X <=lex g(X) to model for the group of its pairing (perms from
+    automorphisms(), computed if not given). length keeps only the first
+    positions of each vector, limit the first group elements. Returns
+    the number of constraints added.
+    """
+    if model.options.get("pin_team1"):
+        raise ValueError("lex-leader constraints are not compatible with pin_team1")
+    if perms is None:
+        perms = automorphisms(model.n, model.pairing.weeks())
+    X = model.blocks["X"].ravel()
+    added = 0
+    for gX in variable_maps(model, perms)[:limit]:
+        y = gX.ravel()
+        keep = X != y
+        model.add_lex(f"Lex{added}", X[keep][:length], y[keep][:length])
+        added += 1
+    return added
+
+
+# ---- ablation ----------------------------------------------------------------
+
+CONFIGS = {
+    "none": (False, False),
+    "freeze": (True, False),
+    "lex": (False, True),
+    "freeze+lex": (True, True),
+}
+
+
+def exhaust_cnf(model, time_limit):
+    """
+    Enumerate every solution with blocking clauses on X until the CNF is
+    unsatisfiable: the last call is an UNSAT proof over the symmetry
+    reduced space. Returns (status, count).
+    """
+    from pysat.solvers import Glucose4
+    from common.ir_compile import to_cnf
+
+    X = model.blocks["X"].ravel()
+    deadline = time.perf_counter() + time_limit
+    count = 0
+    with Glucose4(bootstrap_with=to_cnf(model).clauses()) as solver:
+        while True:
+            left = deadline - time.perf_counter()
+            if left <= 0:
+                return "timeout", count
+            timer = threading.Timer(left, solver.interrupt)
+            timer.start()
+            try:
+                res = solver.solve_limited(expect_interrupt=True)
+            finally:
+                timer.cancel()
+            if res is None:
+                return "timeout", count
+            if res is False:
+                return "exhausted", count
+            count += 1
+            truth = np.zeros(model.num_vars + 1, dtype=bool)
+            lits = np.array(solver.get_model()[:model.num_vars])
+            truth[lits[lits > 0]] = True
+            solver.add_clause((-X[truth[X]]).tolist())
+
+
+def ablation(ns, targets, time_limit, max_diff=None, length=None, exhaust=False, pairing="circle"):
+    from common.ir_compile import SOLVERS, check
+    from common.pairings import load_pairing
+
+    for n in ns:
+        T = load_pairing(n, pairing)
+        t0 = time.perf_counter()
+        perms = automorphisms(n, T.weeks())
+        t_group = time.perf_counter() - t0
+        print(f"n={n} |Aut|={len(perms)} found in {t_group:.3f}s")
+        for config, (sym, lex) in CONFIGS.items():
+            model = build(n, pairing=T, sym=sym, fairness=max_diff is not None)
+            if max_diff is not None:
+                model = model.with_max_diff(max_diff)
+            added = lex_leader(model, perms, length=length) if lex else 0
+            for target in targets:
+                t0 = time.perf_counter()
+                status, values = SOLVERS[target](model, time_limit)
+                t_solve = time.perf_counter() - t0
+                valid = check(model, values)[0] if status == "sat" else None
+                line = (f"  {config:<11} lex={added:<4} {target:<5} {status:<8} "
+                        f"solve={t_solve:7.3f}s valid={valid}")
+                if exhaust and target == "cnf":
+                    t0 = time.perf_counter()
+                    status, count = exhaust_cnf(model, time_limit)
+                    line += f"  exhaust: {status} {count} solutions in {time.perf_counter() - t0:.3f}s"
+                print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pairing automorphisms and lex-leader symmetry breaking.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_group = sub.add_parser("group", help="automorphism group of a pairing")
+    p_group.add_argument("-n", type=int, nargs="+", default=[6, 8, 10, 12])
+    p_group.add_argument("--pairing", type=str, default="circle")
+    p_group.add_argument("--anchor_week", type=int, default=0)
+
+    p_abl = sub.add_parser("ablation", help="solve with none / freeze / lex / freeze+lex")
+    p_abl.add_argument("-n", type=int, nargs="+", default=[8, 10, 12])
+    p_abl.add_argument("--targets", nargs="+", default=["cnf", "z3"], choices=["cnf", "z3", "smt2", "mzn", "ampl"])
+    p_abl.add_argument("--pairing", type=str, default="circle")
+    p_abl.add_argument("--max_diff", type=int, default=None, help="fairness bound (decision version of the sweep)")
+    p_abl.add_argument("--length", type=int, default=None, help="keep only the first positions of each lex vector")
+    p_abl.add_argument("--exhaust", action="store_true",
+                       help="also enumerate every CNF solution up to the final UNSAT proof")
+    p_abl.add_argument("--time_limit", type=float, default=60)
+
+    args = parser.parse_args()
+    if args.command == "ablation":
+        ablation(args.n, args.targets, args.time_limit, args.max_diff, args.length, args.exhaust, args.pairing)
+        return
+
+    from common.pairings import load_pairing
+
+    for n in args.n:
+        T = load_pairing(n, args.pairing)
+        t0 = time.perf_counter()
+        perms = automorphisms(n, T.weeks())
+        elapsed = time.perf_counter() - t0
+        model = build(n, pairing=T, sym=True, anchor_week=args.anchor_week)
+        stab = len(variable_maps(model, perms))
+        print(f"n={n} |Aut|={len(perms)} stabilizer of week {args.anchor_week % (n - 1)}: "
+              f"{stab + 1} ({stab} lex constraints) time={elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Round-robin precomputation shared by every encoder.
+
+The circle method used to be reimplemented per approach (CP/SMT
+round_robin, sat_dimacs.circle_method_pairings, MIP generate_round_robin)
+and match_of[w][t] was rebuilt by every model builder, or found by a
+linear scan in build_dimacs. tournament(n) builds all of it once per
+process (LRU cache) as NumPy arrays:
+
+    pairs[w, m]          (a, b) of match m in week w, circle-method order:
+                         the fixed team n plays the last match
+    match_of[w, t]       match index of team t in week w (column 0 unused)
+    opponent[w, t]       opponent of team t in week w
+    team_matches[t]      match_of[:, t], the match of team t in each week
+
+weeks() / weeks(sorted_pairs=True) give the legacy list-of-tuples
+format: a is the left team of the circle (SAT convention) or a < b
+(CP/SMT convention). The arrays are read-only since they are shared.
+
+Tournament(n, weeks) wraps any other 1-factorization the same way
+(common/pairings.py generates them).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+def circle_pairs(n: int):
+    fixed = n
+    rot = list(range(1, n))
+    half = n // 2
+    pairs = np.zeros((n - 1, n // 2, 2), dtype=np.int32)
+    for w in range(n - 1):
+        left = rot[:half - 1] + [fixed]
+        right = rot[half - 1:][::-1]
+        pairs[w, :, 0] = left
+        pairs[w, :, 1] = right
+        rot = [rot[-1]] + rot[:-1]
+    return pairs
+
+
+class Tournament:
+    def __init__(self, n: int, weeks=None):
+        if n % 2 != 0:
+            raise ValueError("n must be even")
+
+        self.n = n
+        self.W = n - 1
+        self.P = n // 2
+
+        if weeks is None:
+            pairs = circle_pairs(n)
+        else:
+            pairs = np.array(weeks, dtype=np.int32).reshape(-1, self.P, 2)
+            check_factorization(n, pairs)
+
+        weeks_idx = np.arange(self.W)[:, None]
+        match_idx = np.arange(self.P)[None, :]
+        match_of = np.full((self.W, n + 1), -1, dtype=np.int32)
+        match_of[weeks_idx, pairs[:, :, 0]] = match_idx
+        match_of[weeks_idx, pairs[:, :, 1]] = match_idx
+        opponent = np.zeros((self.W, n + 1), dtype=np.int32)
+        opponent[weeks_idx, pairs[:, :, 0]] = pairs[:, :, 1]
+        opponent[weeks_idx, pairs[:, :, 1]] = pairs[:, :, 0]
+
+        self.pairs = pairs
+        self.sorted_pairs = np.sort(pairs, axis=2)
+        self.match_of = match_of
+        self.opponent = opponent
+        self.team_matches = np.ascontiguousarray(match_of.T)
+        for arr in (self.pairs, self.sorted_pairs, self.match_of, self.opponent, self.team_matches):
+            arr.setflags(write=False)
+
+        self._weeks = {
+            False: tuple(tuple(map(tuple, week)) for week in pairs.tolist()),
+            True: tuple(tuple(map(tuple, week)) for week in self.sorted_pairs.tolist()),
+        }
+
+    def weeks(self, sorted_pairs: bool = False):
+        """
+        weeks[w] = list of (a, b); a fresh list, callers may modify it.
+        """
+        return [list(week) for week in self._weeks[sorted_pairs]]
+
+    def match_list(self, unordered: bool = False):
+        """
+        Flat (a, b, w) list with weeks 1..W, the MIP MATCHES set.
+        """
+        return [(a, b, w + 1) for w, week in enumerate(self._weeks[unordered]) for a, b in week]
+
+    def __repr__(self):
+        return f"Tournament(n={self.n})"
+
+
+def check_factorization(n: int, pairs):
+    """
+    Raise ValueError unless pairs (W x P x 2) is a 1-factorization of K_n
+    on teams 1..n: every team once per week, every pair exactly once.
+    """
+    W, P = n - 1, n // 2
+    if pairs.shape != (W, P, 2) or pairs.min() < 1 or pairs.max() > n:
+        raise ValueError(f"not a round robin of {n} teams")
+    per_week = np.sort(pairs.reshape(W, n), axis=1)
+    if not (per_week == np.arange(1, n + 1)).all():
+        raise ValueError("some team does not play exactly once a week")
+    lo, hi = pairs.min(axis=2), pairs.max(axis=2)
+    if len(np.unique(lo * (n + 1) + hi)) != W * P:
+        raise ValueError("some pair meets twice")
+
+
+@lru_cache(maxsize=32)
+def tournament(n: int) -> Tournament:
+    return Tournament(n)